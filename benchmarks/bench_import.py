@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Import time benchmark of the Meade plugin, every run on a fresh interpreter.
+
+    python benchmarks/bench_import.py [--repeat 20] [--max-import-ms 50]
+
+Reports how long ``import chimera_meade.meade`` and ``Meade()`` take and
+fails if modules only needed once the port is opened (pyserial, http.server,
+...) got imported, or if the median import takes longer than --max-import-ms.
+Run with ``-X importtime`` for the per module breakdown.
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# only needed by open/__start__, and not imported by chimera itself
+DEFERRED = ("serial", "http.server")
+
+PROBE = """
+import json, sys, time
+
+start = time.perf_counter()
+import chimera_meade.meade
+imported = time.perf_counter()
+chimera_meade.meade.Meade()
+constructed = time.perf_counter()
+
+print(json.dumps({
+    "import": imported - start,
+    "construct": constructed - imported,
+    "loaded": [name for name in %r if name in sys.modules],
+}))
+"""
+
+
+def probe():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE % (DEFERRED,)],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--max-import-ms", type=float, default=None)
+    args = parser.parse_args()
+
+    runs = [probe() for _ in range(args.repeat)]
+
+    for name in ("import", "construct"):
+        values = [run[name] * 1000 for run in runs]
+        print(
+            "%-12s median %8.2f ms  min %8.2f ms  max %8.2f ms"
+            % (name, statistics.median(values), min(values), max(values))
+        )
+
+    failed = False
+
+    loaded = sorted({name for run in runs for name in run["loaded"]})
+    if loaded:
+        print("imported too early: %s" % ", ".join(loaded))
+        failed = True
+
+    median = statistics.median(run["import"] for run in runs) * 1000
+    if args.max_import_ms is not None and median > args.max_import_ms:
+        print("import took %.2f ms, over %.2f ms" % (median, args.max_import_ms))
+        failed = True
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
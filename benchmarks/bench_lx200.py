@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Micro-benchmarks of the LX200 reply parsers against the string based path
+the driver used before (decode, strip the stray '1', replace the degree
+sign, slice the '#' and parse the text with Coord.fromHMS/fromDMS).
+
+    python benchmarks/bench_lx200.py [--number 100000]
+"""
+
+import argparse
+import timeit
+
+from chimera.util.coord import Coord
+
+from chimera_meade.lx200 import decode_sexagesimal, parse_az, parse_dec, parse_ra
+
+
+def legacy_ra(raw):
+    ret = raw.decode("latin-1")
+    if len(ret) > 9:
+        ret = ret[1:]
+    return Coord.fromHMS(ret[:-1])
+
+
+def legacy_dec(raw):
+    ret = raw.decode("latin-1")
+    if len(ret) > 10:
+        ret = ret[1:]
+    ret = ret.replace("\xdf", ":")
+    return Coord.fromDMS(ret[:-1])
+
+
+def legacy_az(raw):
+    c = Coord.fromDMS(raw.decode("latin-1").replace("\xdf", ":")[:-1])
+    if c.toD() >= 180:
+        return c - Coord.fromD(180)
+    return c + Coord.fromD(180)
+
+
+REPLIES = {
+    "ra": b"18:30:35#",
+    "ra (stray 1)": b"118:30:35#",
+    "dec": b"-07\xdf30:15#",
+    "az": b"123\xdf45:06#",
+}
+
+CASES = [
+    ("ra", legacy_ra, parse_ra),
+    ("ra (stray 1)", legacy_ra, parse_ra),
+    ("dec", legacy_dec, parse_dec),
+    ("az", legacy_az, parse_az),
+]
+
+
+def per_call(func, arg, number):
+    return min(timeit.repeat(lambda: func(arg), number=number, repeat=5)) / number
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--number", type=int, default=100000)
+    args = parser.parse_args()
+
+    print("%-16s %12s %12s %12s %8s" % ("", "legacy", "parse", "decode", "speedup"))
+
+    for name, legacy, parse in CASES:
+        raw = REPLIES[name]
+        view = memoryview(bytearray(raw))
+
+        t_legacy = per_call(legacy, raw, args.number)
+        t_parse = per_call(parse, view, args.number)
+        t_decode = per_call(decode_sexagesimal, view, args.number)
+
+        print(
+            "%-16s %9.3f us %9.3f us %9.3f us %7.1fx"
+            % (
+                name,
+                t_legacy * 1e6,
+                t_parse * 1e6,
+                t_decode * 1e6,
+                t_legacy / t_parse,
+            )
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,310 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Serial latency benchmarks for the Meade driver, run against the simulated
+LX200 from chimera_meade.simulator.
+
+    python benchmarks/bench_meade.py [--baudrate 9600] [--repeat 20] [--tcp]
+
+With --tcp the driver talks to the simulator through a local TCP stand-in
+for a terminal server (socket://), as mounts behind one do.
+
+For every benchmarked method reports the mean, median and p95 latency and
+how many LX200 commands per second went through the link.
+"""
+
+import argparse
+import os
+import statistics
+import tempfile
+import threading
+import time
+
+from chimera.util.position import Position
+
+from chimera_meade.calibration import CalibrationStore
+from chimera_meade.meade import Direction, Meade, SlewRate
+from chimera_meade.simulator import LX200Simulator, SimulatorServer
+
+SIMULATOR = "bench"
+
+
+def make_meade(baudrate, latency, slew_speed, tcp=False):
+    LX200Simulator.forget(SIMULATOR)
+
+    meade = Meade()
+    meade["device"] = "lx200sim://%s?latency=%f&slew_speed=%f" % (
+        SIMULATOR,
+        latency,
+        slew_speed,
+    )
+    if tcp:
+        # lives as long as the process
+        server = SimulatorServer(meade["device"], baudrate=baudrate).start()
+        meade["device"] = "socket://%s:%d" % server.address
+    meade["timeout"] = 5
+    # negotiated with :SB (serial devices only)
+    meade["baudrate"] = baudrate
+    meade["skip_init"] = True
+    meade["slew_idle_time"] = 0.05
+    meade["stabilization_time"] = 0.0
+
+    # events are dispatched by the chimera manager, we only want the driver
+    meade.slewBegin = lambda *args, **kwargs: None
+    meade.slewComplete = lambda *args, **kwargs: None
+
+    meade.open()
+
+    return meade
+
+
+class Result:
+    def __init__(self, name):
+        self.name = name
+        self.latencies = []
+        self.commands = 0
+        self.elapsed = 0.0
+
+    def report(self):
+        lat = sorted(self.latencies)
+        p95 = lat[min(len(lat) - 1, int(round(0.95 * (len(lat) - 1))))]
+        print(
+            "%-24s n=%-4d mean=%9.2f ms  median=%9.2f ms  p95=%9.2f ms  %7.1f cmd/s"
+            % (
+                self.name,
+                len(lat),
+                statistics.fmean(lat) * 1000,
+                statistics.median(lat) * 1000,
+                p95 * 1000,
+                self.commands / self.elapsed if self.elapsed else 0.0,
+            )
+        )
+
+
+def bench(name, func, repeat):
+    simulator = LX200Simulator.get(SIMULATOR)
+    result = Result(name)
+
+    commands = simulator.commands
+    start = time.perf_counter()
+
+    for i in range(repeat):
+        t0 = time.perf_counter()
+        func(i)
+        result.latencies.append(time.perf_counter() - t0)
+
+    result.elapsed = time.perf_counter() - start
+    result.commands = simulator.commands - commands
+
+    result.report()
+    return result
+
+
+def bench_shared_reads(meade, repeat, clients=3):
+    """_read_position_ra_dec from several threads at once, as from many clients"""
+    saved = meade.get_metrics().get("coalesced_total", {}).get("commands=GR,GD", 0)
+
+    def reads(i):
+        threads = [
+            threading.Thread(target=meade._read_position_ra_dec) for _ in range(clients)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    bench("_read_position_ra_dec x%d" % clients, reads, repeat)
+
+    saved = (
+        meade.get_metrics().get("coalesced_total", {}).get("commands=GR,GD", 0) - saved
+    )
+    print("%-24s %d of %d exchanges saved" % ("  coalesced", saved, repeat * clients))
+
+
+def bench_polling(meade, seconds, tolerance, hz=20):
+    """
+    get_position_ra_dec at ``hz`` for ``seconds`` while tracking, answered by
+    dead reckoning within ``tolerance`` arcseconds
+    """
+    reckoned = meade.get_metrics().get("reckoned_total", {}).get("frame=ra_dec", 0)
+
+    def poll(i):
+        meade.get_position_ra_dec(tolerance=tolerance)
+        time.sleep(1.0 / hz)
+
+    result = bench("get_position_ra_dec @%dHz" % hz, poll, max(2, int(seconds * hz)))
+
+    reckoned = (
+        meade.get_metrics().get("reckoned_total", {}).get("frame=ra_dec", 0) - reckoned
+    )
+    print(
+        '%-24s %d of %d polls reckoned within %.1f", %d commands on the wire'
+        % (
+            "  reckoned",
+            reckoned,
+            len(result.latencies),
+            tolerance,
+            result.commands,
+        )
+    )
+
+
+def bench_abort(meade, start, repeat):
+    """
+    From abort_slew() to :Q# written, while a slew holds @lock and another
+    thread keeps position reads on the line.
+    """
+    wire = []
+    write = meade._tty.write
+
+    def traced(data):
+        n = write(data)
+        if b":Q#" in bytes(data):
+            wire.append(time.perf_counter())
+        return n
+
+    meade._tty.write = traced
+
+    done = threading.Event()
+
+    def reads():
+        while not done.is_set():
+            meade._read_position_ra_dec()
+
+    reader = threading.Thread(target=reads)
+    reader.start()
+
+    result = Result("abort_slew -> wire")
+
+    try:
+        for i in range(repeat):
+            offset = 5.0 if i % 2 == 0 else -5.0
+            target = Position.fromRaDec(start.ra, start.dec.toD() + offset)
+            slew = threading.Thread(target=meade.slew_to_ra_dec, args=(target,))
+            slew.start()
+
+            while not meade.is_slewing():
+                time.sleep(0.001)
+            time.sleep(0.2)
+
+            wire.clear()
+            t0 = time.perf_counter()
+            meade.abort_slew()
+            slew.join()
+
+            result.latencies.append(wire[0] - t0)
+    finally:
+        done.set()
+        reader.join()
+        meade._tty.write = write
+
+    result.report()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--baudrate", type=int, default=9600)
+    parser.add_argument("--latency", type=float, default=0.002)
+    parser.add_argument("--slew-speed", type=float, default=8.0)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument(
+        "--tcp", action="store_true", help="go through a local TCP stand-in"
+    )
+    parser.add_argument("--poll-seconds", type=float, default=5.0)
+    parser.add_argument(
+        "--position-tolerance",
+        type=float,
+        default=30.0,
+        help="arcsec, for dead reckoned polling",
+    )
+    parser.add_argument("--move-duration", type=float, default=0.25)
+    parser.add_argument(
+        "--calibration-max-duration",
+        type=float,
+        help="seconds, the driver's default if not given",
+    )
+    parser.add_argument(
+        "--no-calibration", action="store_true", help="skip calibrate_move"
+    )
+    args = parser.parse_args()
+
+    meade = make_meade(args.baudrate, args.latency, args.slew_speed, args.tcp)
+
+    print(
+        "baudrate=%d latency=%.1f ms slew_speed=%.1f deg/s device=%s"
+        % (args.baudrate, args.latency * 1000, args.slew_speed, meade["device"])
+    )
+
+    bench(
+        "_read_position_ra_dec",
+        lambda i: meade._read_position_ra_dec(),
+        args.repeat,
+    )
+
+    bench(
+        "get_position_ra_dec",
+        lambda i: meade.get_position_ra_dec(),
+        args.repeat,
+    )
+
+    bench_shared_reads(meade, args.repeat)
+
+    bench_polling(meade, args.poll_seconds, args.position_tolerance)
+
+    start = meade.get_position_ra_dec()
+
+    def slew(i):
+        # one degree back and forth around the start position
+        offset = 1.0 if i % 2 == 0 else 0.0
+        meade.slew_to_ra_dec(Position.fromRaDec(start.ra, start.dec.toD() + offset))
+
+    bench("slew_to_ra_dec", slew, max(2, args.repeat // 5))
+
+    bench_abort(meade, start, max(2, args.repeat // 2))
+
+    directions = [Direction.N, Direction.S, Direction.E, Direction.W]
+
+    bench(
+        "_move",
+        lambda i: meade._move(
+            directions[i % len(directions)], args.move_duration, SlewRate.GUIDE
+        ),
+        args.repeat,
+    )
+
+    timing = meade.get_move_timing()
+    print(
+        "%-24s mean=%+9.3f ms  max=%9.3f ms"
+        % ("_move stop error", timing["mean"] * 1000, timing["max"] * 1000)
+    )
+
+    if not args.no_calibration:
+        with tempfile.TemporaryDirectory() as tmp:
+            if args.calibration_max_duration is not None:
+                meade["calibration_max_duration"] = args.calibration_max_duration
+            meade._calibrationStore = CalibrationStore(
+                os.path.join(tmp, "meade-calibration.json")
+            )
+            bench("calibrate_move", lambda i: meade.calibrate_move(), 1)
+
+            for rate in SlewRate:
+                for direction in Direction:
+                    entry = meade._calibrationEntries[str(rate)][str(direction)]
+                    print(
+                        "  %-6s %s %10.2f +/- %7.2f arcsec/s  n=%d"
+                        % (
+                            rate,
+                            direction,
+                            entry.rate,
+                            entry.confidence(),
+                            entry.samples,
+                        )
+                    )
+
+    meade.close()
+
+
+if __name__ == "__main__":
+    main()
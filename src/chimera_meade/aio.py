@@ -0,0 +1,429 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+asyncio version of the Meade driver.
+
+:class:`AsyncMeade` talks the same LX200 protocol as
+:class:`chimera_meade.meade.Meade` (both use :mod:`chimera_meade.lx200`),
+but over an asyncio transport, so one event loop can drive several mounts
+and their telemetry without a thread per mount::
+
+    async with AsyncMeade("/dev/ttyS0") as meade:
+        position = await meade.get_position_ra_dec()
+
+Devices are pyserial URLs (``/dev/ttyS0``, ``lx200sim://name``, ...).
+``socket://host:port`` devices use a plain asyncio TCP connection.
+"""
+
+import asyncio
+import io
+import threading
+import time
+import urllib.parse
+
+import serial
+from chimera.util.coord import Coord
+from chimera.util.position import Epoch, Position
+
+from chimera_meade.lx200 import (
+    Reply,
+    parse_az,
+    parse_bool,
+    parse_dec,
+    parse_dms,
+    parse_hms,
+    parse_ra,
+    reply_format,
+    reply_kind,
+    target_dec_command,
+    target_ra_command,
+)
+from chimera_meade.meade import MeadeException, SlewRate
+from chimera_meade.telemetry import TelemetrySnapshot
+
+__all__ = ["AsyncMeade", "SerialConnection", "open_serial_connection"]
+
+# lx200sim:// devices
+if "chimera_meade" not in serial.protocol_handler_packages:
+    serial.protocol_handler_packages.append("chimera_meade")
+
+_SLEW_RATE_COMMANDS = {
+    SlewRate.GUIDE: ":RG#",
+    SlewRate.CENTER: ":RC#",
+    SlewRate.FIND: ":RM#",
+    SlewRate.MAX: ":RS#",
+}
+
+
+class SerialConnection:
+    """
+    Minimal stand-in for serial_asyncio: feeds what arrives on a pyserial
+    port to an asyncio.StreamReader. Ports with a file descriptor are
+    watched by the event loop, the others (simulator, ...) by a helper
+    thread.
+    """
+
+    def __init__(self, port, loop):
+        self.port = port
+        self.reader = asyncio.StreamReader()
+        self._loop = loop
+        self._fd = None
+        self._thread = None
+        self._closed = threading.Event()
+
+        try:
+            self._fd = port.fileno()
+        except (AttributeError, io.UnsupportedOperation):
+            self._fd = None
+
+        if self._fd is not None:
+            port.timeout = 0
+            loop.add_reader(self._fd, self._on_readable)
+        else:
+            port.timeout = 0.05
+            self._thread = threading.Thread(
+                target=self._read_loop, name="meade-aio-reader", daemon=True
+            )
+            self._thread.start()
+
+    def _on_readable(self):
+        data = self.port.read(self.port.in_waiting or 1)
+        if data:
+            self.reader.feed_data(data)
+
+    def _read_loop(self):
+        while not self._closed.is_set():
+            try:
+                data = self.port.read(max(1, self.port.in_waiting))
+            except (OSError, serial.SerialException) as e:
+                self._loop.call_soon_threadsafe(self.reader.set_exception, e)
+                return
+
+            if data:
+                self._loop.call_soon_threadsafe(self.reader.feed_data, data)
+
+    def write(self, data):
+        self.port.write(data)
+
+    def discard_pending(self):
+        _discard_pending(self.reader)
+
+    def close(self):
+        self._closed.set()
+
+        if self._fd is not None:
+            self._loop.remove_reader(self._fd)
+        if self._thread is not None:
+            self._thread.join()
+
+        self.port.close()
+
+
+class _SocketConnection:
+    def __init__(self, reader, writer):
+        self.reader = reader
+        self._writer = writer
+
+    def write(self, data):
+        self._writer.write(data)
+
+    def discard_pending(self):
+        _discard_pending(self.reader)
+
+    def close(self):
+        self._writer.close()
+
+
+def _discard_pending(reader):
+    """
+    Drop what ``reader`` received so far, it can't answer what comes next
+    (see FrameReader.discard_pending)
+    """
+    # StreamReader has no public way to do it
+    reader._buffer.clear()
+
+
+async def open_serial_connection(device, **kwargs):
+    """Open ``device`` and return an object with ``reader``, ``write`` and ``close``"""
+    if device.startswith("socket://"):
+        url = urllib.parse.urlsplit(device)
+        reader, writer = await asyncio.open_connection(url.hostname, url.port)
+        return _SocketConnection(reader, writer)
+
+    loop = asyncio.get_running_loop()
+
+    port = serial.serial_for_url(device, do_not_open=True, **kwargs)
+    await loop.run_in_executor(None, port.open)
+
+    return SerialConnection(port, loop)
+
+
+class AsyncMeade:
+    def __init__(
+        self,
+        device,
+        timeout=5.0,
+        azimuth180_correct=True,
+        slew_idle_time=0.1,
+        max_slew_time=90.0,
+        stabilization_time=2.0,
+    ):
+        self.device = device
+        self.timeout = timeout
+        self.azimuth180_correct = azimuth180_correct
+        self.slew_idle_time = slew_idle_time
+        self.max_slew_time = max_slew_time
+        self.stabilization_time = stabilization_time
+
+        self._connection = None
+        self._lock = asyncio.Lock()
+        self._abort = asyncio.Event()
+        self._slewing = False
+
+        # set by the stops to end the move in progress early
+        self._stop = asyncio.Event()
+        self._moving = None
+
+    async def __aenter__(self):
+        await self.open()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def open(self):
+        try:
+            self._connection = await open_serial_connection(
+                self.device,
+                baudrate=9600,
+                bytesize=serial.EIGHTBITS,
+                parity=serial.PARITY_NONE,
+                stopbits=serial.STOPBITS_ONE,
+            )
+        except (OSError, serial.SerialException):
+            raise MeadeException("Error while opening %s." % self.device)
+
+        return True
+
+    async def close(self):
+        if self._connection is not None:
+            self._connection.close()
+            self._connection = None
+
+    # -- transport
+
+    async def _transact(self, *commands, decode=True):
+        if self._connection is None:
+            raise OSError("Device not open")
+
+        async with self._lock:
+            # late replies to a command that timed out
+            self._connection.discard_pending()
+            self._connection.write("".join(commands).encode("latin-1"))
+
+            replies = []
+            for command in commands:
+                kind = reply_kind(command)
+
+                if kind == Reply.NONE:
+                    replies.append(None)
+                    continue
+
+                try:
+                    reply = await asyncio.wait_for(
+                        self._read_reply(kind, reply_format(command)), self.timeout
+                    )
+                except (TimeoutError, asyncio.IncompleteReadError):
+                    raise MeadeException("No reply from the mount to %r." % command)
+
+                replies.append(reply.decode("latin-1") if decode else reply)
+
+        return replies
+
+    async def _read_reply(self, kind, accept):
+        # skip junk and frames that can't be the reply, like FrameReader
+        reader = self._connection.reader
+
+        while True:
+            if kind == Reply.CHAR:
+                reply = await reader.readexactly(1)
+                if accept is None or reply[0] in accept:
+                    return reply
+                continue
+
+            reply = await reader.readuntil(b"#")
+            if accept is None:
+                return reply
+
+            match = accept.search(reply)
+            if match is not None:
+                return reply[match.start() :]
+
+    async def _query(self, command):
+        return (await self._transact(command))[0]
+
+    # -- position
+
+    async def get_position_ra_dec(self):
+        ra, dec = await self._transact(":GR#", ":GD#", decode=False)
+        return Position.fromRaDec(parse_ra(ra), parse_dec(dec))
+
+    async def get_position_alt_az(self):
+        alt, az = await self._transact(":GA#", ":GZ#", decode=False)
+        return Position.fromAltAz(parse_dms(alt), parse_az(az, self.azimuth180_correct))
+
+    async def sample_telemetry(self):
+        when = time.monotonic()
+        timestamp = time.time()
+
+        ra, dec, alt, az, rate = await self._transact(
+            ":GR#", ":GD#", ":GA#", ":GZ#", ":GT#", decode=False
+        )
+
+        return TelemetrySnapshot(
+            timestamp,
+            when,
+            Position.fromRaDec(parse_ra(ra), parse_dec(dec)),
+            Position.fromAltAz(parse_dms(alt), parse_az(az, self.azimuth180_correct)),
+            self._slewing,
+            float(rate[:-1]),
+        )
+
+    # -- target
+
+    async def get_target_ra_dec(self):
+        ra, dec = await self._transact(":Gr#", ":Gd#", decode=False)
+        return Position.fromRaDec(parse_hms(ra), parse_dms(dec))
+
+    async def set_target_ra_dec(self, ra, dec):
+        if not isinstance(ra, Coord):
+            ra = Coord.fromHMS(ra)
+
+        if not isinstance(dec, Coord):
+            dec = Coord.fromDMS(dec)
+
+        ra_ok, dec_ok = await self._transact(
+            target_ra_command(ra), target_dec_command(dec)
+        )
+
+        if not parse_bool(ra_ok):
+            raise MeadeException("Invalid RA '%s'" % ra)
+
+        if not parse_bool(dec_ok):
+            raise MeadeException("Invalid DEC '%s'" % dec)
+
+        return True
+
+    # -- slew
+
+    def is_slewing(self):
+        return self._slewing
+
+    async def slew_to_ra_dec(self, position):
+        if self._slewing:
+            raise MeadeException("Telescope already slewing.")
+
+        position = position.toEpoch(Epoch.NOW)
+
+        await self.set_target_ra_dec(position.ra, position.dec)
+
+        self._slewing = True
+        self._abort.clear()
+
+        try:
+            async with self._lock:
+                # :MS# reply is variable, read it while holding the link
+                self._connection.discard_pending()
+                self._connection.write(b":MS#")
+                reader = self._connection.reader
+                err = await asyncio.wait_for(reader.readexactly(1), self.timeout)
+                if parse_bool(err.decode("latin-1")):
+                    msg = await asyncio.wait_for(reader.readuntil(b"#"), self.timeout)
+                    raise MeadeException(msg[:-1].decode("latin-1"))
+
+            return await self._wait_slew(time.monotonic(), position)
+        finally:
+            self._slewing = False
+
+    async def _wait_slew(self, start_time, target):
+        while True:
+            if self._abort.is_set():
+                return False
+
+            if time.monotonic() >= start_time + self.max_slew_time:
+                await self._transact(":Q#")
+                raise MeadeException("Slew aborted. Max slew time reached.")
+
+            position = await self.get_position_ra_dec()
+
+            if target.within(position, eps=Coord.fromAS(60)):
+                await asyncio.sleep(self.stabilization_time)
+                return True
+
+            try:
+                await asyncio.wait_for(self._abort.wait(), self.slew_idle_time)
+            except TimeoutError:
+                pass
+
+    async def abort_slew(self):
+        if not self._slewing:
+            return True
+
+        self._abort.set()
+        await self.stop_move_all()
+
+        return True
+
+    # -- moves
+
+    async def set_slew_rate(self, rate):
+        if rate == SlewRate.MAX:
+            if not parse_bool(await self._query(":Sw4#")):
+                raise ValueError("Invalid slew rate")
+
+        try:
+            await self._transact(_SLEW_RATE_COMMANDS[rate])
+        except KeyError:
+            raise ValueError("Invalid slew rate '%s'." % rate)
+
+        return True
+
+    async def move(self, direction, duration=1.0, slew_rate=None):
+        if slew_rate is None:
+            slew_rate = SlewRate.GUIDE
+
+        if duration <= 0:
+            raise ValueError("Slew duration cannot be less than 0.")
+
+        if self._slewing:
+            raise MeadeException("Telescope is slewing. Cannot move.")
+
+        await self.set_slew_rate(slew_rate)
+
+        self._slewing = True
+        self._moving = direction
+        self._stop.clear()
+        try:
+            await self._transact(":M%s#" % str(direction).lower())
+            try:
+                await asyncio.wait_for(self._stop.wait(), duration)
+            except TimeoutError:
+                pass
+        finally:
+            self._moving = None
+            await self.stop_move(direction)
+            self._slewing = False
+
+        return True
+
+    async def stop_move(self, direction):
+        if direction == self._moving:
+            self._stop.set()
+        await self._transact(":Q%s#" % str(direction).lower())
+        return True
+
+    async def stop_move_all(self):
+        self._stop.set()
+        await self._transact(":Q#")
+        return True
@@ -0,0 +1,149 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Local sidereal time and alt/az, computed instead of asked to the mount.
+
+The LX200 computes both from its clock and the site set at initialization
+(see Meade._init_telescope). :class:`LocalSky` does the same from our clock
+and the site, and keeps how far the mount disagrees, measured by
+:meth:`LocalSky.check` from what the mount reported at about the same time:
+an LST offset (the clocks differ) and what is left on alt/az after it (the
+mount keeps the site to the arc minute, firmware quirks, ...).
+
+Angles in degrees, RA and sidereal time in hours, azimuth from the north
+through the east.
+"""
+
+import datetime as dt
+import math
+
+__all__ = [
+    "julian_date",
+    "local_sidereal_time",
+    "radec_to_altaz",
+    "altaz_to_radec",
+    "LocalSky",
+]
+
+
+def julian_date(when):
+    return when.timestamp() / 86400.0 + 2440587.5
+
+
+def local_sidereal_time(utc, longitude):
+    """Local sidereal time (hours) for an UTC datetime and longitude (deg)"""
+    gmst = 18.697374558 + 24.06570982441908 * (julian_date(utc) - 2451545.0)
+    return (gmst + longitude / 15.0) % 24.0
+
+
+def radec_to_altaz(ra, dec, lat, lst):
+    ha = math.radians((lst - ra) * 15.0)
+    dec = math.radians(dec)
+    lat = math.radians(lat)
+
+    sin_alt = math.sin(dec) * math.sin(lat) + math.cos(dec) * math.cos(lat) * math.cos(
+        ha
+    )
+    alt = math.asin(max(-1.0, min(1.0, sin_alt)))
+
+    az = math.atan2(
+        -math.sin(ha) * math.cos(dec),
+        math.cos(lat) * math.sin(dec) - math.sin(lat) * math.cos(dec) * math.cos(ha),
+    )
+
+    return math.degrees(alt), math.degrees(az) % 360.0
+
+
+def altaz_to_radec(alt, az, lat, lst):
+    alt = math.radians(alt)
+    az = math.radians(az)
+    lat = math.radians(lat)
+
+    sin_dec = math.sin(alt) * math.sin(lat) + math.cos(alt) * math.cos(lat) * math.cos(
+        az
+    )
+    dec = math.asin(max(-1.0, min(1.0, sin_dec)))
+
+    ha = math.atan2(
+        -math.sin(az) * math.cos(alt),
+        math.cos(lat) * math.sin(alt) - math.sin(lat) * math.cos(alt) * math.cos(az),
+    )
+
+    return (lst - math.degrees(ha) / 15.0) % 24.0, math.degrees(dec)
+
+
+def _separation(alt1, az1, alt2, az2):
+    """Angle (degrees) between two alt/az positions"""
+    alt1, az1, alt2, az2 = map(math.radians, (alt1, az1, alt2, az2))
+
+    cos_sep = math.sin(alt1) * math.sin(alt2) + math.cos(alt1) * math.cos(
+        alt2
+    ) * math.cos(az1 - az2)
+
+    return math.degrees(math.acos(max(-1.0, min(1.0, cos_sep))))
+
+
+class LocalSky:
+    def __init__(self, latitude, longitude, smoothing=0.25, jump=2.0):
+        self.latitude = latitude
+        self.longitude = longitude
+        # weight of every new LST offset measure, the mount gives whole
+        # seconds. Changes over ``jump`` seconds are its clock being set,
+        # taken at once
+        self.smoothing = smoothing
+        self.jump = jump
+
+        # mount - ours, hours
+        self.lst_offset = 0.0
+        # mount - ours after the LST offset, degrees
+        self.alt_offset = 0.0
+        self.az_offset = 0.0
+        self.checks = 0
+
+    def lst(self, utc=None):
+        """Sidereal time of the mount (hours) at ``utc`` (now by default)"""
+        if utc is None:
+            utc = dt.datetime.now(dt.UTC)
+
+        return (local_sidereal_time(utc, self.longitude) + self.lst_offset) % 24.0
+
+    def alt_az(self, ra, dec, utc=None):
+        """(alt, az) the mount would report at ``utc`` when pointing at ra, dec"""
+        alt, az = radec_to_altaz(ra, dec, self.latitude, self.lst(utc))
+
+        return (
+            max(-90.0, min(90.0, alt + self.alt_offset)),
+            (az + self.az_offset) % 360.0,
+        )
+
+    def check(self, utc, ra, dec, alt, az, lst):
+        """
+        Update the offsets from what the mount reported at ``utc``. Returns
+        how far (degrees) its alt/az was from ours with the new LST offset,
+        which is how well the alt/az offsets held since the last check.
+        """
+        delta = (lst - local_sidereal_time(utc, self.longitude) + 12.0) % 24.0 - 12.0
+        step = (delta - self.lst_offset + 12.0) % 24.0 - 12.0
+        if self.checks == 0 or abs(step) * 3600 > self.jump:
+            self.lst_offset = delta
+        else:
+            self.lst_offset += self.smoothing * step
+
+        computed_alt, computed_az = radec_to_altaz(
+            ra, dec, self.latitude, self.lst(utc)
+        )
+        error = _separation(
+            alt,
+            az,
+            computed_alt + self.alt_offset,
+            computed_az + self.az_offset,
+        )
+
+        self.alt_offset = alt - computed_alt
+        # azimuth is meaningless at the zenith
+        if abs(alt) < 85.0:
+            self.az_offset = (az - computed_az + 180.0) % 360.0 - 180.0
+        self.checks += 1
+
+        return error
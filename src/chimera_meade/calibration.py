@@ -0,0 +1,274 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Persisted move calibration: how many arcseconds per second the mount moves
+for every slew rate and direction.
+
+Stored as a small JSON document, one file per device and site::
+
+    {
+      "version": 1,
+      "key": "/dev/ttyS0@LNA",
+      "rates": {
+        "GUIDE": {
+          "N": {"rate": 30.1, "samples": 2, "variance": 0.02,
+                "updated": "2026-01-01T00:00:00+00:00"},
+          ...
+        },
+        ...
+      }
+    }
+"""
+
+import datetime as dt
+import json
+import math
+import os
+import re
+from typing import NamedTuple
+
+__all__ = [
+    "CalibrationEntry",
+    "CalibrationStore",
+    "RateEstimator",
+    "atomic_write_json",
+]
+
+# two-sided 95% Student t quantiles by degrees of freedom
+_T95 = {
+    1: 12.706,
+    2: 4.303,
+    3: 3.182,
+    4: 2.776,
+    5: 2.571,
+    6: 2.447,
+    7: 2.365,
+    8: 2.306,
+    9: 2.262,
+    10: 2.228,
+}
+
+
+class CalibrationEntry(NamedTuple):
+    rate: float  # arcsec / s
+    samples: int
+    variance: float  # of rate, (arcsec / s)^2
+    updated: str  # ISO 8601, UTC
+
+    @classmethod
+    def from_samples(cls, rates):
+        n = len(rates)
+        mean = sum(rates) / n
+        variance = sum((r - mean) ** 2 for r in rates) / (n - 1) if n > 1 else 0.0
+        return cls(mean, n, variance, _now())
+
+    def confidence(self):
+        """Half width of the 95% confidence interval of rate (inf for one sample)"""
+        if self.samples < 2:
+            return float("inf")
+
+        t = _T95.get(self.samples - 1, 1.96)
+        return t * math.sqrt(self.variance / self.samples)
+
+
+class RateEstimator:
+    """
+    Running least squares fit of ``arc = rate * duration`` fed one move at a
+    time. Older moves are down-weighted by ``forget`` per move, so the rate
+    can follow slow changes during a night.
+
+    A move whose rate is more than ``reject`` sigmas away from the current
+    estimate is an outlier (wind, a bumped mount, a slew limit) and ignored,
+    unless ``warmup`` outliers in a row say the rate really changed, in which
+    case the fit restarts from them. Sigma is never below what reading the
+    position allows: the read resolution over the move duration.
+
+    Moves too short for their rate to be told within ``precision``
+    (relative) from the reads are not measurable and should be left out.
+    """
+
+    def __init__(
+        self,
+        entry=None,
+        forget=0.98,
+        reject=3.0,
+        warmup=3,
+        floor=0.01,
+        precision=0.1,
+    ):
+        self.forget = forget
+        self.reject = reject
+        self.warmup = warmup
+        # minimum sigma, relative to the rate
+        self.floor = floor
+        self.precision = precision
+
+        self._outliers = []
+        self._reset(entry)
+
+    def _reset(self, entry=None):
+        self.samples = 0
+        self._sxx = 0.0
+        self._sxy = 0.0
+        self._weight = 0.0
+        self._variance = 0.0
+
+        if entry is not None:
+            # calibration moves count as samples of 1 s each
+            self.samples = entry.samples
+            self._sxx = self._weight = float(entry.samples)
+            self._sxy = entry.rate * entry.samples
+            self._variance = entry.variance
+
+    @property
+    def rate(self):
+        return self._sxy / self._sxx if self._sxx > 0 else None
+
+    def ready(self):
+        return self.samples >= self.warmup
+
+    def measurable(self, duration, arc, resolution):
+        """
+        True if the rate of a move can be told within ``precision`` from
+        positions read ``resolution`` arcseconds apart
+        """
+        expected = self.rate * duration if self.rate is not None else arc
+        return duration > 0 and resolution <= self.precision * expected
+
+    def update(self, duration, arc, resolution=0.0):
+        """
+        Add a move, return False if it was rejected as an outlier. ``arc``
+        may be ``resolution`` arcseconds off (see measurable).
+        """
+        if duration <= 0:
+            return False
+
+        if self.ready():
+            rate = self.rate
+            sigma = max(
+                math.sqrt(self._variance), self.floor * rate, resolution / duration
+            )
+
+            if abs(arc / duration - rate) > self.reject * sigma:
+                self._outliers.append((duration, arc))
+
+                if len(self._outliers) < self.warmup:
+                    return False
+
+                outliers, self._outliers = self._outliers, []
+                self._reset()
+                for duration, arc in outliers:
+                    self._add(duration, arc)
+                return True
+
+        self._outliers = []
+        self._add(duration, arc)
+        return True
+
+    def _add(self, duration, arc):
+        residual = arc / duration - self.rate if self._sxx > 0 else 0.0
+
+        self._sxx = self.forget * self._sxx + duration**2
+        self._sxy = self.forget * self._sxy + duration * arc
+        self._weight = self.forget * self._weight + 1.0
+        self._variance += (residual**2 - self._variance) / self._weight
+        self.samples += 1
+
+    def entry(self):
+        return CalibrationEntry(self.rate, self.samples, self._variance, _now())
+
+
+def _now():
+    return dt.datetime.now(dt.UTC).isoformat(timespec="seconds")
+
+
+def atomic_write_json(path, data):
+    """Write data to path as JSON, readers see either the old or the new file"""
+    import tempfile
+
+    directory = os.path.dirname(path) or "."
+
+    fd, tmp = tempfile.mkstemp(
+        prefix=".%s." % os.path.basename(path), suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class CalibrationStore:
+    VERSION = 1
+
+    def __init__(self, path, key=""):
+        self.path = path
+        self.key = key
+
+    @classmethod
+    def for_device(cls, directory, device, site=None):
+        key = device if site is None else "%s@%s" % (device, site)
+        slug = re.sub(r"[^A-Za-z0-9.-]+", "_", key).strip("_")
+        return cls(os.path.join(directory, "meade-calibration-%s.json" % slug), key)
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def load(self):
+        """
+        Return {rate name: {direction name: CalibrationEntry}}, empty if
+        there is no file yet. Raises ValueError for invalid files.
+        """
+        if not self.exists():
+            return {}
+
+        with open(self.path) as f:
+            data = json.load(f)
+
+        if not isinstance(data, dict) or data.get("version") != self.VERSION:
+            raise ValueError(
+                "unsupported calibration file version %r"
+                % (data.get("version") if isinstance(data, dict) else None)
+            )
+
+        entries = {}
+        try:
+            for rate, directions in data["rates"].items():
+                entries[rate] = {}
+                for direction, entry in directions.items():
+                    entries[rate][direction] = CalibrationEntry(
+                        float(entry["rate"]),
+                        int(entry["samples"]),
+                        float(entry["variance"]),
+                        str(entry["updated"]),
+                    )
+        except (KeyError, TypeError, AttributeError) as e:
+            raise ValueError("invalid calibration file (%r)" % e)
+
+        for directions in entries.values():
+            for entry in directions.values():
+                if not entry.rate > 0:
+                    raise ValueError("invalid calibration rate %r" % entry.rate)
+
+        return entries
+
+    def save(self, entries):
+        atomic_write_json(
+            self.path,
+            {
+                "version": self.VERSION,
+                "key": self.key,
+                "rates": {
+                    rate: {
+                        direction: entry._asdict()
+                        for direction, entry in directions.items()
+                    }
+                    for rate, directions in entries.items()
+                },
+            },
+        )
@@ -0,0 +1,104 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Dead reckoning of the mount position between real reads.
+
+A :class:`PositionModel` follows one frame (RA/Dec or alt/az) as
+``(lon, lat)`` degrees. While the mount is settled (tracking or still) the
+position is extrapolated from the reads since it settled, along a straight
+line fitted between the oldest (within ``baseline`` seconds) and the last of
+them. During a timed move the velocity comes from the calibrated move rate
+instead. Any other motion (slews, syncs, stops, ...) makes the model unknown
+until the mount settles again and was read twice.
+
+Every prediction comes with a bound, in arcseconds of coordinate, on how far
+the mount may be from it: how fast it could stray from the line (``drift``,
+or the move rate uncertainty) plus the velocity uncertainty from the read
+resolution, times the time since the last read.
+"""
+
+from collections import deque
+from typing import NamedTuple
+
+__all__ = ["Fix", "PositionModel"]
+
+
+class Fix(NamedTuple):
+    when: float
+    lon: float
+    lat: float
+
+
+def _wrap(delta):
+    """delta (degrees) in [-180, 180)"""
+    return (delta + 180.0) % 360.0 - 180.0
+
+
+class PositionModel:
+    def __init__(self, resolution=(15.0, 1.0), drift=1.0, baseline=60.0):
+        # read resolution of lon and lat, arcsec
+        self.resolution = resolution
+        # arcsec/s the mount may stray from the extrapolation while settled
+        self.drift = drift
+        self.baseline = baseline
+
+        # reads since the mount settled
+        self._fixes = deque()
+        # (anchor Fix, lon deg/s, lat deg/s, error arcsec/s) during moves
+        self._motion = None
+
+    def observe(self, when, lon, lat):
+        fix = Fix(when, lon, lat)
+
+        if self._motion is not None:
+            _, vlon, vlat, error = self._motion
+            self._motion = (fix, vlon, vlat, error)
+            return
+
+        self._fixes.append(fix)
+        while len(self._fixes) > 2 and when - self._fixes[1].when >= self.baseline:
+            self._fixes.popleft()
+
+    @property
+    def moving(self):
+        """Following a move (see move())"""
+        return self._motion is not None
+
+    def disturb(self):
+        """The mount started moving in ways we can't tell, forget everything"""
+        self._fixes.clear()
+        self._motion = None
+
+    def move(self, start, vlon, vlat, error):
+        """
+        A move at (vlon, vlat) degrees/s started from ``start`` (a Fix),
+        ``error`` (arcsec/s) is how wrong the velocity may be. Ended by
+        disturb().
+        """
+        self._fixes.clear()
+        self._motion = (start, vlon, vlat, error)
+
+    def predict(self, when):
+        """((lon, lat), bound in arcsec) at ``when``, None if unknown"""
+        if self._motion is not None:
+            last, vlon, vlat, error = self._motion
+            error += self.drift
+        elif len(self._fixes) >= 2:
+            first, last = self._fixes[0], self._fixes[-1]
+            span = last.when - first.when
+            if span <= 0:
+                return None
+
+            vlon = _wrap(last.lon - first.lon) / span
+            vlat = (last.lat - first.lat) / span
+            error = self.drift + 2 * max(self.resolution) / span
+        else:
+            return None
+
+        elapsed = max(when - last.when, 0.0)
+
+        lon = (last.lon + vlon * elapsed) % 360.0
+        lat = max(-90.0, min(90.0, last.lat + vlat * elapsed))
+
+        return (lon, lat), error * elapsed
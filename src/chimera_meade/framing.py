@@ -0,0 +1,123 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Reads LX200 replies off a serial port, one frame at a time.
+
+Everything read from the port goes to a receive buffer that lives as long as
+the connection, so bytes read ahead (the next reply of a pipelined exchange)
+are kept for the next read. Frames are checked against the format expected
+for the command (see :func:`chimera_meade.lx200.reply_format`): junk before
+a reply is skipped, and frames that can't be the reply (late answers to a
+command that timed out, unsolicited messages) are thrown away. The reader
+resynchronizes on the next good frame, without flushing the port.
+"""
+
+import time
+
+__all__ = ["FrameReader"]
+
+
+class FrameReader:
+    def __init__(self, port, on_data=None):
+        self.port = port
+        self.on_data = on_data
+
+        self._buffer = bytearray()
+
+        # bytes thrown away by the last read_* call and since created
+        self.skipped = 0
+        self.discarded = 0
+
+    def discard_pending(self):
+        """Drop everything received so far, it can't answer what comes next"""
+        self._pull(self.port.in_waiting)
+        self._drop(len(self._buffer))
+
+    def read_char(self, accept=None):
+        """
+        Next byte in ``accept`` (any byte if None), b"" on timeout. Bytes
+        not in ``accept`` are skipped.
+        """
+        self.skipped = 0
+        deadline = self._deadline()
+
+        while True:
+            for i, byte in enumerate(self._buffer):
+                if accept is None or byte in accept:
+                    self._drop(i)
+                    self.skipped += i
+                    char = bytes(self._buffer[:1])
+                    del self._buffer[:1]
+                    return char
+
+            self.skipped += len(self._buffer)
+            self._drop(len(self._buffer))
+
+            if not self._fill(deadline):
+                return b""
+
+    def read_line(self, accept=None, eol=b"#"):
+        """
+        Next ``eol`` terminated frame that ``accept`` (a compiled bytes regex)
+        finds a match ending at the end of the frame in, returned from where
+        the match starts. On timeout returns what arrived of the frame,
+        without ``eol``.
+        """
+        self.skipped = 0
+        deadline = self._deadline()
+
+        while True:
+            end = self._buffer.find(eol)
+
+            if end >= 0:
+                end += len(eol)
+                frame = bytes(self._buffer[:end])
+                del self._buffer[:end]
+
+                if accept is None:
+                    return frame
+
+                match = accept.search(frame)
+                if match is not None:
+                    self.skipped += match.start()
+                    self.discarded += match.start()
+                    return frame[match.start() :]
+
+                # not an answer to this command
+                self.skipped += len(frame)
+                self.discarded += len(frame)
+                continue
+
+            if not self._fill(deadline):
+                return bytes(self._buffer)
+
+    def _deadline(self):
+        timeout = self.port.timeout
+        return None if timeout is None else time.monotonic() + timeout
+
+    def _fill(self, deadline):
+        """Read at least a byte before deadline, False on timeout"""
+        while True:
+            if self._pull(max(1, self.port.in_waiting)):
+                return True
+
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+
+    def _pull(self, n):
+        if n <= 0:
+            return 0
+
+        data = self.port.read(n)
+        if data:
+            self._buffer += data
+            if self.on_data is not None:
+                self.on_data(data)
+
+        return len(data)
+
+    def _drop(self, n):
+        if n:
+            del self._buffer[:n]
+            self.discarded += n
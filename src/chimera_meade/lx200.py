@@ -0,0 +1,317 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+LX200 protocol, shared by the blocking and the asyncio drivers: what the
+mount answers to each command, how to format commands and parse replies.
+
+The drivers pipeline commands: all commands of an exchange are written at
+once and the replies are read back in order, using the reply kind of each
+command to know where one reply ends and the next starts.
+
+Replies are parsed straight from the bytes read (``bytes``, ``bytearray``
+or ``memoryview``), str replies are accepted too. Coordinates are fixed width
+and read from the end, so junk before them (firmware quirks) is ignored.
+"""
+
+import datetime as dt
+import re
+
+from chimera.util.coord import Coord
+from chimera.util.enum import Enum
+
+__all__ = [
+    "ACK",
+    "MOTION_COMMANDS",
+    "Reply",
+    "reply_kind",
+    "reply_format",
+    "command_name",
+    "is_query",
+    "parse_bool",
+    "parse_hms",
+    "parse_dms",
+    "parse_ra",
+    "parse_dec",
+    "parse_az",
+    "parse_time",
+    "parse_distance_bars",
+    "parse_date",
+    "decode_sexagesimal",
+    "target_ra_command",
+    "target_dec_command",
+    "BAUD_RATES",
+    "baud_rate_command",
+]
+
+ACK = "\x06"
+
+# NONE: nothing, CHAR: a single byte, LINE: '#' terminated string
+Reply = Enum("NONE", "CHAR", "LINE")
+
+# command prefix (after ':') -> reply, longest prefix wins
+_REPLIES = {
+    # get
+    "G": Reply.LINE,
+    "D": Reply.LINE,
+    "CM": Reply.LINE,
+    # set, 1 on success, 0 on error
+    "S": Reply.CHAR,
+    # the alignment mode is acknowledged by the LX200s we support
+    "AA": Reply.CHAR,
+    "AP": Reply.CHAR,
+    "AL": Reply.CHAR,
+    # slews, 0 when accepted, 1 followed by a '#' terminated message if not
+    "MS": Reply.CHAR,
+    "MA": Reply.CHAR,
+    # rates, moves, stops and toggles
+    "R": Reply.NONE,
+    "M": Reply.NONE,
+    "Q": Reply.NONE,
+    "U": Reply.NONE,
+    "TM": Reply.NONE,
+    "Aa": Reply.NONE,
+}
+
+# what a good reply looks like, for LINE replies a regex that must match at
+# the end of the frame (anything before the match is junk), for CHAR replies
+# the accepted bytes. Commands not here take any reply.
+_HMS = re.compile(rb"\d\d:\d\d(?::\d\d|\.\d)#\Z")
+_DMS = re.compile(rb"[+-]?\d{2,3}[\xdf*]\d\d(?:[:']\d\d)?#\Z")
+_TIME = re.compile(rb"\d\d:\d\d:\d\d#\Z")
+
+_FORMATS = {
+    "GR": _HMS,
+    "Gr": _HMS,
+    "GD": _DMS,
+    "Gd": _DMS,
+    "GA": _DMS,
+    "GZ": _DMS,
+    "Gt": _DMS,
+    "Gg": _DMS,
+    "GL": _TIME,
+    "GS": _TIME,
+    "GC": re.compile(rb"\d\d/\d\d/\d\d#\Z"),
+    "GG": re.compile(rb"[+-]?\d+(?:\.\d)?#\Z"),
+    "GT": re.compile(rb"[+-]?\d+\.\d+#\Z"),
+    # a '0' sometimes comes before the alignment mode
+    "ACK": b"APLGD",
+    "S": b"01",
+    "MS": b"012",
+    "MA": b"012",
+}
+
+# commands after which the mount may not be where it was: slews, moves,
+# stops, syncs, alignment mode changes (tracking on/off) and tracking rate
+# changes
+MOTION_COMMANDS = re.compile(r":(M|Q|CM|A[APL]|T[MQL+-])")
+
+
+def reply_kind(command):
+    if command == ACK:
+        return Reply.CHAR
+
+    body = command[1:-1]
+
+    return _REPLIES.get(body[:2]) or _REPLIES.get(body[:1]) or Reply.NONE
+
+
+_COMMAND_NAME = re.compile(r":([A-Za-z]{1,2})")
+
+
+def command_name(command):
+    """Command without its arguments (':Sr12:00:00#' -> 'Sr'), for metrics"""
+    if command == ACK:
+        return "ACK"
+
+    match = _COMMAND_NAME.match(command)
+    return match.group(1) if match else command
+
+
+def is_query(command):
+    """True for commands that only read from the mount (gets, :D# and ACK)"""
+    return command == ACK or command[1:2] in ("G", "D")
+
+
+def reply_format(command):
+    """What a good reply to command looks like (see _FORMATS), None if unknown"""
+    name = command_name(command)
+
+    return _FORMATS.get(name) or _FORMATS.get(name[:1])
+
+
+def parse_bool(ret):
+    try:
+        return bool(int(ret))
+    except (TypeError, ValueError):
+        return False
+
+
+def _bytes(ret):
+    if isinstance(ret, str):
+        return ret.encode("latin-1")
+    return ret
+
+
+def _two_digits(buf, i):
+    tens = buf[i] - 48
+    units = buf[i + 1] - 48
+
+    if not (0 <= tens <= 9 and 0 <= units <= 9):
+        raise ValueError
+
+    return tens * 10 + units
+
+
+def decode_sexagesimal(buf, width=None):
+    """
+    Decode the LX200 formats ``[s]AA<sep>MM<sep>SS``, ``[s]AA<sep>MM.T``
+    and ``[s]AA<sep>MM`` (with or without the final '#') into
+    ``(negative, seconds)``, seconds being an int. The leading field has
+    ``width`` digits, or all the digits there are (up to 3) if None.
+
+    Parsed from the end, so leading junk is skipped: the stray '1' some
+    firmwares send before RA and Dec after a move ("118:30:35#",
+    "1+07*30:00#") is not part of the value.
+    """
+    end = len(buf)
+    if end and buf[end - 1] == 0x23:  # '#'
+        end -= 1
+
+    try:
+        if end >= 3 and buf[end - 3] in (0x3A, 0x27):  # ':' or "'", high precision
+            seconds = _two_digits(buf, end - 2)
+            minutes = end - 5
+        elif end >= 2 and buf[end - 2] == 0x2E:  # '.', tenths of minute
+            tenths = buf[end - 1] - 48
+            if not 0 <= tenths <= 9:
+                raise ValueError
+            seconds = tenths * 6
+            minutes = end - 4
+        else:
+            seconds = 0
+            minutes = end - 2
+
+        # at least one digit and a separator before the minutes
+        if minutes < 2:
+            raise ValueError
+
+        seconds += _two_digits(buf, minutes) * 60
+
+        value = 0
+        scale = 1
+        limit = width or 3
+        i = minutes - 2  # skip the separator
+        while i >= 0 and limit and 48 <= buf[i] <= 57:
+            value += (buf[i] - 48) * scale
+            scale *= 10
+            limit -= 1
+            i -= 1
+
+        if scale == 1 or (width and limit):
+            raise ValueError
+    except (IndexError, ValueError):
+        raise ValueError("Invalid LX200 reply %r" % bytes(buf)) from None
+
+    return i >= 0 and buf[i] == 0x2D, value * 3600 + seconds  # '-'
+
+
+def parse_hms(ret):
+    negative, seconds = decode_sexagesimal(_bytes(ret), 2)
+
+    return Coord.fromH((-seconds if negative else seconds) / 3600.0)
+
+
+def parse_dms(ret):
+    negative, seconds = decode_sexagesimal(_bytes(ret))
+
+    return Coord.fromD((-seconds if negative else seconds) / 3600.0)
+
+
+# the stray leading '1' (see decode_sexagesimal) is handled by the parsers
+parse_ra = parse_hms
+parse_dec = parse_dms
+
+
+def parse_az(ret, azimuth180_correct=True):
+    negative, seconds = decode_sexagesimal(_bytes(ret))
+
+    if negative:
+        seconds = -seconds
+
+    if azimuth180_correct:
+        if seconds >= 180 * 3600:
+            seconds -= 180 * 3600
+        else:
+            seconds += 180 * 3600
+
+    return Coord.fromD(seconds / 3600.0)
+
+
+def parse_distance_bars(ret):
+    """:D# reply, True while the mount says it is slewing"""
+    # a bar (0x7f or '|' depending on the firmware) per distance unit
+    return len(ret) > 1
+
+
+def parse_time(ret):
+    """HH:MM:SS# -> datetime.time"""
+    negative, seconds = decode_sexagesimal(_bytes(ret), 2)
+
+    hours, seconds = divmod(seconds, 3600)
+    minutes, seconds = divmod(seconds, 60)
+
+    return dt.time(hours, minutes, seconds)
+
+
+def parse_date(ret):
+    """MM/DD/YY# -> datetime.date (YY < 69 are 20YY, like strptime)"""
+    buf = _bytes(ret)
+
+    end = len(buf)
+    if end and buf[end - 1] == 0x23:  # '#'
+        end -= 1
+
+    if end < 8 or buf[end - 3] != 0x2F or buf[end - 6] != 0x2F:  # '/'
+        raise ValueError("Invalid LX200 date %r" % bytes(buf))
+
+    try:
+        month, day, year = (
+            int(bytes(buf[end - 8 : end - 6])),
+            int(bytes(buf[end - 5 : end - 3])),
+            int(bytes(buf[end - 2 : end])),
+        )
+    except ValueError:
+        raise ValueError("Invalid LX200 date %r" % bytes(buf))
+
+    return dt.date(year + (2000 if year < 69 else 1900), month, day)
+
+
+def target_ra_command(ra):
+    return ":Sr%s#" % ra.strfcoord("%(h)02d\xdf%(m)02d:%(s)02d")
+
+
+def target_dec_command(dec):
+    return ":Sd%s#" % dec.strfcoord("%(d)02d\xdf%(m)02d:%(s)02d")
+
+
+# line speed -> :SB<n># argument (57600 is 56.7K on Meade's manual)
+BAUD_RATES = {
+    57600: 1,
+    38400: 2,
+    28800: 3,
+    19200: 4,
+    14400: 5,
+    9600: 6,
+    4800: 7,
+    2400: 8,
+    1200: 9,
+}
+
+
+def baud_rate_command(baudrate):
+    """:SB<n># for baudrate, the mount answers at the old rate and switches"""
+    if baudrate not in BAUD_RATES:
+        raise ValueError("unsupported baud rate: %r" % baudrate)
+
+    return ":SB%d#" % BAUD_RATES[baudrate]
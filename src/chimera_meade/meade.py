@@ -1,66 +1,289 @@
 # SPDX-License-Identifier: GPL-2.0-or-later
 # SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
 
+import contextlib
 import datetime as dt
+import functools
+import math
 import os
-import pickle
 import threading
 import time
 
-import serial
 from chimera.core.constants import SYSTEM_CONFIG_DIRECTORY
 from chimera.core.exceptions import ChimeraException, ObjectNotFoundException
-from chimera.core.lock import lock
+from chimera.core.lock import lock as instrument_lock
 from chimera.instruments.telescope import TelescopeBase
 from chimera.interfaces.telescope import AlignMode, TelescopeStatus
 from chimera.util.coord import Coord
 from chimera.util.enum import Enum
 from chimera.util.position import Epoch, Position
 
+from chimera_meade.astrometry import LocalSky
+from chimera_meade.calibration import (
+    CalibrationEntry,
+    CalibrationStore,
+    RateEstimator,
+)
+from chimera_meade.deadreckoning import Fix, PositionModel
+from chimera_meade.framing import FrameReader
+from chimera_meade.lx200 import (
+    ACK,
+    MOTION_COMMANDS,
+    Reply,
+    baud_rate_command,
+    command_name,
+    is_query,
+    parse_az,
+    parse_bool,
+    parse_date,
+    parse_dec,
+    parse_distance_bars,
+    parse_dms,
+    parse_hms,
+    parse_ra,
+    parse_time,
+    reply_format,
+    reply_kind,
+    target_dec_command,
+    target_ra_command,
+)
+from chimera_meade.metrics import Metrics, MetricsExporter
+from chimera_meade.scheduler import BACKGROUND, URGENT, CommandScheduler
+from chimera_meade.singleflight import SingleFlight
+from chimera_meade.telemetry import TelemetryPoller, TelemetrySnapshot
+from chimera_meade.timing import MoveTimer
+from chimera_meade.transport import (
+    LinkStore,
+    can_set_baudrate,
+    create_port,
+    is_network,
+    pyserial,
+    tune_link,
+)
+from chimera_meade.wirelog import WireLog
+
+_lock_requests = threading.local()
+
+
+def lock(method):
+    """
+    chimera's @lock, also keeping how long the method took and how long it
+    waited for the instrument lock (see Meade.get_metrics)
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def entered(self, *args, **kwargs):
+        self._metrics.observe(
+            "lock_wait_seconds",
+            time.perf_counter() - _lock_requests.stack[-1],
+            lock="instrument",
+            method=name,
+        )
+        return method(self, *args, **kwargs)
+
+    locked = instrument_lock(entered)
+
+    @functools.wraps(locked)
+    def timed(self, *args, **kwargs):
+        stack = _lock_requests.__dict__.setdefault("stack", [])
+        start = time.perf_counter()
+        stack.append(start)
+        try:
+            return locked(self, *args, **kwargs)
+        finally:
+            stack.pop()
+            self._metrics.observe(
+                "method_latency_seconds", time.perf_counter() - start, method=name
+            )
+
+    return timed
+
+
 Direction = Enum("E", "W", "N", "S")
 SlewRate = Enum("GUIDE", "CENTER", "FIND", "MAX")
 
+# typical LX200 move rates (arcsec/s), only used to choose the length of the
+# first calibration moves before anything was measured
+_NOMINAL_MOVE_RATES = {
+    SlewRate.GUIDE: 30.0,
+    SlewRate.CENTER: 480.0,
+    SlewRate.FIND: 1800.0,
+    SlewRate.MAX: 14400.0,
+}
+
+# arcsec of (lon, lat) coordinate, in low and high precision, of position
+# reads (RA/Dec: HH:MM.T/sDD*MM and HH:MM:SS/sDD*MM:SS)
+_READ_RESOLUTION = {
+    "ra_dec": ((90.0, 60.0), (15.0, 1.0)),
+    "alt_az": ((60.0, 60.0), (1.0, 1.0)),
+}
+
 
 class MeadeException(ChimeraException):
     pass
 
 
 class Meade(TelescopeBase):
-    __config__ = {"azimuth180Correct": True}
+    __config__ = {
+        "azimuth180Correct": True,
+        # poll the slew indicator (:D#) instead of positions while slewing, at
+        # most every slew_max_idle_time seconds when far from the target
+        "slew_distance_bars": True,
+        "slew_max_idle_time": 1.0,
+        # positions younger than this (in seconds) are answered from memory
+        "position_cache_max_age": 0.5,
+        # older positions are dead reckoned from the last reads (and the
+        # calibrated rates during moves) while the error bound is within
+        # position_tolerance arcseconds (0: always read the mount), assuming
+        # the mount strays from the extrapolation at most
+        # position_model_drift arcseconds per second. get_position_* can be
+        # given their own tolerance
+        "position_tolerance": 0.0,
+        "position_model_drift": 1.0,
+        # background polling of the mount state, see get_telemetry
+        "telemetry": False,
+        "telemetry_idle_interval": 2.0,
+        "telemetry_busy_interval": 0.25,
+        "telemetry_history": 1000,
+        # GUIDE rate moves up to pulse_guide_max_duration seconds are timed by
+        # the mount (:Mg) instead of by us
+        "pulse_guide": True,
+        "pulse_guide_max_duration": 2.0,
+        # calibration moves aim at calibration_arc arcseconds (within the
+        # min/max durations, in seconds) and are repeated until opposite
+        # directions agree within calibration_tolerance (relative) on the
+        # first pass, the 95% confidence interval of the rate is within it,
+        # or calibration_max_samples moves were done
+        "calibration_arc": 150.0,
+        "calibration_min_duration": 1.0,
+        "calibration_max_duration": 5.0,
+        "calibration_tolerance": 0.02,
+        "calibration_max_samples": 6,
+        # completed moves refine the calibration as they happen, the table is
+        # saved at most every calibration_save_interval seconds
+        "online_calibration": True,
+        "calibration_save_interval": 300.0,
+        # log everything on the wire to meade-wire.log (binary, read it with
+        # python -m chimera_meade.wirelog), rotated at wire_log_max_bytes
+        "wire_log": True,
+        "wire_log_max_bytes": 4 << 20,
+        "wire_log_backups": 3,
+        # serve get_metrics() in the Prometheus text format on
+        # http://127.0.0.1:metrics_port/metrics, 0 disables it
+        "metrics_port": 0,
+        # align mode, slew rate, precision and tracking rate are kept in memory
+        # and only read again from the mount after a reconnect or after this
+        # many seconds (0: only after a reconnect)
+        "mode_revalidate_interval": 300.0,
+        # initialization leaves the mount clock alone when it is within this
+        # many seconds of ours
+        "init_time_tolerance": 2.0,
+        # network devices (socket://host:port, rfc2217://host:port): TCP
+        # keepalive probes start after keepalive_idle seconds (0 disables
+        # them), and links that drop are opened again (up to
+        # reconnect_attempts tries) and the exchange retried, without
+        # initializing the telescope again
+        "keepalive_idle": 10,
+        "reconnect": True,
+        "reconnect_attempts": 3,
+        # serial line speed, negotiated with :SB on firmwares that have it.
+        # What worked is remembered per device and used straight away on the
+        # next open, 9600 is used when the mount doesn't answer at the new
+        # rate (within baudrate_verify_timeout seconds) and that rate is not
+        # tried again for baudrate_retry_interval seconds
+        "baudrate": 9600,
+        "baudrate_verify_timeout": 0.5,
+        "baudrate_retry_interval": 86400.0,
+        # slews return as soon as the mount accepts them, a monitor thread
+        # follows them and fires slewComplete, so other clients don't wait
+        # on the slew for the instrument lock
+        "async_slew": False,
+        # callers asking for the same read-only query while it is on the wire
+        # share its replies (counted in the coalesced_total metric)
+        "coalesce_queries": True,
+        # sidereal time and alt/az (from RA/Dec) are computed from our clock
+        # and the site instead of asked to the mount. Every
+        # astrometry_check_interval seconds the mount is asked for both to
+        # keep how far it disagrees, and read instead while it disagreed by
+        # more than astrometry_max_error arcseconds
+        "local_astrometry": True,
+        "astrometry_check_interval": 60.0,
+        "astrometry_max_error": 300.0,
+    }
 
     def __init__(self):
         super().__init__()
 
         self._tty = None
-        self._slewRate = None
+        self._reader = None
+        # a network link dropped and could not be opened again yet
+        self._linkLost = False
+        # mode -> (time.monotonic() when read or set, value), see _mode
+        self._modes = {}
+
+        # step -> seconds, see _init_telescope
+        self._initTiming = {}
         self._abort = threading.Event()
         self._slewing = False
+        # follows slews with async_slew, see _monitor_slew
+        self._slewMonitor = None
 
         self._errorNo = 0
         self._errorString = ""
 
         self._lastAlignMode = None
+        # the LX200 can't tell its slew rate, this is the last one we set
+        self._slewRate = None
         self._parked = False
 
         self._target_az = None
         self._target_alt = None
 
-        # debug log
-        self._debugLog = None
-        try:
-            self._debugLog = open(
-                os.path.join(SYSTEM_CONFIG_DIRECTORY, "meade-debug.log"), "w"
-            )
-        except OSError as e:
-            self.log.warning("Could not create meade debug file (%s)" % str(e))
+        # serializes exchanges on the wire (by priority, stops skip it, see
+        # chimera_meade.scheduler), @lock serializes operations
+        self._serial_lock = CommandScheduler()
+        # identical queries in flight, see _transact
+        self._inflight = SingleFlight()
+
+        # "ra_dec"/"alt_az" -> (monotonic time of the read, Position)
+        self._position_cache = {}
+        # bumped when the mount is told to move, reads started before are
+        # not remembered
+        self._positionEpoch = 0
+        # "ra_dec"/"alt_az" -> PositionModel, see chimera_meade.deadreckoning
+        self._models = {}
+
+        # (latitude, longitude) degrees set at initialization, read from the
+        # mount when unknown
+        self._site = None
+        # LocalSky and when (monotonic) it was last checked, see _local_sky
+        self._sky = None
+        self._skyChecked = 0.0
+        self._skyTrusted = False
+        self._skyLock = threading.Lock()
+
+        self._telemetry = None
+
+        self._move_timer = MoveTimer()
+
+        # binary log of the serial line, see chimera_meade.wirelog
+        self._wireLog = None
+
+        self._metrics = Metrics()
+        self._metricsExporter = None
 
         # how much arcseconds / second for every slew rate
-        # and direction
-        self._calibration: dict[SlewRate, dict[Direction, int]] = {}
-        self._calibration_time = 5.0
-        self._calibrationFile = os.path.join(
-            SYSTEM_CONFIG_DIRECTORY, "move_calibration.bin"
-        )
+        # and direction, read on first use (see _load_calibration)
+        self._calibration: dict[SlewRate, dict[Direction, float]] = {}
+        self._calibrationStore = None
+        self._calibrationLoaded = False
+        # rate name -> direction name -> CalibrationEntry, as persisted
+        self._calibrationEntries = {}
+        # (rate, direction) -> RateEstimator, fed by _move
+        self._rateEstimators = {}
+        self._calibrationDirty = False
+        self._calibrationSaved = time.monotonic()
 
         for rate in SlewRate:
             self._calibration[rate] = {}
@@ -72,20 +295,44 @@ class Meade(TelescopeBase):
     def __start__(self):
         self.open()
 
-        # try to read saved calibration data
-        if os.path.exists(self._calibrationFile):
+        if self["telemetry"]:
+            self._telemetry = TelemetryPoller(
+                self._sample_telemetry,
+                self.is_slewing,
+                self["telemetry_idle_interval"],
+                self["telemetry_busy_interval"],
+                self["telemetry_history"],
+                self.log,
+            )
+            self._telemetry.start()
+
+        if self["metrics_port"]:
+            self._metricsExporter = MetricsExporter(self._metrics, self["metrics_port"])
             try:
-                self._calibration = pickle.loads(open(self._calibrationFile).read())
-                self.calibrated = True
-            except Exception as e:
-                self.log.warning("Problems reading calibration persisted data (%s)" % e)
+                self._metricsExporter.start()
+            except OSError as e:
+                self.log.warning("Could not start the metrics exporter (%s)" % e)
+                self._metricsExporter = None
 
         return True
 
     def __stop__(self):
+        if self._metricsExporter is not None:
+            self._metricsExporter.stop()
+            self._metricsExporter = None
+
+        if self._telemetry is not None:
+            self._telemetry.stop()
+            self._telemetry = None
+
         if self.is_slewing():
             self.abort_slew()
 
+        self._join_slew_monitor(self["max_slew_time"])
+
+        if self._calibrationDirty:
+            self._save_calibration()
+
         self.close()
 
     def __main__(self):
@@ -93,13 +340,14 @@ class Meade(TelescopeBase):
 
     # -- ITelescope implementation
 
-    def _check_meade(self):
+    def _check_meade(self, timeout=5):
         tmp = self._tty.timeout
-        self._tty.timeout = 5
-
-        align = self.get_align_mode()
+        self._tty.timeout = timeout
 
-        self._tty.timeout = tmp
+        try:
+            align = self.get_align_mode()
+        finally:
+            self._tty.timeout = tmp
 
         if align < 0:
             raise MeadeException(
@@ -109,22 +357,68 @@ class Meade(TelescopeBase):
         return True
 
     def _init_telescope(self):
-        self.set_align_mode(self["align_mode"])
+        """
+        Read what the mount has and write only what differs from what we want,
+        set_date can take up to a minute. Per step timing is kept, see
+        get_init_timing.
+        """
+        timing = {}
+        start = time.perf_counter()
+
+        with self._timed_step(timing, "read"):
+            # everything in a single exchange
+            align, ra, lat, long, offset, local, date = self._transact(
+                ACK, ":GR#", ":Gt#", ":Gg#", ":GG#", ":GL#", ":GC#", decode=False
+            )
+
+            self._set_mode(
+                "align_mode", self._parse_align_mode(align.decode("latin-1"))
+            )
+            # low precision RA is HH:MM.T#
+            self._set_mode("high_precision", len(ra) != 8)
+
+        with self._timed_step(timing, "align_mode"):
+            self.set_align_mode(self["align_mode"])
 
         # activate HPP (high precision poiting). We really need this!!
-        self._set_high_precision()
+        with self._timed_step(timing, "high_precision"):
+            self._set_high_precision()
 
         # set default slew rate
-        self.set_slew_rate(self["slew_rate"])
+        with self._timed_step(timing, "slew_rate"):
+            self.set_slew_rate(self["slew_rate"])
 
         try:
             site = self.getManager().getProxy("/Site/0")
 
-            self.set_lat(site["latitude"])
-            self.set_long(site["longitude"])
-            self.set_local_time(dt.datetime.now().time())
-            self.set_utc_offset(site.utcoffset())
-            self.set_date(dt.date.today())
+            with self._timed_step(timing, "lat"):
+                if self._angle_differs(lat, site["latitude"]):
+                    self.set_lat(site["latitude"])
+
+            with self._timed_step(timing, "long"):
+                if self._angle_differs(long, site["longitude"]):
+                    self.set_long(site["longitude"])
+
+            with self._timed_step(timing, "local_time"):
+                now = dt.datetime.now()
+                if self._time_differs(local, now):
+                    self.set_local_time(now.time())
+
+            with self._timed_step(timing, "utc_offset"):
+                utc_offset = site.utcoffset()
+                if self._float_differs(offset, "%+02.1f" % utc_offset):
+                    self.set_utc_offset(utc_offset)
+
+            with self._timed_step(timing, "date"):
+                today = dt.date.today()
+                if self._date_differs(date, today):
+                    self.set_date(today)
+
+            # more precise than what the mount keeps
+            self._site = tuple(
+                (angle if isinstance(angle, Coord) else Coord.fromDMS(angle)).D
+                for angle in (site["latitude"], site["longitude"])
+            )
         except ObjectNotFoundException:
             self.log.warning(
                 "Cannot initialize telescope. "
@@ -132,23 +426,100 @@ class Meade(TelescopeBase):
                 " attitude cannot be determined."
             )
 
+        self._initTiming = timing
+
+        self.log.info(
+            "Telescope initialized in %.3f s (%s)."
+            % (
+                time.perf_counter() - start,
+                ", ".join("%s: %.3f s" % step for step in timing.items()),
+            )
+        )
+
+    @contextlib.contextmanager
+    def _timed_step(self, timing, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timing[name] = time.perf_counter() - start
+
+    def get_init_timing(self):
+        """Seconds spent on every step of the last telescope initialization"""
+        return dict(self._initTiming)
+
+    # the mount keeps angles to the arc minute
+    def _angle_differs(self, ret, angle):
+        if not isinstance(angle, Coord):
+            angle = Coord.fromDMS(angle)
+
+        try:
+            diff = abs(parse_dms(ret).AS - angle.AS) % (360 * 3600)
+        except ValueError:
+            return True
+
+        return min(diff, 360 * 3600 - diff) >= 60
+
+    def _time_differs(self, ret, now):
+        try:
+            local = parse_time(ret)
+        except ValueError:
+            return True
+
+        diff = abs(
+            (local.hour - now.hour) * 3600
+            + (local.minute - now.minute) * 60
+            + local.second
+            - now.second
+        )
+
+        return min(diff, 86400 - diff) > self["init_time_tolerance"]
+
+    def _float_differs(self, ret, value):
+        try:
+            return float(ret[:-1]) != float(value)
+        except ValueError:
+            return True
+
+    def _date_differs(self, ret, date):
+        try:
+            return parse_date(ret) != date
+        except ValueError:
+            return True
+
     @lock
     def open(self):
-        self._tty = serial.Serial(
-            self["device"],
-            baudrate=9600,
-            bytesize=serial.EIGHTBITS,
-            parity=serial.PARITY_NONE,
-            stopbits=serial.STOPBITS_ONE,
-            timeout=self["timeout"],
-            xonxoff=False,
-            rtscts=False,
+        serial = pyserial()
+
+        self._tty = create_port(self["device"], self["timeout"])
+        self._linkLost = False
+
+        if self["wire_log"] and self._wireLog is None:
+            self._wireLog = WireLog(
+                os.path.join(SYSTEM_CONFIG_DIRECTORY, "meade-wire.log"),
+                max_bytes=self["wire_log_max_bytes"],
+                backups=self["wire_log_backups"],
+                log=self.log,
+            )
+            self._wireLog.start()
+
+        self._reader = FrameReader(
+            self._tty, self._wireLog.received if self._wireLog is not None else None
         )
 
+        # the mount may have been changed while we were away
+        self._modes.clear()
+        self._models = {
+            frame: PositionModel(drift=self["position_model_drift"])
+            for frame in ("ra_dec", "alt_az")
+        }
+        self._forget_sky(site=True)
+
         try:
             self._tty.open()
+            tune_link(self._tty, self["keepalive_idle"])
 
-            self._check_meade()
+            self._connect()
 
             # if self["auto_align"]:
             #    self.autoAlign ()
@@ -162,10 +533,107 @@ class Meade(TelescopeBase):
             return True
 
         except (OSError, serial.SerialException):
+            self._stop_wire_log()
             raise MeadeException("Error while opening %s." % self["device"])
+        except Exception:
+            self._stop_wire_log()
+            raise
+
+    def _connect(self):
+        """
+        Find the mount at the line speed that worked last time, or at 9600,
+        and negotiate the configured one if it is not there yet.
+        """
+        if not can_set_baudrate(self["device"]):
+            self._check_meade()
+            return
+
+        store = LinkStore.for_device(SYSTEM_CONFIG_DIRECTORY, self["device"])
+        known, refused = store.load(self["baudrate_retry_interval"])
+
+        if known != 9600:
+            self._tty.baudrate = known
+            try:
+                self._check_meade(self["baudrate_verify_timeout"])
+            except MeadeException:
+                # power cycled mounts are back at 9600
+                self.log.info(
+                    "No answer at %d baud, trying 9600 baud." % self._tty.baudrate
+                )
+                self._tty.baudrate = 9600
+                self._save_link(store, 9600, refused)
+
+        if self._tty.baudrate == 9600:
+            self._check_meade()
+
+        wanted = self["baudrate"]
+        if wanted != self._tty.baudrate and wanted not in refused:
+            if self._negotiate_baudrate(wanted):
+                self._save_link(store, wanted, refused)
+            else:
+                self._save_link(store, 9600, refused | {wanted: time.time()})
+
+        self.log.info("Talking to the mount at %d baud." % self._tty.baudrate)
+
+    def _negotiate_baudrate(self, baudrate):
+        """Move the link to baudrate with :SB, back to 9600 if that fails"""
+        command = baud_rate_command(baudrate)
+
+        # firmwares without :SB don't answer at all
+        if self._quick_query(command) != "1":
+            self.log.warning("Mount refused %d baud." % baudrate)
+            return False
+
+        # it answered at 9600 and is listening at the new rate now
+        self._tty.baudrate = baudrate
+        if self._verify_link():
+            return True
+
+        self._tty.baudrate = 9600
+        if not self._verify_link():
+            # it did switch but we can't talk to it there, tell it to go back
+            self._tty.baudrate = baudrate
+            with self._serial_lock:
+                self._write(baud_rate_command(9600))
+                self._tty.flush()
+                time.sleep(self["baudrate_verify_timeout"])
+            self._tty.baudrate = 9600
+
+            if not self._verify_link():
+                raise MeadeException(
+                    "Lost the mount at %d baud, power cycle it." % baudrate
+                )
+
+        self.log.warning("Mount not answering at %d baud, using 9600." % baudrate)
+        return False
+
+    def _verify_link(self):
+        return self._quick_query(ACK) in ("A", "P", "L")
+
+    def _quick_query(self, command):
+        tmp = self._tty.timeout
+        self._tty.timeout = self["baudrate_verify_timeout"]
+
+        try:
+            return self._query(command)
+        finally:
+            self._tty.timeout = tmp
+
+    def _save_link(self, store, baudrate, refused):
+        try:
+            store.save(baudrate, refused)
+        except OSError as e:
+            self.log.warning("Could not save the link speed (%s)" % e)
+
+    def _stop_wire_log(self):
+        if self._wireLog is not None:
+            self._wireLog.stop()
+            self._wireLog = None
 
     @lock
     def close(self):
+        self._stop_wire_log()
+
         if self._tty.isOpen():
             self._tty.close()
             return True
@@ -176,7 +644,7 @@ class Meade(TelescopeBase):
 
     @lock
     def auto_align(self):
-        self._write(":Aa#")
+        self._transact(":Aa#")
 
         while not self._tty.inWaiting():
             time.sleep(1)
@@ -186,16 +654,51 @@ class Meade(TelescopeBase):
 
         return True
 
-    @lock
     def get_align_mode(self):
-        self._write("\x06")  # ACK
+        return self._mode("align_mode", self._read_align_mode)
+
+    def _mode(self, name, read):
+        """Last known value of mode name, read(), under @lock, if unknown or stale"""
+        value = self._known_mode(name)
+
+        if value is None:
+            value = self._read_mode(name, read)
+
+        return value
+
+    def _known_mode(self, name):
+        known = self._modes.get(name)
+
+        if known is None:
+            return None
+
+        when, value = known
+        interval = self["mode_revalidate_interval"]
+        if interval and time.monotonic() - when > interval:
+            return None
+
+        return value
+
+    @lock
+    def _read_mode(self, name, read):
+        # someone may have read it while we waited for the lock
+        value = self._known_mode(name)
+
+        if value is None:
+            value = read()
+            self._set_mode(name, value)
 
-        ret = self._read(1)
+        return value
 
-        # damn stupid '0' at the start of the mode
-        if ret == "0":
-            ret = self._read(1, flush=False)
+    def _set_mode(self, name, value):
+        self._modes[name] = (time.monotonic(), value)
 
+    def _read_align_mode(self):
+        return self._parse_align_mode(self._query(ACK))
+
+    def _parse_align_mode(self, ret):
+        # the stupid '0' some firmwares send before the mode is skipped by
+        # the reader (see lx200.reply_format)
         if not ret or ret not in "APL":
             raise MeadeException("Couldn't get the alignment mode. Is this a Meade??")
 
@@ -212,13 +715,15 @@ class Meade(TelescopeBase):
             return True
 
         if mode == AlignMode.ALT_AZ:
-            self._write(":AA#")
+            self._query(":AA#")
         elif mode == AlignMode.POLAR:
-            self._write(":AP#")
+            self._query(":AP#")
         elif mode == AlignMode.LAND:
-            self._write(":AL#")
+            self._query(":AL#")
+        else:
+            return True
 
-        self._readbool()
+        self._set_mode("align_mode", mode)
 
         return True
 
@@ -229,11 +734,16 @@ class Meade(TelescopeBase):
         self._validateRaDec(position)
 
         if self.is_slewing():
-            # never should happens 'cause @lock
+            # only with async_slew, @lock keeps the others out
             raise MeadeException("Telescope already slewing.")
 
         self.set_target_ra_dec(position.ra, position.dec)
 
+        if self["async_slew"]:
+            start_time = self._start_slew_ra_dec()
+            self._monitor_slew(start_time, self.get_target_ra_dec)
+            return True
+
         status = TelescopeStatus.OK
 
         try:
@@ -245,27 +755,34 @@ class Meade(TelescopeBase):
         return False
 
     def _slew_to_ra_dec(self):
-        self._slewing = True
-        self._abort.clear()
+        start_time = self._start_slew_ra_dec()
 
-        # slew
-        self._write(":MS#")
+        try:
+            # slew possible
+            target = self.get_target_ra_dec()
 
-        # to handle timeout
-        start_time = time.time()
+            return self._wait_slew(start_time, target)
+        finally:
+            self._slewing = False
 
-        err = self._readbool()
+    def _start_slew_ra_dec(self):
+        self._slewing = True
+        self._abort.clear()
 
-        if err:
-            # check error message
-            msg = self._readline()
-            self._slewing = False
-            raise MeadeException(msg[:-1])
+        with self._serial_lock:
+            # slew
+            err = parse_bool(self._query(":MS#"))
+
+            # to handle timeout
+            start_time = time.time()
 
-        # slew possible
-        target = self.get_target_ra_dec()
+            if err:
+                # check error message
+                msg = self._readline()
+                self._slewing = False
+                raise MeadeException(msg[:-1])
 
-        return self._wait_slew(start_time, target)
+        return start_time
 
     @lock
     def slew_to_alt_az(self, position):
@@ -274,13 +791,29 @@ class Meade(TelescopeBase):
         self.set_slew_rate(self["slew_rate"])
 
         if self.is_slewing():
-            # never should happens 'cause @lock
+            # only with async_slew, @lock keeps the others out
             raise MeadeException("Telescope already slewing.")
 
         last_align_mode = self.get_align_mode()
 
         self.set_target_alt_az(position.alt, position.az)
 
+        if self["async_slew"]:
+            self.set_align_mode(AlignMode.ALT_AZ)
+            try:
+                start_time = self._start_slew_alt_az()
+            except MeadeException:
+                self.set_align_mode(last_align_mode)
+                raise
+
+            self._monitor_slew(
+                start_time,
+                self.get_target_alt_az,
+                local=True,
+                finish=lambda: self.set_align_mode(last_align_mode),
+            )
+            return True
+
         status = TelescopeStatus.OK
 
         try:
@@ -294,17 +827,26 @@ class Meade(TelescopeBase):
         return False
 
     def _slew_to_alt_az(self):
+        start_time = self._start_slew_alt_az()
+
+        try:
+            # slew possible
+            target = self.get_target_alt_az()
+
+            return self._wait_slew(start_time, target, local=True)
+        finally:
+            self._slewing = False
+
+    def _start_slew_alt_az(self):
         self._slewing = True
         self._abort.clear()
 
         # slew
-        self._write(":MA#")
+        err = parse_bool(self._query(":MA#"))
 
         # to handle timeout
         start_time = time.time()
 
-        err = self._readbool()
-
         if err:
             # check error message
             self._slewing = False
@@ -312,47 +854,121 @@ class Meade(TelescopeBase):
                 "Couldn't slew to ALT/AZ: '%s'." % self.get_target_alt_az()
             )
 
-        # slew possible
-        target = self.get_target_alt_az()
+        return start_time
 
-        return self._wait_slew(start_time, target, local=True)
+    def _monitor_slew(self, start_time, target, local=False, finish=None):
+        """
+        Follow an accepted slew to target() from a thread and fire
+        slewComplete (after finish()) when it ends. Only the serial lock is
+        taken, one command at a time, so @lock and the wire are free for
+        others meanwhile.
+        """
+
+        def monitor():
+            status = TelescopeStatus.ERROR
+            try:
+                status = self._wait_slew(start_time, target(), local)
+            except (MeadeException, OSError) as e:
+                self.log.error("Slew failed: %s" % e)
+            finally:
+                self._end_slew(finish)
+                self.slewComplete(self.get_position_ra_dec(), status)
+
+        self._slewMonitor = threading.Thread(
+            target=monitor, name="meade-slew", daemon=True
+        )
+        self._slewMonitor.start()
+
+    @lock
+    def _end_slew(self, finish=None):
+        # nobody can start another slew before finish() is done
+        try:
+            if finish is not None:
+                finish()
+        finally:
+            self._slewing = False
+
+    def _join_slew_monitor(self, timeout=None):
+        monitor = self._slewMonitor
+        if monitor is not None and monitor is not threading.current_thread():
+            monitor.join(timeout)
 
     def _wait_slew(self, start_time, target, local=False):
         self.slewBegin(target)
 
+        # two position reads give an arrival estimate, then the mount's own
+        # slew indicator (:D#, a single byte) is polled until it says the slew
+        # is done, and one last position read confirms it. Mounts that stop
+        # short of the target (or without :D#) get position polls only.
+        position_polls = not self["slew_distance_bars"]
+        samples = []  # (time.monotonic(), distance to target in arcsec)
+        arrival = None
+
         while True:
             # check slew abort event
             if self._abort.isSet():
-                self._slewing = False
                 return TelescopeStatus.ABORTED
 
             # check timeout
             if time.time() >= (start_time + self["max_slew_time"]):
                 self.abort_slew()
-                self._slewing = False
                 raise MeadeException("Slew aborted. Max slew time reached.")
 
+            if not position_polls and len(samples) >= 2:
+                if parse_distance_bars(self._query(":D#")):
+                    self._abort.wait(self._slew_poll_interval(arrival))
+                    continue
+
             if local:
-                position = self.get_position_alt_az()
+                position = self._read_position_alt_az()
             else:
-                position = self.get_position_ra_dec()
+                position = self._read_position_ra_dec()
 
             if target.within(position, eps=Coord.fromAS(60)):
                 time.sleep(self["stabilization_time"])
-                self._slewing = False
                 return TelescopeStatus.OK
 
-            time.sleep(self["slew_idle_time"])
+            if len(samples) >= 2 and not position_polls:
+                self.log.debug("Mount stopped short of the target, polling positions.")
+                position_polls = True
+
+            samples.append((time.monotonic(), target.angsep(position).AS))
+            if len(samples) >= 2:
+                arrival = self._estimate_arrival(samples)
+
+            self._abort.wait(self["slew_idle_time"])
 
         return TelescopeStatus.ERROR
 
+    def _estimate_arrival(self, samples):
+        (t0, d0), (t1, d1) = samples[0], samples[-1]
+
+        speed = (d0 - d1) / (t1 - t0)
+        if speed <= 0:
+            return None
+
+        return t1 + d1 / speed
+
+    def _slew_poll_interval(self, arrival):
+        # far from the target there's no hurry, poll more often when close
+        if arrival is None:
+            return self["slew_idle_time"]
+
+        return min(
+            max((arrival - time.monotonic()) / 2, self["slew_idle_time"]),
+            self["slew_max_idle_time"],
+        )
+
     def abort_slew(self):
         if not self.is_slewing():
             return True
 
-        self._abort.set()
-
-        self.stop_move_all()
+        # stop the mount first, then whoever is waiting for it, even if the
+        # stop couldn't be sent
+        try:
+            self.stop_move_all()
+        finally:
+            self._abort.set()
 
         time.sleep(self["stabilization_time"])
 
@@ -360,6 +976,7 @@ class Meade(TelescopeBase):
         return self._slewing
 
     def _move(self, direction, duration=1.0, slew_rate=None):
+        """Move for duration seconds, returns how far it went (arcsec)"""
         if slew_rate is None:
             slew_rate = SlewRate.GUIDE
 
@@ -374,34 +991,111 @@ class Meade(TelescopeBase):
         if slew_rate:
             self.set_slew_rate(slew_rate)
 
-        start_pos = self.get_position_ra_dec()
+        start_pos = self._read_position_ra_dec()
 
-        self._slewing = True
-        self._write(":M%s#" % str(direction).lower())
-
-        start = time.time()
-        finish = start + duration
-
-        self.log.debug("[move] delta: %f s" % (finish - start,))
+        pulse = self._use_pulse_guide(duration, slew_rate)
 
-        while time.time() < finish:
-            pass  # busy wait!
+        self._slewing = True
+        try:
+            self._move_timer.begin(direction)
 
-        # FIXME: slew limits
-        self._stop_move(direction)
-        self._slewing = False
+            try:
+                if pulse:
+                    self._transact(
+                        ":Mg%s%04d#" % (str(direction).lower(), round(duration * 1000))
+                    )
+                else:
+                    self._transact(":M%s#" % str(direction).lower())
+
+                finish = time.monotonic() + duration
+                self._reckon_move(direction, slew_rate, start_pos, finish - duration)
+
+                self.log.debug(
+                    "[move] delta: %f s (%s)"
+                    % (duration, "pulse" if pulse else "timed")
+                )
+
+                completed = self._move_timer.wait_until(finish)
+
+                # pulses are stopped by the mount itself
+                # FIXME: slew limits
+                if not pulse or not completed:
+                    self._write_now(":Q%s#" % str(direction).lower())
+                error = time.monotonic() - finish
+            finally:
+                self._move_timer.end()
+                # pulses end on their own
+                self._invalidate_position_cache()
+
+            if not completed:
+                self.log.debug("[move] cancelled %.3f s early" % -error)
+            elif not pulse:
+                self._move_timer.record(error)
+                self.log.debug("[move] stop error: %+.3f ms" % (error * 1000))
+
+            self._settle_move()
+        finally:
+            self._slewing = False
 
         def calc_delta(start, end):
             return Coord.fromD(end.angsep(start))
 
-        delta = calc_delta(start_pos, self.get_position_ra_dec())
+        delta = calc_delta(start_pos, self._read_position_ra_dec())
         self.log.debug("[move] moved %f arcsec" % delta.AS)
 
-        return True
+        if completed and self["online_calibration"]:
+            self._learn_move(
+                direction,
+                slew_rate,
+                duration,
+                delta.AS,
+                self._arc_resolution(start_pos),
+            )
+
+        return delta.AS
+
+    def _reckon_move(self, direction, slew_rate, start, when):
+        """Let the RA/Dec model follow a move from ``start`` begun at ``when``"""
+        model = self._models.get("ra_dec")
+        if model is None:
+            return
+
+        if self._is_rate_calibrated(slew_rate):
+            rate = self._calibration[slew_rate][direction]
+            entry = self._calibrationEntries[str(slew_rate)][str(direction)]
+            error = max(entry.confidence(), 0.1 * rate)
+        else:
+            rate = _NOMINAL_MOVE_RATES[slew_rate]
+            error = 0.5 * rate
+
+        vlon = vlat = 0.0
+        if direction in (Direction.N, Direction.S):
+            vlat = rate if direction == Direction.N else -rate
+        else:
+            # arcsec on the sky are more RA coordinate away from the equator
+            cos_dec = math.cos(math.radians(start.dec.D))
+            if cos_dec < 0.01:
+                return
+            vlon = (rate if direction == Direction.E else -rate) / cos_dec
+            error /= cos_dec
+
+        model.move(
+            Fix(when, start.ra.D, start.dec.D), vlon / 3600.0, vlat / 3600.0, error
+        )
+
+    def _use_pulse_guide(self, duration, slew_rate):
+        # :Mg durations are given in ms with 4 digits
+        return (
+            self["pulse_guide"]
+            and slew_rate == SlewRate.GUIDE
+            and duration <= min(self["pulse_guide_max_duration"], 9.999)
+        )
 
     def _stop_move(self, direction):
-        self._write(":Q%s#" % str(direction).lower())
+        self._write_now(":Q%s#" % str(direction).lower())
+        return self._settle_move()
 
+    def _settle_move(self):
         rate = self.get_slew_rate()
         # FIXME: stabilization time depends on the slewRate!!!
         if rate == SlewRate.GUIDE:
@@ -421,139 +1115,580 @@ class Meade(TelescopeBase):
             return True
 
     def is_move_calibrated(self):
-        return os.path.exists(self._calibrationFile)
+        self._load_calibration()
+        return bool(self._calibrationEntries)
 
-    @lock
-    def calibrate_move(self):
-        # FIXME: move to a safe zone to do calibrations.
-        def calc_delta(start, end):
-            return end.angsep(start)
+    def _calibration_store(self):
+        if self._calibrationStore is None:
+            # one file per mount and site, hosts may run more than one
+            site = None
+            try:
+                site = self.getManager().getProxy("/Site/0")["name"]
+            except ObjectNotFoundException:
+                pass
+
+            self._calibrationStore = CalibrationStore.for_device(
+                SYSTEM_CONFIG_DIRECTORY, self["device"], site
+            )
+
+        return self._calibrationStore
+
+    def _load_calibration(self):
+        if self._calibrationLoaded:
+            return
 
-        def calibrate(direction, rate):
-            start = self.get_position_ra_dec()
-            self._move(direction, self._calibration_time, rate)
-            end = self.get_position_ra_dec()
+        self._calibrationLoaded = True
 
-            return calc_delta(start, end)
+        try:
+            entries = self._calibration_store().load()
+        except (OSError, ValueError) as e:
+            # calibrated again when needed
+            self.log.warning("Problems reading calibration persisted data (%s)" % e)
+            return
 
         for rate in SlewRate:
             for direction in Direction:
-                self.log.debug("Calibrating %s %s" % (rate, direction))
-
-                total = 0
+                entry = entries.get(str(rate), {}).get(str(direction))
+                if entry is not None:
+                    self._calibration[rate][direction] = entry.rate
 
-                for i in range(2):
-                    total += calibrate(direction, rate).AS
+        self._calibrationEntries = entries
 
-                self.log.debug("> %f" % (total / 2.0))
-                self._calibration[rate][direction] = total / 2.0
+    def _save_calibration(self):
+        self._calibrationDirty = False
+        self._calibrationSaved = time.monotonic()
 
-        # save calibration
         try:
-            f = open(self._calibrationFile, "w")
-            f.write(pickle.dumps(self._calibration))
-            f.close()
-        except Exception as e:
+            self._calibration_store().save(self._calibrationEntries)
+        except OSError as e:
             self.log.warning("Problems persisting calibration data. (%s)" % e)
 
+    def _arc_resolution(self, position):
+        """How wrong (arcsec) the arc between two reads near position may be"""
+        high = self._modes.get("high_precision", (None, False))[1]
+        ra, dec = _READ_RESOLUTION["ra_dec"][bool(high)]
+
+        return math.hypot(ra * math.cos(math.radians(position.dec.D)), dec)
+
+    def _learn_move(self, direction, rate, duration, arc, resolution=0.0):
+        self._load_calibration()
+
+        estimator = self._rateEstimators.get((rate, direction))
+        if estimator is None:
+            entry = self._calibrationEntries.get(str(rate), {}).get(str(direction))
+            estimator = RateEstimator(entry)
+            self._rateEstimators[(rate, direction)] = estimator
+
+        if not estimator.measurable(duration, arc, resolution):
+            self.log.debug(
+                "[move] %s %s: %.3f s is too short to measure the rate, ignored"
+                % (rate, direction, duration)
+            )
+            return
+
+        if not estimator.update(duration, arc, resolution):
+            self.log.debug(
+                "[move] %s %s: %f arcsec/s looks like an outlier, ignored"
+                % (rate, direction, arc / duration)
+            )
+            return
+
+        if not estimator.ready():
+            return
+
+        entry = estimator.entry()
+        self._calibration[rate][direction] = entry.rate
+        self._calibrationEntries.setdefault(str(rate), {})[str(direction)] = entry
+        self._calibrationDirty = True
+
+        if (
+            time.monotonic() - self._calibrationSaved
+            >= self["calibration_save_interval"]
+        ):
+            self._save_calibration()
+
+    def _is_rate_calibrated(self, rate):
+        self._load_calibration()
+        calibrated = self._calibrationEntries.get(str(rate), {})
+        return all(str(direction) in calibrated for direction in Direction)
+
+    @lock
+    def calibrate_move(self, rates=None):
+        """
+        Measure the move rate for every direction at the given slew rates
+        (all of them by default). Opposite directions are alternated, so
+        the telescope ends up where it started.
+        """
+        # FIXME: move to a safe zone to do calibrations.
+        if rates is None:
+            rates = list(SlewRate)
+
+        self._load_calibration()
+
+        for rate in rates:
+            for directions in ((Direction.E, Direction.W), (Direction.N, Direction.S)):
+                self._calibrate_directions(rate, directions)
+
+        self._save_calibration()
+
         self.log.info("Calibration was OK.")
 
+    def _calibrate_directions(self, rate, directions):
+        samples = {direction: [] for direction in directions}
+
+        while True:
+            for direction in directions:
+                duration = self._calibration_duration(
+                    rate, direction, samples[direction]
+                )
+
+                self.log.debug(
+                    "Calibrating %s %s (%.3f s)" % (rate, direction, duration)
+                )
+
+                arc = self._move(direction, duration, rate)
+                samples[direction].append(arc / duration)
+
+            entries = {
+                direction: CalibrationEntry.from_samples(rates)
+                for direction, rates in samples.items()
+            }
+
+            tolerance = self["calibration_tolerance"]
+
+            # with nothing to average out, one move each way is enough. Both
+            # are taken as samples of the same rate, which gives the entries
+            # a confidence interval
+            rates = [entry.rate for entry in entries.values()]
+            first_pass = len(samples[directions[0]]) == 1
+            if first_pass and max(rates) - min(rates) <= tolerance * min(rates):
+                pooled = CalibrationEntry.from_samples(rates)
+                entries = dict.fromkeys(directions, pooled)
+                break
+
+            done = all(
+                entry.confidence() <= tolerance * entry.rate
+                for entry in entries.values()
+            )
+
+            if done or len(samples[directions[0]]) >= self["calibration_max_samples"]:
+                break
+
+        for direction, entry in entries.items():
+            self.log.debug(
+                "> %s %s: %f +/- %f arcsec/s (%d samples)"
+                % (rate, direction, entry.rate, entry.confidence(), entry.samples)
+            )
+            self._calibration[rate][direction] = entry.rate
+            self._calibrationEntries.setdefault(str(rate), {})[str(direction)] = entry
+            # start refining from the new measurement
+            self._rateEstimators.pop((rate, direction), None)
+
+    def _calibration_duration(self, rate, direction, samples):
+        if samples:
+            estimate = sum(samples) / len(samples)
+        else:
+            entry = self._calibrationEntries.get(str(rate), {}).get(str(direction))
+            estimate = entry.rate if entry else _NOMINAL_MOVE_RATES[rate]
+
+        duration = self["calibration_arc"] / max(estimate, 1e-3)
+
+        return min(
+            max(duration, self["calibration_min_duration"]),
+            self["calibration_max_duration"],
+        )
+
     def _calc_duration(self, arc, direction, rate):
         """
         Calculates the time spent (returned number) to move by arc in a
         given direction at a given rate
         """
 
-        if not self.is_move_calibrated():
-            self.log.info("Telescope fine movement not calibrated. Calibrating now...")
-            self.calibrate_move()
+        if rate is None:
+            rate = SlewRate.GUIDE
+
+        if not self._is_rate_calibrated(rate):
+            # only the rate in use, guiding shouldn't stop for all of them
+            self.log.info(
+                "Telescope fine movement not calibrated at %s rate. Calibrating now..."
+                % rate
+            )
+            self.calibrate_move([rate])
 
         self.log.debug("[move] asked for %s arcsec" % float(arc))
 
-        return arc * (self._calibration_time / self._calibration[rate][direction])
+        # pulse guide moves (see _move) also run at the GUIDE rate, so the
+        # same calibration applies to them
+
+        return arc / self._calibration[rate][direction]
 
     @lock
     def move_east(self, offset, slew_rate=None):
-        return self._move(
+        self._move(
             Direction.E, self._calc_duration(offset, Direction.E, slew_rate), slew_rate
         )
+        return True
 
     @lock
     def move_west(self, offset, slew_rate=None):
-        return self._move(
+        self._move(
             Direction.W, self._calc_duration(offset, Direction.W, slew_rate), slew_rate
         )
+        return True
 
     @lock
     def move_north(self, offset, slew_rate=None):
-        return self._move(
+        self._move(
             Direction.N, self._calc_duration(offset, Direction.N, slew_rate), slew_rate
         )
+        return True
 
     @lock
     def move_south(self, offset, slew_rate=None):
-        return self._move(
+        self._move(
             Direction.S, self._calc_duration(offset, Direction.S, slew_rate), slew_rate
         )
+        return True
+
+    # stops don't take @lock or wait for the line, see _write_now
 
-    @lock
     def stop_move_east(self):
+        self._move_timer.cancel(Direction.E)
         return self._stop_move(Direction.E)
 
-    @lock
     def stop_move_west(self):
+        self._move_timer.cancel(Direction.W)
         return self._stop_move(Direction.W)
 
-    @lock
     def stop_move_north(self):
+        self._move_timer.cancel(Direction.N)
         return self._stop_move(Direction.N)
 
-    @lock
     def stop_move_south(self):
+        self._move_timer.cancel(Direction.S)
         return self._stop_move(Direction.S)
 
-    @lock
     def stop_move_all(self):
-        self._write(":Q#")
+        self._write_now(":Q#")
+        self._move_timer.cancel()
         return True
 
-    @lock
+    def get_move_timing(self):
+        """How far from the requested time the last timed moves stopped"""
+        return self._move_timer.stats()
+
     def get_ra(self):
-        self._write(":GR#")
-        ret = self._readline()
+        return self.get_position_ra_dec().ra
 
-        # meade bugs: sometimes, after use Move commands, getRa
-        # returns a 1 before the RA, so we just check this and discard
-        # it here
-        if len(ret) > 9:
-            ret = ret[1:]
+    def get_dec(self):
+        return self.get_position_ra_dec().dec
 
-        return Coord.fromHMS(ret[:-1])
+    def get_position_ra_dec(self, tolerance=None):
+        """
+        Current position, from memory when possible: read less than
+        position_cache_max_age seconds ago or dead reckoned within
+        ``tolerance`` arcseconds (position_tolerance by default)
+        """
+        # no lock needed to answer from memory
+        position = self._cached_position("ra_dec")
+        if position is None:
+            position = self._reckoned_position("ra_dec", tolerance)
+        if position is None:
+            position = self._read_position_ra_dec()
+        return position
+
+    def get_position_alt_az(self, tolerance=None):
+        """
+        See get_position_ra_dec, computed from the RA/Dec position with
+        local_astrometry
+        """
+        position = self._cached_position("alt_az")
+        if position is None:
+            position = self._reckoned_position("alt_az", tolerance)
+        if position is None:
+            position = self._computed_position_alt_az(tolerance)
+        if position is None:
+            position = self._read_position_alt_az()
+        return position
+
+    def estimate_position_ra_dec(self):
+        """
+        (Position, error bound in arcsec) dead reckoned from the last reads,
+        (None, None) while unknown (after slews, until read twice). Never
+        reads the mount.
+        """
+        return self._estimate_position("ra_dec")
+
+    def estimate_position_alt_az(self):
+        """See estimate_position_ra_dec"""
+        return self._estimate_position("alt_az")
+
+    # no @lock, concurrent reads share one exchange (see _transact)
+
+    def _read_position_ra_dec(self):
+        epoch = self._positionEpoch
+        when = time.monotonic()
+        ra, dec = self._transact(":GR#", ":GD#", decode=False)
+        position = Position.fromRaDec(parse_ra(ra), parse_dec(dec))
+        self._note_precision(ra)
+        self._remember_position("ra_dec", when, position, epoch)
+
+        return position
+
+    def _read_position_alt_az(self):
+        epoch = self._positionEpoch
+        when = time.monotonic()
+        alt, az = self._transact(":GA#", ":GZ#", decode=False)
+        position = Position.fromAltAz(
+            parse_dms(alt), parse_az(az, self["azimuth180Correct"])
+        )
+        self._remember_position("alt_az", when, position, epoch)
 
-    @lock
-    def get_dec(self):
-        self._write(":GD#")
-        ret = self._readline()
+        return position
 
-        # meade bugs: same as getRa
-        if len(ret) > 10:
-            ret = ret[1:]
+    def _note_precision(self, ra):
+        # low precision RA is HH:MM.T#, see _remember_position
+        self._set_mode("high_precision", len(ra) != 8)
 
-        ret = ret.replace("\xdf", ":")
+    def _remember_position(self, frame, when, position, epoch):
+        # the mount was told to move while we were reading
+        if epoch != self._positionEpoch:
+            return
 
-        return Coord.fromDMS(ret[:-1])
+        self._position_cache[frame] = (when, position)
 
-    @lock
-    def get_position_ra_dec(self):
-        return Position.fromRaDec(self.get_ra(), self.get_dec())
+        model = self._models.get(frame)
+        # slews (and the settling after moves) can't be extrapolated
+        if model is None or (self._slewing and not model.moving):
+            return
 
-    @lock
-    def get_position_alt_az(self):
-        return Position.fromAltAz(self.get_alt(), self.get_az())
+        high = self._modes.get("high_precision", (None, False))[1]
+        model.resolution = _READ_RESOLUTION[frame][bool(high)]
+
+        if frame == "ra_dec":
+            model.observe(when, position.ra.D, position.dec.D)
+        else:
+            model.observe(when, position.az.D, position.alt.D)
+
+    def _estimate_position(self, frame):
+        model = self._models.get(frame)
+        estimate = model.predict(time.monotonic()) if model is not None else None
+
+        if estimate is None:
+            return None, None
+
+        (lon, lat), bound = estimate
+        if frame == "ra_dec":
+            position = Position.fromRaDec(Coord.fromD(lon), Coord.fromD(lat))
+        else:
+            position = Position.fromAltAz(Coord.fromD(lat), Coord.fromD(lon))
+
+        return position, bound
+
+    def _reckoned_position(self, frame, tolerance):
+        if tolerance is None:
+            tolerance = self["position_tolerance"]
+
+        if tolerance <= 0:
+            return None
+
+        position, bound = self._estimate_position(frame)
+        if position is None or bound > tolerance:
+            return None
+
+        self._metrics.count("reckoned_total", frame=frame)
+        return position
+
+    def _cached_position(self, frame):
+        cached = self._position_cache.get(frame)
+
+        if cached is None:
+            return None
+
+        max_age = self["position_cache_max_age"]
+        if self._telemetry is not None:
+            # the poller keeps it fresh
+            max_age = max(max_age, 2 * self._telemetry.interval)
+
+        when, position = cached
+        if time.monotonic() - when > max_age:
+            return None
+
+        return position
+
+    # -- local astrometry, see chimera_meade.astrometry
+
+    def _computed_position_alt_az(self, tolerance):
+        sky = self._local_sky()
+        if sky is None:
+            return None
+
+        ra_dec = self.get_position_ra_dec(tolerance)
+        alt, az = sky.alt_az(ra_dec.ra.H, ra_dec.dec.D)
+        self._metrics.count("computed_total", quantity="alt_az")
+
+        return Position.fromAltAz(Coord.fromD(alt), Coord.fromD(az))
+
+    def _local_sky(self):
+        """LocalSky checked against the mount when due, None if not to be used"""
+        if not self["local_astrometry"]:
+            return None
+
+        if self._sky_check_due():
+            self._check_sky()
+
+        return self._sky if self._skyTrusted else None
+
+    def _sky_check_due(self):
+        return (
+            self._sky is None
+            or time.monotonic() - self._skyChecked >= self["astrometry_check_interval"]
+        )
+
+    def _check_sky(self):
+        with self._skyLock:
+            # somebody else just did it
+            if not self._sky_check_due():
+                return
+
+            site, sky = self._site, self._sky
+
+            commands = [":GR#", ":GD#", ":GA#", ":GZ#", ":GS#"]
+            if site is None:
+                commands += [":Gt#", ":Gg#"]
+
+            epoch = self._positionEpoch
+            when = time.monotonic()
+            utc = dt.datetime.now(dt.UTC)
+
+            replies = self._transact(*commands, decode=False)
+
+            # replies are sent about the middle of the exchange
+            utc += dt.timedelta(seconds=(time.monotonic() - when) / 2)
+
+            ra, dec, alt, az, lst = replies[:5]
+            ra_dec = Position.fromRaDec(parse_ra(ra), parse_dec(dec))
+            self._note_precision(ra)
+            alt_az = Position.fromAltAz(
+                parse_dms(alt), parse_az(az, self["azimuth180Correct"])
+            )
+            self._remember_position("ra_dec", when, ra_dec, epoch)
+            self._remember_position("alt_az", when, alt_az, epoch)
+
+            if site is None:
+                site = self._site = tuple(parse_dms(ret).D for ret in replies[5:])
+
+            if sky is None:
+                sky = LocalSky(*site)
+
+            lst = parse_time(lst)
+            error = sky.check(
+                utc,
+                ra_dec.ra.H,
+                ra_dec.dec.D,
+                alt_az.alt.D,
+                alt_az.az.D,
+                lst.hour + lst.minute / 60.0 + lst.second / 3600.0,
+            )
+            self._sky = sky
+            self._skyChecked = time.monotonic()
+
+            trusted = error * 3600 <= self["astrometry_max_error"]
+            if trusted and not self._skyTrusted:
+                self.log.info(
+                    "Using local astrometry (%.1f arcsec from the mount)."
+                    % (error * 3600)
+                )
+            elif not trusted:
+                self.log.warning(
+                    "Local astrometry %.1f arcsec from the mount, reading it "
+                    "instead." % (error * 3600)
+                )
+            self._skyTrusted = trusted
+
+            self.log.debug(
+                "[astrometry] LST offset %+.2f s, alt/az offset %+.1f/%+.1f arcsec"
+                % (
+                    sky.lst_offset * 3600,
+                    sky.alt_offset * 3600,
+                    sky.az_offset * 3600,
+                )
+            )
+
+    def _forget_sky(self, site=False):
+        """The mount clock (or the site, with ``site``) changed"""
+        self._sky = None
+        self._skyTrusted = False
+        if site:
+            self._site = None
+
+    def _invalidate_position_cache(self):
+        self._positionEpoch += 1
+        self._position_cache.clear()
+
+        for model in self._models.values():
+            model.disturb()
+
+        if self._telemetry is not None:
+            self._telemetry.wake()
+
+    # -- metrics
+
+    def get_metrics(self):
+        """
+        Latency histograms (command_latency_seconds by LX200 command,
+        method_latency_seconds and lock_wait_seconds by method) and counters
+        (errors_total: timeouts and junk skipped before replies, like the
+        stray '1' before RA, coalesced_total: exchanges saved by sharing
+        identical queries, reckoned_total: positions answered by dead
+        reckoning, computed_total: LST and alt/az computed by local
+        astrometry), see Metrics.snapshot
+        """
+        return self._metrics.snapshot()
+
+    # -- telemetry
+
+    def get_telemetry(self):
+        """Last TelemetrySnapshot, None if telemetry is disabled"""
+        if self._telemetry is None:
+            return None
+        return self._telemetry.latest
+
+    def get_telemetry_history(self):
+        if self._telemetry is None:
+            return []
+        return self._telemetry.history()
+
+    def _sample_telemetry(self):
+        # only the serial lock, so slews and moves don't stall us, and after
+        # everybody else waiting for it
+        with self._serial_lock.hold(BACKGROUND):
+            epoch = self._positionEpoch
+            when = time.monotonic()
+            timestamp = time.time()
+
+            ra, dec, alt, az, rate = self._transact(
+                ":GR#", ":GD#", ":GA#", ":GZ#", ":GT#", decode=False
+            )
+
+            ra_dec = Position.fromRaDec(parse_ra(ra), parse_dec(dec))
+            self._note_precision(ra)
+            alt_az = Position.fromAltAz(
+                parse_dms(alt), parse_az(az, self["azimuth180Correct"])
+            )
+
+            self._remember_position("ra_dec", when, ra_dec, epoch)
+            self._remember_position("alt_az", when, alt_az, epoch)
+            self._set_mode("tracking_rate", float(rate[:-1]))
+
+        return TelemetrySnapshot(
+            timestamp, when, ra_dec, alt_az, self.is_slewing(), float(rate[:-1])
+        )
 
     @lock
     def get_target_ra_dec(self):
-        return Position.fromRaDec(self.get_target_ra(), self.get_target_dec())
+        ra, dec = self._transact(":Gr#", ":Gd#", decode=False)
+        return Position.fromRaDec(parse_hms(ra), parse_dms(dec))
 
     @lock
     def get_target_alt_az(self):
@@ -561,8 +1696,19 @@ class Meade(TelescopeBase):
 
     @lock
     def set_target_ra_dec(self, ra, dec):
-        self.set_target_ra(ra)
-        self.set_target_dec(dec)
+        if not isinstance(ra, Coord):
+            ra = Coord.fromHMS(ra)
+
+        if not isinstance(dec, Coord):
+            dec = Coord.fromDMS(dec)
+
+        ra_ok, dec_ok = self._transact(target_ra_command(ra), target_dec_command(dec))
+
+        if not parse_bool(ra_ok):
+            raise MeadeException("Invalid RA '%s'" % ra)
+
+        if not parse_bool(dec_ok):
+            raise MeadeException("Invalid DEC '%s'" % dec)
 
         return True
 
@@ -575,21 +1721,18 @@ class Meade(TelescopeBase):
 
     @lock
     def get_target_ra(self):
-        self._write(":Gr#")
-        ret = self._readline()
+        ret = self._query(":Gr#", decode=False)
 
-        return Coord.fromHMS(ret[:-1])
+        return parse_hms(ret)
 
     @lock
     def set_target_ra(self, ra):
         if not isinstance(ra, Coord):
             ra = Coord.fromHMS(ra)
 
-        self._write(":Sr%s#" % ra.strfcoord("%(h)02d\xdf%(m)02d:%(s)02d"))
-
-        ret = self._readbool()
+        ret = self._query(target_ra_command(ra))
 
-        if not ret:
+        if not parse_bool(ret):
             raise MeadeException("Invalid RA '%s'" % ra)
 
         return True
@@ -599,47 +1742,24 @@ class Meade(TelescopeBase):
         if not isinstance(dec, Coord):
             dec = Coord.fromDMS(dec)
 
-        self._write(":Sd%s#" % dec.strfcoord("%(d)02d\xdf%(m)02d:%(s)02d"))
-
-        ret = self._readbool()
+        ret = self._query(target_dec_command(dec))
 
-        if not ret:
+        if not parse_bool(ret):
             raise MeadeException("Invalid DEC '%s'" % dec)
 
         return True
 
     @lock
     def get_target_dec(self):
-        self._write(":Gd#")
-        ret = self._readline()
-
-        ret = ret.replace("\xdf", ":")
+        ret = self._query(":Gd#", decode=False)
 
-        return Coord.fromDMS(ret[:-1])
+        return parse_dms(ret)
 
-    @lock
     def get_az(self):
-        self._write(":GZ#")
-        ret = self._readline()
-        ret = ret.replace("\xdf", ":")
+        return self.get_position_alt_az().az
 
-        c = Coord.fromDMS(ret[:-1])
-
-        if self["azimuth180Correct"]:
-            if c.toD() >= 180:
-                c = c - Coord.fromD(180)
-            else:
-                c = c + Coord.fromD(180)
-
-        return c
-
-    @lock
     def get_alt(self):
-        self._write(":GA#")
-        ret = self._readline()
-        ret = ret.replace("\xdf", ":")
-
-        return Coord.fromDMS(ret[:-1])
+        return self.get_position_alt_az().alt
 
     def get_target_alt(self):
         return self._target_alt
@@ -649,9 +1769,9 @@ class Meade(TelescopeBase):
         if not isinstance(alt, Coord):
             alt = Coord.fromD(alt)
 
-        self._write(":Sa%s#" % alt.strfcoord("%(d)02d\xdf%(m)02d'%(s)02d"))
-
-        ret = self._readbool()
+        ret = parse_bool(
+            self._query(":Sa%s#" % alt.strfcoord("%(d)02d\xdf%(m)02d'%(s)02d"))
+        )
 
         if not ret:
             raise MeadeException("Invalid Altitude '%s'" % alt)
@@ -674,9 +1794,11 @@ class Meade(TelescopeBase):
             else:
                 az = az + Coord.fromD(180)
 
-        self._write(":Sz%s#" % az.strfcoord("%(d)03d\xdf%(m)02d:%(s)02d", signed=False))
-
-        ret = self._readbool()
+        ret = parse_bool(
+            self._query(
+                ":Sz%s#" % az.strfcoord("%(d)03d\xdf%(m)02d:%(s)02d", signed=False)
+            )
+        )
 
         if not ret:
             raise MeadeException(
@@ -689,11 +1811,9 @@ class Meade(TelescopeBase):
 
     @lock
     def get_lat(self):
-        self._write(":Gt#")
-        ret = self._readline()
-        ret = ret.replace("\xdf", ":")[:-1]
+        ret = self._query(":Gt#", decode=False)
 
-        return Coord.fromDMS(ret)
+        return parse_dms(ret)
 
     @lock
     def set_lat(self, lat):
@@ -702,130 +1822,130 @@ class Meade(TelescopeBase):
 
         lat_str = lat.strfcoord("%(d)02d\xdf%(m)02d")
 
-        self._write(":St%s#" % lat_str)
-
-        ret = self._readbool()
+        ret = parse_bool(self._query(":St%s#" % lat_str))
 
         if not ret:
             raise MeadeException("Invalid Latitude '%s' ('%s')" % (lat, lat_str))
 
+        self._forget_sky(site=True)
         return True
 
     @lock
     def get_long(self):
-        self._write(":Gg#")
-        ret = self._readline()
-        ret = ret.replace("\xdf", ":")[:-1]
+        ret = self._query(":Gg#", decode=False)
 
-        return Coord.fromDMS(ret)
+        return parse_dms(ret)
 
     @lock
     def set_long(self, coord):
         if not isinstance(coord, Coord):
             coord = Coord.fromDMS(coord)
 
-        self._write(":Sg%s#" % coord.strfcoord("%(d)03d\xdf%(m)02d"))
-
-        ret = self._readbool()
+        ret = parse_bool(self._query(":Sg%s#" % coord.strfcoord("%(d)03d\xdf%(m)02d")))
 
         if not ret:
             raise MeadeException("Invalid Longitude '%s'" % int)
 
+        self._forget_sky(site=True)
         return True
 
     @lock
     def get_date(self):
-        self._write(":GC#")
-        ret = self._readline()
-        return dt.datetime.strptime(ret[:-1], "%m/%d/%y").date()
+        ret = self._query(":GC#", decode=False)
+        return parse_date(ret)
 
     @lock
     def set_date(self, date):
         if type(date) == float:
             date = dt.date.fromtimestamp(date)
 
-        self._write(":SC%s#" % date.strftime("%m/%d/%y"))
+        self._forget_sky()
 
-        ret = self._read(1)
+        with self._serial_lock:
+            ret = self._query(":SC%s#" % date.strftime("%m/%d/%y"))
 
-        if ret == "0":
-            # discard junk null byte
-            self._read(1)
-            raise MeadeException("Couldn't set date, invalid format '%s'" % date)
+            if ret == "0":
+                # discard junk null byte
+                self._read(1)
+                raise MeadeException("Couldn't set date, invalid format '%s'" % date)
 
-        elif ret == "1":
-            # discard junk message and wait Meade finish update of internal
-            # databases
-            tmp_timeout = self._tty.timeout
-            self._tty.timeout = 60
-            self._readline()  # junk message
+            elif ret == "1":
+                # discard junk message and wait Meade finish update of internal
+                # databases
+                tmp_timeout = self._tty.timeout
+                self._tty.timeout = 60
+                self._readline()  # junk message
 
-            self._readline()
+                self._readline()
 
-            self._tty.timeout = tmp_timeout
-            return True
+                self._tty.timeout = tmp_timeout
+                return True
 
     @lock
     def get_local_time(self):
-        self._write(":GL#")
-        ret = self._readline()
-        return dt.datetime.strptime(ret[:-1], "%H:%M:%S").time()
+        ret = self._query(":GL#", decode=False)
+        return parse_time(ret)
 
     @lock
     def set_local_time(self, local):
         if type(local) == float:
             local = dt.datetime.fromtimestamp(local).time()
 
-        self._write(":SL%s#" % local.strftime("%H:%M:%S"))
-
-        ret = self._readbool()
+        ret = parse_bool(self._query(":SL%s#" % local.strftime("%H:%M:%S")))
 
         if not ret:
             raise MeadeException("Invalid local time '%s'." % local)
 
+        self._forget_sky()
         return True
 
-    @lock
     def get_local_sidereal_time(self):
-        self._write(":GS#")
-        ret = self._readline()
-        return dt.datetime.strptime(ret[:-1], "%H:%M:%S").time()
+        sky = self._local_sky()
+        if sky is None:
+            return self._read_local_sidereal_time()
+
+        self._metrics.count("computed_total", quantity="lst")
+
+        seconds = round(sky.lst() * 3600) % 86400
+        return dt.time(seconds // 3600, seconds // 60 % 60, seconds % 60)
 
     @lock
-    def set_local_sidereal_time(self, local):
-        self._write(":SS%s#" % local.strftime("%H:%M:%S"))
+    def _read_local_sidereal_time(self):
+        ret = self._query(":GS#", decode=False)
+        return parse_time(ret)
 
-        ret = self._readbool()
+    @lock
+    def set_local_sidereal_time(self, local):
+        ret = parse_bool(self._query(":SS%s#" % local.strftime("%H:%M:%S")))
 
         if not ret:
             raise MeadeException("Invalid Local sidereal time '%s'." % local)
 
+        self._forget_sky()
         return True
 
     @lock
     def get_utc_offset(self):
-        self._write(":GG#")
-        ret = self._readline()
+        ret = self._query(":GG#")
         return ret[:-1]
 
     @lock
     def set_utc_offset(self, offset):
         offset = "%+02.1f" % offset
 
-        self._write(":SG%s#" % offset)
-
-        ret = self._readbool()
+        ret = parse_bool(self._query(":SG%s#" % offset))
 
         if not ret:
             raise MeadeException("Invalid UTC offset '%s'." % offset)
 
+        self._forget_sky()
         return True
 
-    @lock
     def get_current_tracking_rate(self):
-        self._write(":GT#")
+        return self._mode("tracking_rate", self._read_tracking_rate)
 
-        ret = self._readline()
+    def _read_tracking_rate(self):
+        ret = self._query(":GT#")
 
         if not ret:
             raise MeadeException("Couldn't get the tracking rate")
@@ -841,14 +1961,17 @@ class Meade(TelescopeBase):
         if len(trk) == 3:
             trk = "0" + trk
 
-        self._write(":ST%s#" % trk)
+        if float(trk) == self._known_mode("tracking_rate"):
+            return True
 
-        ret = self._readbool()
+        ret = parse_bool(self._query(":ST%s#" % trk))
 
         if not ret:
             raise MeadeException("Invalid tracking rate '%s'." % trk)
 
-        self._write(":TM#")
+        self._transact(":TM#")
+
+        self._set_mode("tracking_rate", float(trk))
 
         return ret
 
@@ -876,23 +1999,25 @@ class Meade(TelescopeBase):
         return False
 
     def _set_high_precision(self):
-        self._write(":GR#")
-        ret = self._readline()[:-1]
+        if self._mode("high_precision", self._read_high_precision):
+            return True
 
-        if len(ret) == 7:  # low precision
-            self._write(":U#")
+        self._transact(":U#")
+        self._set_mode("high_precision", True)
 
         return True
 
+    def _read_high_precision(self):
+        # low precision RA is HH:MM.T
+        return len(self._query(":GR#")[:-1]) != 7
+
     # -- ITelescopeSync implementation --
 
     @lock
     def sync_ra_dec(self, position):
         self.set_target_ra_dec(position.ra, position.dec)
 
-        self._write(":CM#")
-
-        ret = self._readline()
+        ret = self._query(":CM#")
 
         if not ret:
             raise MeadeException(
@@ -905,21 +2030,25 @@ class Meade(TelescopeBase):
 
     @lock
     def set_slew_rate(self, rate):
+        # sent again once the mode is stale, in case the mount was reset
+        if rate is not None and rate == self._known_mode("slew_rate"):
+            return True
+
         if rate == SlewRate.GUIDE:
-            self._write(":RG#")
+            self._transact(":RG#")
         elif rate == SlewRate.CENTER:
-            self._write(":RC#")
+            self._transact(":RC#")
         elif rate == SlewRate.FIND:
-            self._write(":RM#")
+            self._transact(":RM#")
         elif rate == SlewRate.MAX:
-            self._write(":Sw4#")
-            if not self._readbool():
+            if not parse_bool(self._query(":Sw4#")):
                 raise ValueError("Invalid slew rate")
 
-            self._write(":RS#")
+            self._transact(":RS#")
         else:
             raise ValueError("Invalid slew rate '%s'." % rate)
 
+        self._set_mode("slew_rate", rate)
         self._slewRate = rate
 
         return True
@@ -998,51 +2127,203 @@ class Meade(TelescopeBase):
         return True
 
     # low-level
-    def _debug(self, msg):
-        if self._debugLog:
-            print(
-                f"{time.time()} {threading.currentThread().getName()} {msg}",
-                file=self._debugLog,
-            )
-            self._debugLog.flush()
-
-    def _read(self, n=1, flush=True):
+    def _read(self, n=1, accept=None, decode=True):
         if not self._tty.isOpen():
             raise OSError("Device not open")
 
-        if flush:
-            self._tty.flushInput()
-
-        ret = self._tty.read(n)
-        self._debug("[read ] %s" % repr(ret))
-        return ret
+        ret = b"".join(self._reader.read_char(accept) for i in range(n))
+        return ret.decode("latin-1") if decode else ret
 
-    def _readline(self, eol="#"):
+    def _readline(self, eol="#", accept=None, decode=True):
         if not self._tty.isOpen():
             raise OSError("Device not open")
 
-        ret = self._tty.readline(None, eol)
-        self._debug("[read ] %s" % repr(ret))
-        return ret
+        ret = self._reader.read_line(accept, eol.encode("latin-1"))
+        return ret.decode("latin-1") if decode else ret
 
-    def _readbool(self):
-        try:
-            ret = int(self._read(1))
-        except ValueError:
-            return False
+    def _transact(self, *commands, decode=True):
+        """
+        Write all commands at once and read back their replies, in order.
+        Commands without a reply get None. Replies are str, or the bytes
+        read if not decode (see the lx200 parsers).
+        """
+        if not self._tty.isOpen() and not self._linkLost:
+            raise OSError("Device not open")
 
-        if not ret:
+        # the line holder would wait for itself on a shared exchange
+        if (
+            self["coalesce_queries"]
+            and all(is_query(command) for command in commands)
+            and not self._serial_lock.owned()
+        ):
+            replies, shared = self._inflight.do(
+                (commands, decode), lambda: self._transact_now(commands, decode)
+            )
+            if shared:
+                self._metrics.count(
+                    "coalesced_total",
+                    commands=",".join(command_name(c) for c in commands),
+                )
+            return list(replies)
+
+        return self._transact_now(commands, decode)
+
+    def _transact_now(self, commands, decode):
+        metrics = self._metrics
+        requested = time.perf_counter()
+
+        with self._serial_lock:
+            last = time.perf_counter()
+            metrics.observe("lock_wait_seconds", last - requested, lock="serial")
+
+            try:
+                return self._exchange(commands, decode, last)
+            except OSError as e:
+                # pyserial's SerialException is an OSError too. Only queries
+                # are sent again, anything else may have reached the mount
+                # already (a guide pulse would be done twice)
+                if not self._reconnect(e) or not all(map(is_query, commands)):
+                    raise
+
+            return self._exchange(commands, decode, time.perf_counter())
+
+    def _exchange(self, commands, decode, last):
+        metrics = self._metrics
+
+        # whatever is there now is junk or late replies to older commands
+        self._reader.discard_pending()
+        self._write("".join(commands))
+
+        replies = []
+        for command in commands:
+            kind = reply_kind(command)
+
+            if kind == Reply.LINE:
+                reply = self._readline(accept=reply_format(command), decode=decode)
+            elif kind == Reply.CHAR:
+                reply = self._read(1, accept=reply_format(command), decode=decode)
+            else:
+                reply = None
+
+            # pipelined: the time since the previous reply
+            now = time.perf_counter()
+            name = command_name(command)
+            metrics.observe("command_latency_seconds", now - last, command=name)
+            last = now
+
+            if kind == Reply.LINE and reply[-1:] not in ("#", b"#"):
+                metrics.count("errors_total", kind="timeout", command=name)
+            elif kind == Reply.CHAR and not reply:
+                metrics.count("errors_total", kind="timeout", command=name)
+
+            if kind != Reply.NONE and self._reader.skipped:
+                metrics.count("errors_total", kind="junk", command=name)
+
+            replies.append(reply)
+
+        return replies
+
+    def _reconnect(self, error):
+        """
+        Open a network link that dropped again, True when it is back. The
+        telescope is not initialized again, only the modes are read again.
+        """
+        if not (self["reconnect"] and is_network(self["device"])):
             return False
 
-        return True
+        self._linkLost = True
+        self.log.warning("Lost connection to %s (%s)." % (self["device"], error))
+
+        for attempt in range(1, self["reconnect_attempts"] + 1):
+            self._metrics.count("reconnects_total")
+
+            try:
+                self._tty.close()
+            except OSError:
+                pass
+
+            try:
+                self._tty = create_port(
+                    self["device"], self._tty.timeout, self._tty.baudrate
+                )
+                self._reader = FrameReader(
+                    self._tty,
+                    self._wireLog.received if self._wireLog is not None else None,
+                )
+                self._tty.open()
+                tune_link(self._tty, self["keepalive_idle"])
+            except OSError as e:
+                self.log.warning(
+                    "Reconnect to %s failed (%d of %d): %s"
+                    % (self["device"], attempt, self["reconnect_attempts"], e)
+                )
+                time.sleep(min(attempt, 5))
+                continue
+
+            self._linkLost = False
+            self._modes.clear()
+            self.log.info("Reconnected to %s." % self["device"])
+            return True
+
+        return False
+
+    def _query(self, command, decode=True):
+        return self._transact(command, decode=decode)[0]
 
     def _write(self, data, flush=True):
         if not self._tty.isOpen():
             raise OSError("Device not open")
 
-        if flush:
-            self._tty.flushOutput()
+        if MOTION_COMMANDS.search(data):
+            self._invalidate_position_cache()
+
+        data = data.encode("latin-1")
+
+        with self._serial_lock.write_lock:
+            if flush:
+                self._tty.flushOutput()
+
+            if self._wireLog is not None:
+                self._wireLog.sent(data)
 
-        self._debug("[write] %s" % repr(data))
+            return self._tty.write(data)
 
-        return self._tty.write(data)
+    def _send_now(self, data):
+        with self._serial_lock.write_lock:
+            if self._wireLog is not None:
+                self._wireLog.sent(data)
+
+            self._tty.write(data)
+            # out of the OS buffer before an exchange flushes it
+            self._tty.flush()
+
+    def _write_now(self, command):
+        """
+        Write a command without a reply (stops) ahead of everything waiting
+        for the line, even in the middle of another exchange.
+        """
+        requested = time.perf_counter()
+
+        if not self._tty.isOpen() and not self._linkLost:
+            raise OSError("Device not open")
+
+        self._invalidate_position_cache()
+
+        data = command.encode("latin-1")
+
+        tty = self._tty
+        try:
+            self._send_now(data)
+        except OSError as e:
+            # stops can be sent twice, wait for the line and try on a new link
+            # (unless whoever held it already got one)
+            with self._serial_lock.hold(URGENT):
+                if self._tty is tty and not self._reconnect(e):
+                    raise
+                self._send_now(data)
+
+        self._metrics.observe(
+            "urgent_write_seconds",
+            time.perf_counter() - requested,
+            command=command_name(command),
+        )
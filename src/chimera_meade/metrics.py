@@ -0,0 +1,215 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Counters and latency histograms of the driver, see Meade.get_metrics.
+
+Metrics are grouped in families (``command_latency_seconds``,
+``errors_total``, ...) and told apart by labels, like Prometheus does.
+:class:`MetricsExporter` serves them in the Prometheus text format.
+"""
+
+import bisect
+import threading
+
+__all__ = ["Histogram", "Metrics", "MetricsExporter"]
+
+# seconds, from a single serial exchange to a full slew
+BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+
+class Histogram:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+        # last one is +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value):
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def as_dict(self):
+        cumulative = []
+        total = 0
+        for le, count in zip(self.buckets + (float("inf"),), self.counts):
+            total += count
+            cumulative.append((le, total))
+
+        return {
+            "count": self.count,
+            "sum": self.sum,
+            "mean": self.sum / self.count if self.count else 0.0,
+            "max": self.max,
+            "buckets": cumulative,
+        }
+
+
+class Metrics:
+    def __init__(self, buckets=BUCKETS):
+        self.buckets = buckets
+
+        self._lock = threading.Lock()
+        # family -> labels (tuple of (name, value)) -> Histogram or int
+        self._histograms = {}
+        self._counters = {}
+
+    def observe(self, family, value, **labels):
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            histograms = self._histograms.setdefault(family, {})
+            histogram = histograms.get(key)
+            if histogram is None:
+                histogram = histograms[key] = Histogram(self.buckets)
+            histogram.observe(value)
+
+    def count(self, family, n=1, **labels):
+        key = tuple(sorted(labels.items()))
+
+        with self._lock:
+            counters = self._counters.setdefault(family, {})
+            counters[key] = counters.get(key, 0) + n
+
+    def snapshot(self):
+        """
+        {family: {labels: value}}, labels as a "name=value,..." string and
+        values as ints (counters) or dicts (histograms, see Histogram.as_dict)
+        """
+        with self._lock:
+            snapshot = {}
+
+            for family, histograms in self._histograms.items():
+                snapshot[family] = {
+                    _label_string(key): histogram.as_dict()
+                    for key, histogram in histograms.items()
+                }
+
+            for family, counters in self._counters.items():
+                snapshot[family] = {
+                    _label_string(key): value for key, value in counters.items()
+                }
+
+        return snapshot
+
+    def prometheus(self, prefix="meade"):
+        """All metrics in the Prometheus text exposition format"""
+        lines = []
+
+        with self._lock:
+            for family, histograms in sorted(self._histograms.items()):
+                name = "%s_%s" % (prefix, family)
+                lines.append("# TYPE %s histogram" % name)
+
+                for key, histogram in sorted(histograms.items()):
+                    total = 0
+                    for le, count in zip(histogram.buckets, histogram.counts):
+                        total += count
+                        lines.append(
+                            "%s_bucket%s %d"
+                            % (name, _labels(key + (("le", repr(le)),)), total)
+                        )
+                    lines.append(
+                        "%s_bucket%s %d"
+                        % (name, _labels(key + (("le", "+Inf"),)), histogram.count)
+                    )
+                    lines.append("%s_sum%s %r" % (name, _labels(key), histogram.sum))
+                    lines.append(
+                        "%s_count%s %d" % (name, _labels(key), histogram.count)
+                    )
+
+            for family, counters in sorted(self._counters.items()):
+                name = "%s_%s" % (prefix, family)
+                lines.append("# TYPE %s counter" % name)
+
+                for key, value in sorted(counters.items()):
+                    lines.append("%s%s %d" % (name, _labels(key), value))
+
+        return "\n".join(lines) + "\n"
+
+
+def _label_string(key):
+    return ",".join("%s=%s" % item for item in key)
+
+
+def _labels(key):
+    if not key:
+        return ""
+
+    return "{%s}" % ",".join(
+        '%s="%s"' % (name, str(value).replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in key
+    )
+
+
+class MetricsExporter:
+    """Serves ``metrics.prometheus()`` over HTTP on ``host:port``"""
+
+    def __init__(self, metrics, port, host="127.0.0.1"):
+        self.metrics = metrics
+        self.host = host
+        self.port = port
+
+        self._server = None
+        self._thread = None
+
+    def start(self):
+        # http.server is a heavy import, only pay for it when serving
+        import http.server
+
+        metrics = self.metrics
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_GET(self):  # noqa: N802
+                body = metrics.prometheus().encode("utf-8")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = http.server.ThreadingHTTPServer((self.host, self.port), Handler)
+        # port 0 binds to any free port
+        self.port = self._server.server_address[1]
+
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="meade-metrics", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._server is None:
+            return
+
+        self._server.shutdown()
+        self._server.server_close()
+        self._thread.join()
+
+        self._server = None
+        self._thread = None
@@ -0,0 +1,8 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+# pyserial URL handler for lx200sim:// devices, see chimera_meade.simulator
+
+from chimera_meade.simulator import SimulatedSerial as Serial
+
+__all__ = ["Serial"]
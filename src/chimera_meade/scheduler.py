@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Who goes next on the serial line.
+
+An exchange (the commands written at once and their replies, see
+Meade._transact) holds the line until its last reply arrives. When the line
+frees, the waiter with the highest priority goes next, in arrival order
+within a priority: telemetry reads wait for everything else.
+
+Stops don't wait at all. They have no reply, so they are written right away
+under :attr:`CommandScheduler.write_lock`, which only keeps writes from
+interleaving, even while another exchange waits for its replies.
+"""
+
+import contextlib
+import heapq
+import itertools
+import threading
+
+__all__ = ["URGENT", "COMMAND", "BACKGROUND", "CommandScheduler"]
+
+URGENT = 0
+COMMAND = 1
+BACKGROUND = 2
+
+
+class CommandScheduler:
+    """
+    Reentrant lock of the serial line, granted by priority (lowest first)
+    then arrival. ``with scheduler:`` waits as COMMAND.
+    """
+
+    def __init__(self):
+        self.write_lock = threading.Lock()
+
+        self._cond = threading.Condition(threading.Lock())
+        self._owner = None
+        self._depth = 0
+        # (priority, arrival, thread id), the head goes next
+        self._waiting = []
+        self._arrival = itertools.count()
+
+    def acquire(self, priority=COMMAND):
+        me = threading.get_ident()
+
+        with self._cond:
+            if self._owner == me:
+                self._depth += 1
+                return
+
+            entry = (priority, next(self._arrival), me)
+            heapq.heappush(self._waiting, entry)
+
+            while self._owner is not None or self._waiting[0] is not entry:
+                self._cond.wait()
+
+            heapq.heappop(self._waiting)
+            self._owner = me
+            self._depth = 1
+
+    def release(self):
+        with self._cond:
+            if self._owner != threading.get_ident():
+                raise RuntimeError("cannot release un-acquired lock")
+
+            self._depth -= 1
+            if self._depth == 0:
+                self._owner = None
+                self._cond.notify_all()
+
+    @contextlib.contextmanager
+    def hold(self, priority=COMMAND):
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release()
+
+    def __enter__(self):
+        self.acquire()
+
+    def __exit__(self, *exc):
+        self.release()
+
+    def owned(self):
+        """True if the calling thread holds the line"""
+        with self._cond:
+            return self._owner == threading.get_ident()
+
+    @property
+    def waiting(self):
+        """Exchanges waiting for the line"""
+        with self._cond:
+            return len(self._waiting)
@@ -0,0 +1,916 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+In-process simulation of a MEADE LX200 mount.
+
+``LX200Simulator`` models the mount (coordinates, slews, guide moves, site
+and clock) and speaks the subset of the LX200 protocol used by
+:class:`chimera_meade.meade.Meade`. ``SimulatedSerial`` wraps it in a
+pyserial compatible port, so the driver can be pointed to it with a
+``serial_for_url`` device like::
+
+    lx200sim://name?latency=0.002&slew_speed=4
+
+Every port opened with the same ``name`` talks to the same mount. The line
+speed is modelled from the port baudrate (10 bits per byte on each
+direction) plus a fixed per command processing ``latency``.
+
+``SimulatorServer`` stands in for a terminal server: every TCP connection
+gets its own simulated port, so the driver can use ``socket://host:port``::
+
+    python -m chimera_meade.simulator --listen 127.0.0.1:4030 lx200sim://lx200
+"""
+
+import datetime as dt
+import math
+import socket
+import socketserver
+import sys
+import threading
+import time
+import urllib.parse
+from collections import deque
+
+from serial.serialutil import PortNotOpenError, SerialBase, SerialException
+
+from chimera_meade.astrometry import (
+    altaz_to_radec,
+    local_sidereal_time,
+    radec_to_altaz,
+)
+
+__all__ = ["LX200Simulator", "SimulatedSerial", "SimulatorServer", "main"]
+
+ACK = 0x06
+
+SIDEREAL_RATE = 1.00273790935
+
+# arcseconds per second for each LX200 rate command (:RG#, :RC#, :RM#, :RS#)
+MOVE_RATES = {"G": 30.0, "C": 480.0, "M": 1800.0, "S": 14400.0}
+
+# :SB<n># argument -> line speed (56.7K on Meade's manual)
+BAUD_RATES = {
+    "1": 57600,
+    "2": 38400,
+    "3": 28800,
+    "4": 19200,
+    "5": 14400,
+    "6": 9600,
+    "7": 4800,
+    "8": 2400,
+    "9": 1200,
+}
+
+
+def _sexagesimal(value, fields=3, width=2, signed=False, sep="\xdf", tenths=False):
+    sign = "-" if value < 0 else "+"
+    value = abs(value)
+
+    if tenths:
+        # low precision: DD*MM.T
+        total = round(value * 600)
+        d, t = divmod(total, 600)
+        ret = "%0*d%s%02d.%d" % (width, d, sep, t // 10, t % 10)
+    elif fields == 2:
+        total = round(value * 60)
+        d, m = divmod(total, 60)
+        ret = "%0*d%s%02d" % (width, d, sep, m)
+    else:
+        total = round(value * 3600)
+        d, rem = divmod(total, 3600)
+        m, s = divmod(rem, 60)
+        ret = "%0*d%s%02d:%02d" % (width, d, sep, m, s)
+
+    return (sign + ret) if signed else ret
+
+
+def _parse_sexagesimal(text):
+    text = text.strip()
+    sign = -1 if text.startswith("-") else 1
+    text = text.lstrip("+-")
+
+    for sep in ("\xdf", "'", "*"):
+        text = text.replace(sep, ":")
+
+    value = 0.0
+    for i, field in enumerate(text.split(":")):
+        value += float(field) / (60**i)
+
+    return sign * value
+
+
+class LX200Simulator:
+    """
+    A simulated LX200 mount. Commands are fed with :meth:`feed` as raw bytes
+    and answered with a list of ``(delay, reply)`` chunks, where ``delay`` is
+    the extra time the mount takes before sending ``reply``.
+    """
+
+    # LX200 command prefix -> handler, longest prefix wins
+    _commands = {
+        "GR": "_get_ra",
+        "GD": "_get_dec",
+        "Gr": "_get_target_ra",
+        "Gd": "_get_target_dec",
+        "GA": "_get_alt",
+        "GZ": "_get_az",
+        "Gt": "_get_lat",
+        "Gg": "_get_long",
+        "GC": "_get_date",
+        "GL": "_get_local_time",
+        "GS": "_get_sidereal_time",
+        "GG": "_get_utc_offset",
+        "GT": "_get_tracking_rate",
+        "D": "_distance_bars",
+        "Sr": "_set_target_ra",
+        "Sd": "_set_target_dec",
+        "Sa": "_set_target_alt",
+        "Sz": "_set_target_az",
+        "St": "_set_lat",
+        "Sg": "_set_long",
+        "SL": "_set_local_time",
+        "SG": "_set_utc_offset",
+        "SS": "_set_sidereal_time",
+        "ST": "_set_tracking_rate",
+        "Sw": "_set_max_slew_rate",
+        "SB": "_set_baud_rate",
+        "SC": "_set_date",
+        "AA": "_align_alt_az",
+        "AP": "_align_polar",
+        "AL": "_align_land",
+        "U": "_toggle_precision",
+        "R": "_set_rate",
+        "TM": "_manual_tracking",
+        "MS": "_slew_ra_dec",
+        "MA": "_slew_alt_az",
+        "M": "_move",
+        "Mg": "_pulse_guide",
+        "Q": "_stop",
+        "CM": "_sync",
+    }
+
+    _registry: dict[str, "LX200Simulator"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(
+        self,
+        latitude=-22.5,
+        longitude=-45.5,
+        slew_speed=4.0,
+        latency=0.002,
+        high_precision=True,
+        azimuth_from_south=True,
+        date_update_delay=0.0,
+        quirks=False,
+        max_baudrate=57600,
+    ):
+        self.latitude = latitude
+        self.longitude = longitude
+        self.slew_speed = slew_speed
+        self.latency = latency
+        self.high_precision = high_precision
+        self.azimuth_from_south = azimuth_from_south
+        self.date_update_delay = date_update_delay
+        self.quirks = quirks
+        # the mount starts at 9600 and refuses :SB above max_baudrate
+        self.max_baudrate = max_baudrate
+        self.baudrate = 9600
+
+        self.align_mode = "P"
+        self.rate = "S"
+        self.tracking_rate = 60.1
+
+        now = dt.datetime.now()
+        self._local_base = now
+        self._local_base_mono = time.monotonic()
+        self.utc_offset = -round(now.astimezone().utcoffset().total_seconds() / 3600.0)
+
+        # start pointing at the meridian, 30 degrees from the zenith
+        self.ra = self.lst()
+        self.dec = latitude + (30.0 if latitude < 0 else -30.0)
+
+        self.target_ra = self.ra
+        self.target_dec = self.dec
+        self.target_alt = 0.0
+        self.target_az = 0.0
+
+        self.slewing = False
+        self.moving = set()
+        # direction -> time.monotonic() when the pulse ends
+        self.pulses = {}
+
+        self.commands = 0
+
+        self._stray_one = False
+        self._last_update = time.monotonic()
+        self._lock = threading.RLock()
+        self._input = bytearray()
+
+    @classmethod
+    def get(cls, name, **kwargs):
+        """Return the shared simulator called ``name``, creating it if needed"""
+        with cls._registry_lock:
+            if name not in cls._registry:
+                cls._registry[name] = cls(**kwargs)
+            return cls._registry[name]
+
+    @classmethod
+    def forget(cls, name):
+        with cls._registry_lock:
+            cls._registry.pop(name, None)
+
+    # -- clock and astrometry
+
+    def local_time(self):
+        elapsed = time.monotonic() - self._local_base_mono
+        return self._local_base + dt.timedelta(seconds=elapsed)
+
+    def utc(self):
+        # LX200 UTC offset is the number of hours to add to local time
+        utc = self.local_time() + dt.timedelta(hours=self.utc_offset)
+        return utc.replace(tzinfo=dt.UTC)
+
+    def lst(self):
+        return local_sidereal_time(self.utc(), self.longitude)
+
+    def alt_az(self):
+        return radec_to_altaz(self.ra, self.dec, self.latitude, self.lst())
+
+    # -- kinematics
+
+    def _update(self):
+        now = time.monotonic()
+        elapsed = now - self._last_update
+        self._last_update = now
+
+        if elapsed <= 0:
+            return
+
+        if self.slewing:
+            step = self.slew_speed * elapsed
+
+            dra = ((self.target_ra - self.ra + 12.0) % 24.0 - 12.0) * 15.0
+            ddec = self.target_dec - self.dec
+
+            if abs(dra) <= step:
+                self.ra = self.target_ra
+                dra = 0
+            else:
+                self.ra = (self.ra + math.copysign(step, dra) / 15.0) % 24.0
+
+            if abs(ddec) <= step:
+                self.dec = self.target_dec
+                ddec = 0
+            else:
+                self.dec += math.copysign(step, ddec)
+
+            if not dra and not ddec:
+                self.slewing = False
+
+        moves = [(d, MOVE_RATES[self.rate] * elapsed) for d in self.moving]
+
+        for direction, end in list(self.pulses.items()):
+            # pulses always run at the guide rate and may end mid interval
+            pulse = min(now, end) - (now - elapsed)
+            if pulse > 0:
+                moves.append((direction, MOVE_RATES["G"] * pulse))
+            if end <= now:
+                del self.pulses[direction]
+
+        for direction, arc in moves:
+            arc /= 3600.0
+
+            if direction == "n":
+                self.dec = min(90.0, self.dec + arc)
+            elif direction == "s":
+                self.dec = max(-90.0, self.dec - arc)
+            elif direction == "e":
+                self.ra = (self.ra + arc / 15.0) % 24.0
+            elif direction == "w":
+                self.ra = (self.ra - arc / 15.0) % 24.0
+
+        if self.align_mode == "L" and not self.slewing:
+            # not tracking, sky goes by
+            self.ra = (self.ra + elapsed * SIDEREAL_RATE / 3600.0) % 24.0
+
+    # -- protocol
+
+    def feed(self, data):
+        """
+        Feed raw bytes from the host, return a list of ``(index, chunks)``
+        for every complete command found, where ``index`` is the position on
+        ``data`` of the last byte of the command.
+        """
+        replies = []
+
+        with self._lock:
+            # offset of self._input[0] relative to data
+            base = -len(self._input)
+            self._input += data
+
+            while self._input:
+                if self._input[0] == ACK:
+                    end = 0
+                    command = "\x06"
+                elif self._input[0] == ord(":"):
+                    end = self._input.find(b"#")
+                    if end < 0:
+                        break
+                    command = self._input[: end + 1].decode("latin-1")
+                else:
+                    # garbage on the line, the mount just ignores it
+                    del self._input[0]
+                    base += 1
+                    continue
+
+                del self._input[: end + 1]
+                index = base + end
+                base += end + 1
+
+                self.commands += 1
+                self._update()
+                replies.append((index, self.handle(command)))
+
+        return replies
+
+    def handle(self, command):
+        if command == "\x06":
+            return self._reply(self.align_mode)
+
+        body = command[1:-1]
+
+        handler = self._commands.get(body[:2]) or self._commands.get(body[:1])
+        if handler is None:
+            return []
+
+        return getattr(self, handler)(body) or []
+
+    def _reply(self, text, delay=0.0):
+        return [(delay, text.encode("latin-1"))]
+
+    def _ra(self, value):
+        if self.high_precision:
+            return _sexagesimal(value, sep=":") + "#"
+        return _sexagesimal(value, sep=":", tenths=True) + "#"
+
+    def _dec(self, value):
+        if self.high_precision:
+            return _sexagesimal(value, signed=True) + "#"
+        return _sexagesimal(value, fields=2, signed=True) + "#"
+
+    def _az(self, value):
+        if self.azimuth_from_south:
+            value = (value + 180.0) % 360.0
+        if self.high_precision:
+            return _sexagesimal(value, width=3) + "#"
+        return _sexagesimal(value, fields=2, width=3) + "#"
+
+    # -- get commands
+
+    def _get_ra(self, body):
+        reply = self._ra(self.ra)
+        if self._stray_one:
+            self._stray_one = False
+            reply = "1" + reply
+        return self._reply(reply)
+
+    def _get_dec(self, body):
+        return self._reply(self._dec(self.dec))
+
+    def _get_target_ra(self, body):
+        return self._reply(self._ra(self.target_ra))
+
+    def _get_target_dec(self, body):
+        return self._reply(self._dec(self.target_dec))
+
+    def _get_alt(self, body):
+        alt, _ = self.alt_az()
+        return self._reply(self._dec(alt))
+
+    def _get_az(self, body):
+        _, az = self.alt_az()
+        return self._reply(self._az(az))
+
+    def _get_lat(self, body):
+        return self._reply(_sexagesimal(self.latitude, fields=2, signed=True) + "#")
+
+    def _get_long(self, body):
+        return self._reply(
+            _sexagesimal(self.longitude, fields=2, width=3, signed=True) + "#"
+        )
+
+    def _get_date(self, body):
+        return self._reply(self.local_time().strftime("%m/%d/%y") + "#")
+
+    def _get_local_time(self, body):
+        return self._reply(self.local_time().strftime("%H:%M:%S") + "#")
+
+    def _get_sidereal_time(self, body):
+        return self._reply(_sexagesimal(self.lst(), sep=":") + "#")
+
+    def _get_utc_offset(self, body):
+        return self._reply("%+05.1f#" % self.utc_offset)
+
+    def _get_tracking_rate(self, body):
+        return self._reply("%04.1f#" % self.tracking_rate)
+
+    def _distance_bars(self, body):
+        # a single bar while slewing, like the classic LX200
+        return self._reply("\x7f#" if self.slewing else "#")
+
+    # -- set commands
+
+    def _set(self, setter, body):
+        try:
+            setter(body[2:])
+        except ValueError:
+            return self._reply("0")
+        return self._reply("1")
+
+    def _set_target_ra(self, body):
+        def setter(value):
+            value = _parse_sexagesimal(value)
+            if not 0 <= value < 24:
+                raise ValueError(value)
+            self.target_ra = value
+
+        return self._set(setter, body)
+
+    def _set_target_dec(self, body):
+        def setter(value):
+            value = _parse_sexagesimal(value)
+            if not -90 <= value <= 90:
+                raise ValueError(value)
+            self.target_dec = value
+
+        return self._set(setter, body)
+
+    def _set_target_alt(self, body):
+        def setter(value):
+            self.target_alt = _parse_sexagesimal(value)
+
+        return self._set(setter, body)
+
+    def _set_target_az(self, body):
+        def setter(value):
+            self.target_az = _parse_sexagesimal(value) % 360.0
+
+        return self._set(setter, body)
+
+    def _set_lat(self, body):
+        def setter(value):
+            self.latitude = _parse_sexagesimal(value)
+
+        return self._set(setter, body)
+
+    def _set_long(self, body):
+        def setter(value):
+            self.longitude = _parse_sexagesimal(value)
+
+        return self._set(setter, body)
+
+    def _set_local_time(self, body):
+        def setter(value):
+            local = dt.datetime.strptime(value, "%H:%M:%S").time()
+            self._local_base = dt.datetime.combine(self.local_time().date(), local)
+            self._local_base_mono = time.monotonic()
+
+        return self._set(setter, body)
+
+    def _set_utc_offset(self, body):
+        def setter(value):
+            self.utc_offset = float(value)
+
+        return self._set(setter, body)
+
+    def _set_sidereal_time(self, body):
+        return self._reply("1")
+
+    def _set_tracking_rate(self, body):
+        def setter(value):
+            self.tracking_rate = float(value)
+
+        return self._set(setter, body)
+
+    def _set_max_slew_rate(self, body):
+        try:
+            speed = int(body[2:])
+        except ValueError:
+            return self._reply("0")
+        if not 2 <= speed <= 8:
+            return self._reply("0")
+        self.slew_speed = float(speed)
+        return self._reply("1")
+
+    def _set_baud_rate(self, body):
+        rate = BAUD_RATES.get(body[2:])
+        if rate is None or rate > self.max_baudrate:
+            return self._reply("0")
+
+        # answered at the old rate, the next command comes at the new one
+        self.baudrate = rate
+        return self._reply("1")
+
+    def _set_date(self, body):
+        try:
+            date = dt.datetime.strptime(body[2:], "%m/%d/%y").date()
+        except ValueError:
+            # mount sends a junk null byte after the error
+            return self._reply("0\x00")
+
+        self._local_base = dt.datetime.combine(date, self.local_time().time())
+        self._local_base_mono = time.monotonic()
+
+        return [
+            (0.0, b"1"),
+            (0.0, b"Updating        planetary data. #"),
+            (self.date_update_delay, b"                              #"),
+        ]
+
+    # -- mode commands
+
+    def _align_alt_az(self, body):
+        self.align_mode = "A"
+        return self._reply("1")
+
+    def _align_polar(self, body):
+        self.align_mode = "P"
+        return self._reply("1")
+
+    def _align_land(self, body):
+        self.align_mode = "L"
+        return self._reply("1")
+
+    def _toggle_precision(self, body):
+        self.high_precision = not self.high_precision
+
+    def _set_rate(self, body):
+        if body[1:2] in ("G", "C", "M", "S"):
+            self.rate = body[1:2]
+
+    def _manual_tracking(self, body):
+        pass
+
+    # -- motion commands
+
+    def _slew_ra_dec(self, body):
+        alt, _ = radec_to_altaz(
+            self.target_ra, self.target_dec, self.latitude, self.lst()
+        )
+        if alt < 0:
+            return self._reply("1Object Below Horizon #")
+
+        self.moving.clear()
+        self.slewing = True
+        return self._reply("0")
+
+    def _slew_alt_az(self, body):
+        az = self.target_az
+        if self.azimuth_from_south:
+            az = (az + 180.0) % 360.0
+
+        self.target_ra, self.target_dec = altaz_to_radec(
+            self.target_alt, az, self.latitude, self.lst()
+        )
+
+        self.moving.clear()
+        self.slewing = True
+        return self._reply("0")
+
+    def _move(self, body):
+        direction = body[1:2]
+        if direction in ("n", "s", "e", "w"):
+            self.moving.add(direction)
+
+    def _pulse_guide(self, body):
+        direction = body[2:3]
+        try:
+            duration = int(body[3:]) / 1000.0
+        except ValueError:
+            return
+        if direction in ("n", "s", "e", "w"):
+            self.pulses[direction] = time.monotonic() + duration
+
+    def _stop(self, body):
+        direction = body[1:2]
+
+        if direction in ("n", "s", "e", "w"):
+            self.moving.discard(direction)
+            self.pulses.pop(direction, None)
+        else:
+            self.moving.clear()
+            self.pulses.clear()
+            self.slewing = False
+
+        if self.quirks:
+            self._stray_one = True
+
+    def _sync(self, body):
+        self.ra = self.target_ra
+        self.dec = self.target_dec
+        return self._reply(" M31 EX GAL MAG 3.5 SZ178.0'#")
+
+
+class SimulatedSerial(SerialBase):
+    """pyserial port connected to a :class:`LX200Simulator`"""
+
+    def __init__(self, *args, **kwargs):
+        self.simulator = None
+        self._rx = deque()
+        self._rx_busy_until = 0.0
+        self._tx_busy_until = 0.0
+        self._cond = threading.Condition()
+        super().__init__(*args, **kwargs)
+
+    def open(self):
+        if self.is_open:
+            raise SerialException("Port is already open.")
+        if self._port is None:
+            raise SerialException("Port must be configured before it can be used.")
+
+        self.from_url(self.port)
+        self._reconfigure_port()
+        self.is_open = True
+        self.reset_input_buffer()
+
+    def close(self):
+        with self._cond:
+            self.is_open = False
+            self._cond.notify_all()
+
+    def from_url(self, url):
+        parts = urllib.parse.urlsplit(url)
+        if parts.scheme != "lx200sim":
+            raise SerialException(
+                "expected a string in the form "
+                '"lx200sim://[name][?option=value...]": %r' % url
+            )
+
+        options = {}
+        for option, values in urllib.parse.parse_qs(parts.query).items():
+            if option in ("high_precision", "azimuth_from_south", "quirks"):
+                options[option] = values[0].lower() in ("1", "true", "yes")
+            elif option == "max_baudrate":
+                options[option] = int(values[0])
+            elif option in (
+                "latitude",
+                "longitude",
+                "slew_speed",
+                "latency",
+                "date_update_delay",
+            ):
+                options[option] = float(values[0])
+            else:
+                raise SerialException("unknown option: %r" % option)
+
+        self.simulator = LX200Simulator.get(parts.netloc or "default", **options)
+
+    def _reconfigure_port(self):
+        pass
+
+    @property
+    def byte_time(self):
+        return 10.0 / self._baudrate
+
+    @property
+    def in_waiting(self):
+        if not self.is_open:
+            raise PortNotOpenError()
+
+        now = time.monotonic()
+        with self._cond:
+            return sum(1 for when, _ in self._rx if when <= now)
+
+    def write(self, data):
+        if not self.is_open:
+            raise PortNotOpenError()
+
+        data = bytes(data)
+
+        now = time.monotonic()
+        tx_start = max(now, self._tx_busy_until)
+        self._tx_busy_until = tx_start + len(data) * self.byte_time
+
+        if self._baudrate != self.simulator.baudrate:
+            # framing errors, the mount doesn't understand a thing
+            return len(data)
+
+        replies = self.simulator.feed(data)
+
+        with self._cond:
+            for index, chunks in replies:
+                received = tx_start + (index + 1) * self.byte_time
+                ready = received + self.simulator.latency
+
+                for delay, reply in chunks:
+                    ready = max(ready + delay, self._rx_busy_until)
+                    for i, byte in enumerate(reply):
+                        self._rx.append((ready + (i + 1) * self.byte_time, byte))
+                    ready += len(reply) * self.byte_time
+                    self._rx_busy_until = ready
+
+            self._cond.notify_all()
+
+        return len(data)
+
+    def read(self, size=1):
+        if not self.is_open:
+            raise PortNotOpenError()
+
+        deadline = None
+        if self._timeout is not None:
+            deadline = time.monotonic() + self._timeout
+
+        data = bytearray()
+
+        with self._cond:
+            while len(data) < size and self.is_open:
+                now = time.monotonic()
+
+                while self._rx and self._rx[0][0] <= now and len(data) < size:
+                    data.append(self._rx.popleft()[1])
+
+                if len(data) >= size:
+                    break
+
+                if deadline is not None and now >= deadline:
+                    break
+
+                wait = None
+                if self._rx:
+                    wait = self._rx[0][0] - now
+                if deadline is not None:
+                    wait = deadline - now if wait is None else min(wait, deadline - now)
+
+                self._cond.wait(wait)
+
+        return bytes(data)
+
+    def reset_input_buffer(self):
+        if not self.is_open:
+            raise PortNotOpenError()
+
+        # bytes still on the line will arrive later, as on a real port
+        now = time.monotonic()
+        with self._cond:
+            while self._rx and self._rx[0][0] <= now:
+                self._rx.popleft()
+
+    def reset_output_buffer(self):
+        if not self.is_open:
+            raise PortNotOpenError()
+
+    @property
+    def out_waiting(self):
+        return 0
+
+    def _update_break_state(self):
+        pass
+
+    def _update_rts_state(self):
+        pass
+
+    def _update_dtr_state(self):
+        pass
+
+    @property
+    def cts(self):
+        return True
+
+    @property
+    def dsr(self):
+        return True
+
+    @property
+    def ri(self):
+        return False
+
+    @property
+    def cd(self):
+        return True
+
+
+class SimulatorServer(socketserver.ThreadingTCPServer):
+    """
+    TCP server bridging every connection to a :class:`SimulatedSerial` on
+    ``url`` (all of them to the same mount), port 0 binds to any free port.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self, url, host="127.0.0.1", port=0, baudrate=9600):
+        self.url = url
+        self.baudrate = baudrate
+
+        self._connections = set()
+        self._connections_lock = threading.Lock()
+        self._thread = None
+
+        super().__init__((host, port), _BridgeHandler)
+
+    @property
+    def address(self):
+        return self.server_address[:2]
+
+    def start(self):
+        self._thread = threading.Thread(
+            target=self.serve_forever, name="lx200sim-server", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.drop()
+        self.shutdown()
+        self.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def drop(self):
+        """Close all connections, like a terminal server that restarts"""
+        with self._connections_lock:
+            connections = list(self._connections)
+
+        for connection in connections:
+            try:
+                connection.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+
+    @property
+    def connections(self):
+        with self._connections_lock:
+            return len(self._connections)
+
+
+class _BridgeHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        server = self.server
+        connection = self.request
+        connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        port = SimulatedSerial(server.url, baudrate=server.baudrate, timeout=0.05)
+        # terminal server and mount were set up for the same line speed
+        port.simulator.baudrate = server.baudrate
+
+        with server._connections_lock:
+            server._connections.add(connection)
+
+        def pump():
+            try:
+                while port.is_open:
+                    data = port.read(max(1, port.in_waiting))
+                    if data:
+                        connection.sendall(data)
+            except OSError:
+                pass
+
+        replies = threading.Thread(target=pump, name="lx200sim-bridge", daemon=True)
+        replies.start()
+
+        try:
+            while True:
+                data = connection.recv(4096)
+                if not data:
+                    break
+                port.write(data)
+        except OSError:
+            pass
+        finally:
+            with server._connections_lock:
+                server._connections.discard(connection)
+            port.close()
+            replies.join()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m chimera_meade.simulator",
+        description="Serve a simulated LX200 mount over TCP.",
+    )
+    parser.add_argument("url", nargs="?", default="lx200sim://default")
+    parser.add_argument("--listen", default="127.0.0.1:4030", help="host:port")
+    parser.add_argument("--baudrate", type=int, default=9600)
+    args = parser.parse_args(argv)
+
+    host, _, port = args.listen.rpartition(":")
+    server = SimulatorServer(args.url, host or "127.0.0.1", int(port), args.baudrate)
+    print("%s on socket://%s:%d" % (args.url, *server.address))
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
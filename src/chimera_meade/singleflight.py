@@ -0,0 +1,58 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Identical calls made while one is in flight share its result.
+
+Used for read-only LX200 queries: when the guider, the dome and a GUI ask
+for the position at about the same time, one ``:GR#:GD#`` exchange answers
+all of them.
+"""
+
+import threading
+
+__all__ = ["SingleFlight"]
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    def __init__(self):
+        self._lock = threading.Lock()
+        # key -> _Call in flight
+        self._calls = {}
+
+    def do(self, key, func):
+        """
+        Return (func(), False), or (result, True) when an identical call
+        (same ``key``) was already in flight and its result (or exception)
+        is shared.
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+        return call.result, False
@@ -0,0 +1,85 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import threading
+from collections import deque
+from typing import NamedTuple
+
+from chimera.util.position import Position
+
+__all__ = ["TelemetrySnapshot", "TelemetryPoller"]
+
+
+class TelemetrySnapshot(NamedTuple):
+    """Mount state at a given instant, never changed after published"""
+
+    timestamp: float  # time.time() of the sample
+    monotonic: float  # time.monotonic() of the sample
+    ra_dec: Position
+    alt_az: Position
+    slewing: bool
+    tracking_rate: float
+
+
+class TelemetryPoller:
+    """
+    Calls ``sample`` every ``busy_interval`` seconds while ``busy()`` is
+    true and every ``idle_interval`` seconds otherwise, keeping the last
+    ``history`` snapshots. :meth:`wake` makes the next sample happen now.
+    """
+
+    def __init__(self, sample, busy, idle_interval, busy_interval, history, log):
+        self._sample = sample
+        self._busy = busy
+        self.idle_interval = idle_interval
+        self.busy_interval = busy_interval
+        self._log = log
+
+        self._history = deque(maxlen=history)
+        self._latest = None
+
+        self._wakeup = threading.Event()
+        self._quit = threading.Event()
+        self._thread = None
+
+    @property
+    def latest(self):
+        return self._latest
+
+    @property
+    def interval(self):
+        return self.busy_interval if self._busy() else self.idle_interval
+
+    def history(self):
+        return list(self._history)
+
+    def start(self):
+        self._quit.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="meade-telemetry", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        self._quit.set()
+        self._wakeup.set()
+
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def wake(self):
+        self._wakeup.set()
+
+    def _run(self):
+        while not self._quit.is_set():
+            try:
+                snapshot = self._sample()
+            except Exception as e:
+                self._log.warning("Telemetry poll failed (%s)" % e)
+            else:
+                self._history.append(snapshot)
+                self._latest = snapshot
+
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
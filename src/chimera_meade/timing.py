@@ -0,0 +1,73 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import threading
+import time
+from collections import deque
+
+__all__ = ["MoveTimer"]
+
+
+class MoveTimer:
+    """
+    Waits for timed moves on the monotonic clock without burning a CPU:
+    sleeps until ``spin_time`` seconds before the deadline and spins only
+    for that last bit. A wait can be cancelled from another thread, and the
+    error of every stop (actual - requested, in seconds) is kept.
+    """
+
+    def __init__(self, spin_time=0.002, history=100):
+        self.spin_time = spin_time
+
+        self._cancel = threading.Event()
+        self._tag = None
+        self._errors = deque(maxlen=history)
+
+    def begin(self, tag=None):
+        """Start a new timed move, ``tag`` is what cancel() matches"""
+        self._tag = tag
+        self._cancel.clear()
+
+    def end(self):
+        self._tag = None
+
+    def cancel(self, tag=None):
+        """Cancel the move in progress, if it matches ``tag`` (None matches all)"""
+        if tag is None or tag == self._tag:
+            self._cancel.set()
+
+    def wait_until(self, deadline):
+        """Wait until ``deadline`` (time.monotonic), return False if cancelled"""
+        while True:
+            remaining = deadline - time.monotonic()
+
+            if remaining <= 0:
+                return True
+
+            if remaining > self.spin_time:
+                if self._cancel.wait(remaining - self.spin_time):
+                    return False
+                continue
+
+            while time.monotonic() < deadline:
+                if self._cancel.is_set():
+                    return False
+
+            return True
+
+    def record(self, error):
+        self._errors.append(error)
+
+    def stats(self):
+        """Stop errors of the last moves: count, mean, max (abs) and last, in seconds"""
+        errors = list(self._errors)
+
+        if not errors:
+            return {"count": 0, "mean": 0.0, "max": 0.0, "last": 0.0}
+
+        return {
+            "count": len(errors),
+            "mean": sum(errors) / len(errors),
+            "max": max(abs(e) for e in errors),
+            "last": errors[-1],
+        }
@@ -0,0 +1,162 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Ports the driver talks to the mount through.
+
+Devices are pyserial URLs: a serial port (``/dev/ttyS0``), the simulator
+(``lx200sim://name``) or a terminal server, as a raw TCP stream
+(``socket://host:port``) or telnet with RFC 2217 port control
+(``rfc2217://host:port``).
+
+The driver writes every exchange at once (see Meade._transact), so network
+links get Nagle's algorithm disabled to send the short LX200 commands right
+away, and TCP keepalive to notice a dead link while idle.
+
+Serial links start at 9600 baud, faster rates negotiated with ``:SB`` are
+remembered per device by :class:`LinkStore`.
+"""
+
+import json
+import os
+import re
+import time
+
+from chimera_meade.calibration import atomic_write_json
+
+__all__ = [
+    "NETWORK_SCHEMES",
+    "pyserial",
+    "is_network",
+    "can_set_baudrate",
+    "create_port",
+    "tune_link",
+    "LinkStore",
+]
+
+NETWORK_SCHEMES = ("socket", "rfc2217")
+
+
+def pyserial():
+    """pyserial, only imported when a port is opened"""
+    import serial
+
+    # lx200sim:// devices (see chimera_meade.simulator)
+    if "chimera_meade" not in serial.protocol_handler_packages:
+        serial.protocol_handler_packages.append("chimera_meade")
+
+    return serial
+
+
+def is_network(device):
+    scheme, sep, _ = device.partition("://")
+    return bool(sep) and scheme.lower() in NETWORK_SCHEMES
+
+
+def can_set_baudrate(device):
+    """False for raw TCP, where the line speed is set on the terminal server"""
+    return device.partition("://")[0].lower() != "socket"
+
+
+def create_port(device, timeout, baudrate=9600):
+    """LX200 port (8N1, no flow control) for ``device``, not opened yet"""
+    serial = pyserial()
+
+    return serial.serial_for_url(
+        device,
+        do_not_open=True,
+        baudrate=baudrate,
+        bytesize=serial.EIGHTBITS,
+        parity=serial.PARITY_NONE,
+        stopbits=serial.STOPBITS_ONE,
+        timeout=timeout,
+        xonxoff=False,
+        rtscts=False,
+    )
+
+
+def tune_link(port, keepalive_idle=10, keepalive_interval=5, keepalive_count=3):
+    """
+    Disable Nagle and enable keepalive (probes after ``keepalive_idle``
+    seconds, 0 to disable) on an opened network ``port``, does nothing on
+    other ports.
+    """
+    import socket
+
+    # pyserial's socket:// and rfc2217:// ports keep it there
+    sock = getattr(port, "_socket", None)
+    if not isinstance(sock, socket.socket):
+        return
+
+    sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    if not keepalive_idle:
+        return
+
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+
+    # TCP_KEEPIDLE is TCP_KEEPALIVE on macOS, none of them on some systems
+    idle = getattr(socket, "TCP_KEEPIDLE", getattr(socket, "TCP_KEEPALIVE", None))
+    for option, value in (
+        (idle, keepalive_idle),
+        (getattr(socket, "TCP_KEEPINTVL", None), keepalive_interval),
+        (getattr(socket, "TCP_KEEPCNT", None), keepalive_count),
+    ):
+        if option is not None:
+            sock.setsockopt(socket.IPPROTO_TCP, option, int(value))
+
+
+class LinkStore:
+    """
+    Line speed known to work with a device, and the ones it refused (with
+    when, time.time()), kept in ``meade-link-<device>.json``.
+    """
+
+    VERSION = 2
+
+    def __init__(self, path, device=""):
+        self.path = path
+        self.device = device
+
+    @classmethod
+    def for_device(cls, directory, device):
+        slug = re.sub(r"[^A-Za-z0-9.-]+", "_", device).strip("_")
+        return cls(os.path.join(directory, "meade-link-%s.json" % slug), device)
+
+    def load(self, max_age=None):
+        """
+        (baudrate, {refused baudrate: when}), (9600, {}) if nothing was
+        saved. Refusals older than ``max_age`` seconds are left out.
+        """
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+
+            if data.get("version") == 1:
+                # refusals without a date, try them again
+                return int(data["baudrate"]), {}
+
+            if data.get("version") != self.VERSION:
+                raise ValueError("unsupported link file version")
+
+            now = time.time()
+            refused = {
+                int(rate): float(when)
+                for rate, when in data["refused"].items()
+                if max_age is None or now - float(when) < max_age
+            }
+
+            return int(data["baudrate"]), refused
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            return 9600, {}
+
+    def save(self, baudrate, refused=None):
+        atomic_write_json(
+            self.path,
+            {
+                "version": self.VERSION,
+                "device": self.device,
+                "baudrate": baudrate,
+                "refused": {str(rate): when for rate, when in (refused or {}).items()},
+            },
+        )
@@ -0,0 +1,232 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+"""
+Binary log of everything that goes through the serial line.
+
+The driver only appends a tuple to an in-memory ring for every read and
+write, a background thread packs and writes them to disk. Every session is
+appended to what the file has (the capture before a crash or a restart is
+what one wants to see after it) and starts with a header::
+
+    magic (8s) | time.time() (d) | time.monotonic() (d)
+
+followed by records::
+
+    time.monotonic() (d) | kind (B) | latency in us (I) | length (H) | data
+
+where kind is 0 for writes and 1 for reads and latency is the time since the
+last write (reads only). Print them back with::
+
+    python -m chimera_meade.wirelog meade-wire.log
+"""
+
+import datetime as dt
+import os
+import struct
+import sys
+import threading
+import time
+from collections import deque
+
+__all__ = ["WireLog", "read_records", "main"]
+
+MAGIC = b"MEADEWL1"
+
+WRITE = 0
+READ = 1
+
+_HEADER = struct.Struct("<8sdd")
+_RECORD = struct.Struct("<dBIH")
+
+
+class WireLog:
+    """
+    Ring of wire records drained to ``path`` every ``flush_interval``
+    seconds, ``path`` is rotated to ``path.1`` ... ``path.<backups>`` when
+    it grows over ``max_bytes``. When the writer can't keep up the oldest
+    records are dropped (counted in ``dropped``).
+    """
+
+    def __init__(
+        self,
+        path,
+        max_bytes=4 << 20,
+        backups=3,
+        capacity=16384,
+        flush_interval=0.5,
+        log=None,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._log = log
+
+        # deque append/popleft are atomic, no lock on the driver side
+        self._ring = deque(maxlen=capacity)
+        self._last_write = 0.0
+
+        self._file = None
+        self._wakeup = threading.Event()
+        self._quit = threading.Event()
+        self._thread = None
+
+    # -- producer side, called on every serial exchange
+
+    def sent(self, data):
+        now = time.monotonic()
+        self._last_write = now
+        self._append((now, WRITE, 0.0, data))
+
+    def received(self, data):
+        now = time.monotonic()
+        self._append((now, READ, now - self._last_write, data))
+
+    def _append(self, record):
+        if len(self._ring) == self._ring.maxlen:
+            self.dropped += 1
+        self._ring.append(record)
+
+    # -- writer side
+
+    def start(self):
+        if self._thread is not None:
+            return
+
+        self._quit.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="meade-wirelog", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+
+        self._quit.set()
+        self._wakeup.set()
+        self._thread.join()
+        self._thread = None
+
+    def flush(self):
+        """Write whatever is in the ring now (from the writer thread or stopped)"""
+        if not self._ring:
+            return
+
+        chunks = []
+        while self._ring:
+            try:
+                when, kind, latency, data = self._ring.popleft()
+            except IndexError:
+                break
+
+            data = data[:0xFFFF]
+            chunks.append(
+                _RECORD.pack(when, kind, min(int(latency * 1e6), 0xFFFFFFFF), len(data))
+            )
+            chunks.append(data)
+
+        if self._file is None:
+            self._open()
+
+        self._file.write(b"".join(chunks))
+        self._file.flush()
+
+        if self._file.tell() >= self.max_bytes:
+            self._rotate()
+
+    def _run(self):
+        try:
+            while not self._quit.is_set():
+                self._wakeup.wait(self.flush_interval)
+                self._wakeup.clear()
+                self.flush()
+
+            self.flush()
+        except OSError as e:
+            # nowhere to log, drop records from now on
+            if self._log is not None:
+                self._log.warning("Could not write meade wire log (%s)" % e)
+            self._ring.clear()
+        finally:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def _open(self):
+        self._file = open(self.path, "ab")
+        self._file.write(_HEADER.pack(MAGIC, time.time(), time.monotonic()))
+
+    def _rotate(self):
+        self._file.close()
+        self._file = None
+
+        for i in range(self.backups - 1, 0, -1):
+            older = "%s.%d" % (self.path, i)
+            if os.path.exists(older):
+                os.replace(older, "%s.%d" % (self.path, i + 1))
+
+        if self.backups > 0:
+            os.replace(self.path, "%s.1" % self.path)
+
+
+def read_records(f):
+    """Yield (time.time(), kind, latency, data) for every record in file ``f``"""
+    header = f.read(_HEADER.size)
+    if len(header) < _HEADER.size:
+        return
+
+    magic, wall, mono = _HEADER.unpack(header)
+    if magic != MAGIC:
+        raise ValueError("not a wire log file")
+
+    while True:
+        head = f.read(_RECORD.size)
+        if len(head) < _RECORD.size:
+            return
+
+        if head.startswith(MAGIC):
+            # the next session, with its own clocks
+            header = head + f.read(_HEADER.size - _RECORD.size)
+            if len(header) < _HEADER.size:
+                return
+            magic, wall, mono = _HEADER.unpack(header)
+            continue
+
+        when, kind, latency, length = _RECORD.unpack(head)
+        data = f.read(length)
+
+        yield wall + (when - mono), kind, latency / 1e6, data
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        prog="python -m chimera_meade.wirelog",
+        description="Print Meade wire log files as text.",
+    )
+    parser.add_argument("files", nargs="+")
+    args = parser.parse_args(argv)
+
+    for name in args.files:
+        with open(name, "rb") as f:
+            for when, kind, latency, data in read_records(f):
+                stamp = dt.datetime.fromtimestamp(when).isoformat(
+                    timespec="microseconds"
+                )
+                if kind == WRITE:
+                    print("%s [write] %r" % (stamp, data.decode("latin-1")))
+                else:
+                    print(
+                        "%s [read ] %r (%.1f ms)"
+                        % (stamp, data.decode("latin-1"), latency * 1000)
+                    )
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
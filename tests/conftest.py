@@ -0,0 +1,74 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import uuid
+
+import pytest
+
+from chimera_meade import meade as meade_module
+from chimera_meade.meade import Meade
+from chimera_meade.simulator import LX200Simulator, SimulatorServer
+
+
+@pytest.fixture
+def simulator_name():
+    name = "test-%s" % uuid.uuid4().hex
+    yield name
+    LX200Simulator.forget(name)
+
+
+@pytest.fixture
+def simulator(simulator_name):
+    return LX200Simulator.get(simulator_name, slew_speed=8.0, latency=0.002)
+
+
+@pytest.fixture
+def server(simulator, simulator_name):
+    """The simulator behind a local TCP stand-in for a terminal server"""
+    server = SimulatorServer("lx200sim://%s" % simulator_name).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def make_meade(tmp_path, monkeypatch):
+    """Meade(device, **config), opened and not initialized"""
+    # link and calibration files
+    monkeypatch.setattr(meade_module, "SYSTEM_CONFIG_DIRECTORY", str(tmp_path))
+
+    opened = []
+
+    def make(device, **config):
+        telescope = Meade()
+        telescope["device"] = device
+        telescope["timeout"] = 5
+        telescope["skip_init"] = True
+        telescope["wire_log"] = False
+        telescope["slew_idle_time"] = 0.05
+        telescope["stabilization_time"] = 0.0
+        for key, value in config.items():
+            telescope[key] = value
+
+        # events are dispatched by the chimera manager
+        telescope.slewBegin = lambda *args, **kwargs: None
+        telescope.slewComplete = lambda *args, **kwargs: None
+
+        telescope.open()
+        opened.append(telescope)
+        return telescope
+
+    yield make
+
+    for telescope in opened:
+        telescope._join_slew_monitor(10)
+        telescope.close()
+
+
+@pytest.fixture
+def meade(make_meade, simulator, simulator_name):
+    return make_meade("lx200sim://%s" % simulator_name)
+
+
+@pytest.fixture
+def network_meade(make_meade, server):
+    return make_meade("socket://%s:%d" % server.address)
@@ -0,0 +1,131 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import asyncio
+import time
+
+import pytest
+from chimera.util.position import Position
+
+from chimera_meade.aio import AsyncMeade
+from chimera_meade.meade import Direction, MeadeException
+
+
+def run(simulator_name, coroutine, **kwargs):
+    """Run coroutine(meade) with an AsyncMeade open on the simulator"""
+
+    async def main():
+        async with AsyncMeade("lx200sim://%s" % simulator_name, **kwargs) as meade:
+            return await coroutine(meade)
+
+    return asyncio.run(main())
+
+
+def test_open_and_close(simulator, simulator_name):
+    meade = AsyncMeade("lx200sim://%s" % simulator_name)
+
+    async def main():
+        await meade.open()
+        await meade.close()
+
+    asyncio.run(main())
+
+    with pytest.raises(OSError):
+        asyncio.run(meade.get_position_ra_dec())
+
+
+def test_open_fails_on_a_bad_device():
+    with pytest.raises(MeadeException):
+        asyncio.run(AsyncMeade("lx200sim://x?no_such_option=1").open())
+
+
+def test_read_position(simulator, simulator_name):
+    async def reads(meade):
+        return await meade.get_position_ra_dec(), await meade.sample_telemetry()
+
+    position, telemetry = run(simulator_name, reads)
+
+    assert position.ra.H == pytest.approx(simulator.ra, abs=1 / 3600.0)
+    assert position.dec.D == pytest.approx(simulator.dec, abs=1 / 3600.0)
+    assert telemetry.ra_dec.dec.D == pytest.approx(simulator.dec, abs=1 / 3600.0)
+    assert telemetry.tracking_rate == pytest.approx(simulator.tracking_rate)
+
+
+def test_slew(simulator, simulator_name):
+    async def slew(meade):
+        start = await meade.get_position_ra_dec()
+        target = Position.fromRaDec(start.ra, start.dec.D + 2.0)
+
+        assert await meade.slew_to_ra_dec(target)
+        assert not meade.is_slewing()
+
+        return start, await meade.get_position_ra_dec()
+
+    start, end = run(simulator_name, slew, slew_idle_time=0.05, stabilization_time=0)
+
+    assert end.dec.D == pytest.approx(start.dec.D + 2.0, abs=0.02)
+
+
+def test_abort_slew(simulator, simulator_name):
+    async def slew(meade):
+        start = await meade.get_position_ra_dec()
+        target = Position.fromRaDec(start.ra, start.dec.D + 10.0)
+
+        task = asyncio.create_task(meade.slew_to_ra_dec(target))
+        await asyncio.sleep(0.2)
+        await meade.abort_slew()
+
+        return await asyncio.wait_for(task, 1.0)
+
+    assert run(simulator_name, slew, slew_idle_time=0.05) is False
+    assert not simulator.slewing
+
+
+@pytest.mark.parametrize("stop", ["stop_move", "stop_move_all", "abort_slew"])
+def test_stops_end_a_move_early(simulator, simulator_name, stop):
+    async def move(meade):
+        task = asyncio.create_task(meade.move(Direction.N, 5.0))
+        await asyncio.sleep(0.2)
+
+        t0 = time.monotonic()
+        if stop == "stop_move":
+            await meade.stop_move(Direction.N)
+        else:
+            await getattr(meade, stop)()
+        await asyncio.wait_for(task, 1.0)
+
+        return time.monotonic() - t0
+
+    assert run(simulator_name, move) < 0.5
+    assert not simulator.moving
+
+
+def test_stopping_another_direction_doesnt_end_a_move(simulator, simulator_name):
+    async def move(meade):
+        t0 = time.monotonic()
+        task = asyncio.create_task(meade.move(Direction.N, 0.5))
+        await asyncio.sleep(0.1)
+        await meade.stop_move(Direction.E)
+        await task
+
+        return time.monotonic() - t0
+
+    assert run(simulator_name, move) >= 0.5
+
+
+def test_late_replies_are_not_taken_for_the_next(simulator, simulator_name):
+    async def reads(meade):
+        simulator.latency = 0.3
+        with pytest.raises(MeadeException):
+            await meade.get_position_ra_dec()
+
+        # the late replies arrive, then the mount moves
+        simulator.latency = 0.002
+        await asyncio.sleep(0.5)
+        simulator.dec = 45.0
+
+        return await meade.get_position_ra_dec()
+
+    position = run(simulator_name, reads, timeout=0.1)
+
+    assert position.dec.D == pytest.approx(45.0, abs=1 / 3600.0)
@@ -0,0 +1,159 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import datetime as dt
+
+import pytest
+
+from chimera_meade.astrometry import (
+    LocalSky,
+    altaz_to_radec,
+    julian_date,
+    local_sidereal_time,
+    radec_to_altaz,
+)
+
+J2000 = dt.datetime(2000, 1, 1, 12, tzinfo=dt.UTC)
+# one arcsecond, in degrees
+ARCSEC = 1 / 3600.0
+
+
+def test_julian_date():
+    assert julian_date(J2000) == 2451545.0
+
+
+def test_local_sidereal_time():
+    assert local_sidereal_time(J2000, 0.0) == pytest.approx(18.697374558)
+    # an hour east
+    assert local_sidereal_time(J2000, 15.0) == pytest.approx(19.697374558)
+    # a sidereal day is shorter
+    later = J2000 + dt.timedelta(hours=23, minutes=56, seconds=4.0905)
+    assert local_sidereal_time(later, 0.0) == pytest.approx(18.697374558, abs=1e-6)
+
+
+def test_meridian():
+    # 30 degrees south of the zenith, on the meridian
+    alt, az = radec_to_altaz(6.0, -52.5, -22.5, 6.0)
+
+    assert alt == pytest.approx(60.0)
+    assert az == pytest.approx(180.0)
+
+
+def test_zenith():
+    alt, _ = radec_to_altaz(3.0, 40.0, 40.0, 3.0)
+
+    assert alt == pytest.approx(90.0)
+
+
+def test_east_rises():
+    # six hours before the meridian, on the equator
+    alt, az = radec_to_altaz(12.0, 0.0, 0.0, 6.0)
+
+    assert alt == pytest.approx(0.0, abs=1e-9)
+    assert az == pytest.approx(90.0)
+
+
+@pytest.mark.parametrize("ra,dec", [(1.0, 20.0), (13.5, -60.0), (23.9, 5.0)])
+def test_round_trip(ra, dec):
+    lst = 4.2
+    alt, az = radec_to_altaz(ra, dec, -22.5, lst)
+
+    ra2, dec2 = altaz_to_radec(alt, az, -22.5, lst)
+
+    assert (ra2 - ra + 12) % 24 - 12 == pytest.approx(0.0, abs=1e-9)
+    assert dec2 == pytest.approx(dec, abs=1e-9)
+
+
+def test_first_check_takes_the_mount_clock():
+    sky = LocalSky(-22.5, -45.5)
+    lst = local_sidereal_time(J2000, -45.5) + 10 / 3600.0
+    alt, az = radec_to_altaz(6.0, -52.5, -22.5, lst)
+
+    error = sky.check(J2000, 6.0, -52.5, alt, az, lst)
+
+    assert sky.lst_offset * 3600 == pytest.approx(10.0)
+    assert sky.lst(J2000) == pytest.approx(lst)
+    assert error < ARCSEC
+
+
+def test_clock_differences_are_smoothed_unless_they_jump():
+    sky = LocalSky(-22.5, -45.5, smoothing=0.25, jump=2.0)
+    base = local_sidereal_time(J2000, -45.5)
+
+    def check(offset):
+        lst = base + offset / 3600.0
+        alt, az = radec_to_altaz(6.0, -52.5, -22.5, lst)
+        sky.check(J2000, 6.0, -52.5, alt, az, lst)
+        return sky.lst_offset * 3600
+
+    assert check(0.0) == pytest.approx(0.0)
+    # the mount gives whole seconds
+    assert check(1.0) == pytest.approx(0.25)
+    # the mount clock was set
+    assert check(30.0) == pytest.approx(30.0)
+
+
+def test_alt_az_offsets():
+    sky = LocalSky(-22.5, -45.5)
+    lst = local_sidereal_time(J2000, -45.5)
+    alt, az = radec_to_altaz(6.0, -52.5, -22.5, lst)
+
+    # the mount keeps the site to the arc minute
+    sky.check(J2000, 6.0, -52.5, alt + 0.01, az - 0.02, lst)
+
+    assert sky.alt_az(6.0, -52.5, J2000) == pytest.approx((alt + 0.01, az - 0.02))
+
+
+@pytest.fixture
+def sky_meade(meade):
+    # no positions from memory, only the astrometry
+    meade["position_cache_max_age"] = 0.0
+    return meade
+
+
+def computed(meade):
+    return meade.get_metrics().get("computed_total", {})
+
+
+def test_meade_lst(sky_meade, simulator):
+    lst = sky_meade.get_local_sidereal_time()
+    commands = simulator.commands
+    lst = sky_meade.get_local_sidereal_time()
+
+    mount = simulator.lst() * 3600
+    ours = lst.hour * 3600 + lst.minute * 60 + lst.second
+    assert (ours - mount + 43200) % 86400 - 43200 == pytest.approx(0.0, abs=2.0)
+    assert simulator.commands == commands
+    assert computed(sky_meade)["quantity=lst"] == 2
+
+
+def test_meade_alt_az(sky_meade, simulator):
+    sky_meade.get_position_alt_az()
+    position = sky_meade.get_position_alt_az()
+
+    alt, az = simulator.alt_az()
+    assert position.alt.D == pytest.approx(alt, abs=5 * ARCSEC)
+    assert (position.az.D - az + 180) % 360 - 180 == pytest.approx(0.0, abs=10 * ARCSEC)
+    assert computed(sky_meade)["quantity=alt_az"] == 2
+
+
+def test_meade_reads_the_mount_when_it_disagrees(sky_meade, simulator):
+    sky_meade["astrometry_check_interval"] = 0.0
+    sky_meade.get_position_alt_az()
+
+    # the site we keep is a degree off now
+    simulator.latitude += 1.0
+    position = sky_meade.get_position_alt_az()
+
+    alt, _ = simulator.alt_az()
+    assert position.alt.D == pytest.approx(alt, abs=ARCSEC)
+    assert computed(sky_meade)["quantity=alt_az"] == 1
+
+
+def test_meade_without_local_astrometry(sky_meade):
+    sky_meade["local_astrometry"] = False
+
+    sky_meade.get_local_sidereal_time()
+    sky_meade.get_position_alt_az()
+
+    assert computed(sky_meade) == {}
@@ -0,0 +1,109 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import json
+import os
+
+import pytest
+
+from chimera_meade.calibration import CalibrationEntry, CalibrationStore, RateEstimator
+
+# a calibrated 30"/s rate, read with 15" resolution
+ENTRY = CalibrationEntry(30.0, 3, 0.01, "2026-01-01T00:00:00+00:00")
+RESOLUTION = 15.0
+
+
+def test_follows_the_rate():
+    estimator = RateEstimator(ENTRY)
+
+    for _ in range(20):
+        assert estimator.update(2.0, 62.0, RESOLUTION)
+
+    assert estimator.rate == pytest.approx(31.0, rel=0.01)
+
+
+def test_short_moves_are_not_measurable():
+    estimator = RateEstimator(ENTRY)
+
+    assert not estimator.measurable(0.3, 9.0, RESOLUTION)
+    assert not estimator.measurable(0.0, 0.0, RESOLUTION)
+    assert estimator.measurable(5.0, 150.0, RESOLUTION)
+
+
+def test_read_resolution_is_not_an_outlier():
+    estimator = RateEstimator(ENTRY)
+
+    # one read step off in both directions on 5 s moves
+    for arc in (150.0 + RESOLUTION, 150.0 - RESOLUTION) * 3:
+        assert estimator.update(5.0, arc, RESOLUTION)
+
+    assert estimator.rate == pytest.approx(30.0, rel=0.01)
+
+
+def test_rate_change_restarts_the_fit():
+    estimator = RateEstimator(ENTRY)
+
+    for _ in range(estimator.warmup - 1):
+        assert not estimator.update(5.0, 250.0, RESOLUTION)
+    assert estimator.update(5.0, 250.0, RESOLUTION)
+
+    assert estimator.rate == pytest.approx(50.0)
+
+
+def test_store_round_trip(tmp_path):
+    store = CalibrationStore.for_device(str(tmp_path), "/dev/ttyS0", "LNA")
+    entries = {"GUIDE": {"E": ENTRY, "W": ENTRY._replace(rate=29.5)}}
+
+    assert not store.exists()
+    assert store.load() == {}
+
+    store.save(entries)
+
+    assert os.path.basename(store.path) == "meade-calibration-dev_ttyS0_LNA.json"
+    assert store.load() == entries
+    # nothing left behind by the atomic write
+    assert os.listdir(tmp_path) == [os.path.basename(store.path)]
+
+
+def test_stores_are_per_device_and_site(tmp_path):
+    paths = {
+        CalibrationStore.for_device(str(tmp_path), device, site).path
+        for device, site in [
+            ("/dev/ttyS0", "LNA"),
+            ("/dev/ttyS1", "LNA"),
+            ("/dev/ttyS0", None),
+        ]
+    }
+
+    assert len(paths) == 3
+
+
+@pytest.mark.parametrize(
+    "data",
+    [
+        {"version": 2, "rates": {}},
+        {"rates": {}},
+        [],
+        {"version": 1, "rates": []},
+        {"version": 1, "rates": {"GUIDE": []}},
+        {"version": 1, "rates": {"GUIDE": {"E": {"rate": 30.0}}}},
+        {"version": 1, "rates": {"GUIDE": {"E": dict(ENTRY._asdict(), rate="x")}}},
+        {"version": 1, "rates": {"GUIDE": {"E": dict(ENTRY._asdict(), rate=0)}}},
+    ],
+)
+def test_invalid_stores(tmp_path, data):
+    store = CalibrationStore(str(tmp_path / "calibration.json"))
+    with open(store.path, "w") as f:
+        json.dump(data, f)
+
+    with pytest.raises(ValueError):
+        store.load()
+
+
+def test_truncated_store(tmp_path):
+    store = CalibrationStore(str(tmp_path / "calibration.json"))
+    with open(store.path, "w") as f:
+        f.write('{"version": 1, "rates": {"GUI')
+
+    with pytest.raises(ValueError):
+        store.load()
@@ -0,0 +1,72 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+from chimera_meade.framing import FrameReader
+from chimera_meade.lx200 import reply_format
+
+
+class FakePort:
+    """Hands out what was fed in, ``chunk`` bytes per read"""
+
+    def __init__(self, data=b"", chunk=None, timeout=0.05):
+        self.data = bytearray(data)
+        self.chunk = chunk
+        self.timeout = timeout
+
+    @property
+    def in_waiting(self):
+        return len(self.data) if self.chunk is None else min(self.chunk, len(self.data))
+
+    def read(self, n):
+        data = bytes(self.data[:n])
+        del self.data[:n]
+        return data
+
+
+def test_pipelined_replies():
+    # split across reads, the second reply is kept for the next read
+    reader = FrameReader(FakePort(b"12:30:15#-22\xdf30:00#", chunk=3))
+
+    assert reader.read_line(reply_format(":GR#")) == b"12:30:15#"
+    assert reader.read_line(reply_format(":GD#")) == b"-22\xdf30:00#"
+
+
+def test_junk_before_reply_is_skipped():
+    reader = FrameReader(FakePort(b"1+07*30:00#"))
+
+    assert reader.read_line(reply_format(":GD#")) == b"+07*30:00#"
+    assert reader.skipped == 1
+
+
+def test_frames_that_cant_be_the_reply_are_discarded():
+    # a late RA reply before the declination we asked for
+    reader = FrameReader(FakePort(b"12:30:15#+07*30:00#"))
+
+    assert reader.read_line(reply_format(":GD#")) == b"+07*30:00#"
+    assert reader.discarded == len(b"12:30:15#")
+
+
+def test_read_line_timeout_returns_partial_frame():
+    reader = FrameReader(FakePort(b"12:30"))
+
+    assert reader.read_line(reply_format(":GR#")) == b"12:30"
+
+
+def test_read_char():
+    reader = FrameReader(FakePort(b"x1"))
+
+    assert reader.read_char(b"01") == b"1"
+    assert reader.skipped == 1
+    assert reader.read_char() == b""
+
+
+def test_discard_pending_and_on_data():
+    received = []
+    port = FakePort(b"junk#")
+    reader = FrameReader(port, received.append)
+
+    reader.discard_pending()
+    port.data += b"0"
+
+    assert reader.read_char(b"01") == b"0"
+    assert b"".join(received) == b"junk#0"
@@ -0,0 +1,30 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import json
+import os
+import subprocess
+import sys
+
+# only needed once the port is opened, see benchmarks/bench_import.py
+DEFERRED = ["serial", "http.server"]
+
+PROBE = """
+import json, sys
+import chimera_meade.meade
+chimera_meade.meade.Meade()
+print(json.dumps(sorted(name for name in %r if name in sys.modules)))
+"""
+
+
+def test_import_is_minimal():
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE % (DEFERRED,)],
+        check=True,
+        capture_output=True,
+        text=True,
+        # the same modules as this interpreter
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    ).stdout
+
+    assert json.loads(out.splitlines()[-1]) == []
@@ -0,0 +1,106 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import datetime as dt
+import re
+
+import pytest
+from chimera.util.coord import Coord
+
+SETTERS = ("St", "Sg", "SL", "SG", "SC")
+
+
+class Site(dict):
+    def utcoffset(self):
+        return self["utc_offset"]
+
+
+class Manager:
+    def __init__(self, site):
+        self.site = site
+
+    def getProxy(self, name):  # noqa: N802
+        return self.site
+
+
+@pytest.fixture
+def site(meade, simulator, monkeypatch):
+    """A site some way from where the simulator starts, with its clock"""
+    site = Site(
+        name="LNA",
+        latitude=Coord.fromD(simulator.latitude + 1.0),
+        longitude=Coord.fromD(simulator.longitude - 1.0),
+        utc_offset=simulator.utc_offset,
+    )
+    monkeypatch.setattr(meade, "getManager", lambda: Manager(site))
+    return site
+
+
+@pytest.fixture
+def wire(meade, monkeypatch):
+    """Names of the commands written to the mount"""
+    sent = []
+    write = meade._tty.write
+
+    def traced(data):
+        sent.extend(re.findall(r":([A-Za-z]+)", bytes(data).decode("latin-1")))
+        return write(data)
+
+    monkeypatch.setattr(meade._tty, "write", traced)
+    return sent
+
+
+def test_only_what_differs_is_written(meade, simulator, site, wire):
+    meade._init_telescope()
+
+    assert [name for name in wire if name in SETTERS] == ["St", "Sg"]
+    assert simulator.latitude == pytest.approx(site["latitude"].D, abs=1 / 60.0)
+
+
+def test_init_again_writes_nothing(meade, site, wire):
+    meade._init_telescope()
+    wire.clear()
+
+    meade._init_telescope()
+
+    # a single read, the modes are known by now
+    assert wire[0] == "GR"
+    assert not [name for name in wire if name.startswith("S") or name == "U"]
+
+
+def test_wrong_date_is_set(meade, simulator, site, wire):
+    simulator._local_base -= dt.timedelta(days=1)
+
+    meade._init_telescope()
+
+    assert "SC" in wire
+    assert simulator.local_time().date() == dt.date.today()
+
+
+def test_wrong_clock_is_set(meade, simulator, site, wire):
+    meade["init_time_tolerance"] = 5
+    simulator._local_base -= dt.timedelta(minutes=10)
+
+    meade._init_telescope()
+
+    assert "SL" in wire
+    assert "SC" not in wire
+
+
+def test_init_timing(meade, site):
+    meade._init_telescope()
+
+    timing = meade.get_init_timing()
+
+    assert list(timing) == [
+        "read",
+        "align_mode",
+        "high_precision",
+        "slew_rate",
+        "lat",
+        "long",
+        "local_time",
+        "utc_offset",
+        "date",
+    ]
+    assert all(seconds >= 0 for seconds in timing.values())
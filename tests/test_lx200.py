@@ -0,0 +1,116 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import datetime as dt
+
+import pytest
+
+from chimera_meade.lx200 import (
+    ACK,
+    Reply,
+    baud_rate_command,
+    command_name,
+    decode_sexagesimal,
+    is_query,
+    parse_az,
+    parse_bool,
+    parse_date,
+    parse_dec,
+    parse_distance_bars,
+    parse_ra,
+    parse_time,
+    reply_format,
+    reply_kind,
+)
+
+
+@pytest.mark.parametrize(
+    "reply, expected",
+    [
+        (b"12:30:15#", (False, 12 * 3600 + 30 * 60 + 15)),
+        (b"12:30.5#", (False, 12 * 3600 + 30 * 60 + 30)),
+        (b"-22\xdf30:00#", (True, 22 * 3600 + 30 * 60)),
+        (b"+07*30#", (False, 7 * 3600 + 30 * 60)),
+        (b"123\xdf45:06", (False, 123 * 3600 + 45 * 60 + 6)),
+        (b"-22'30'00#", (True, 22 * 3600 + 30 * 60)),
+    ],
+)
+def test_decode_sexagesimal(reply, expected):
+    assert decode_sexagesimal(reply) == expected
+
+
+@pytest.mark.parametrize("reply", [b"", b"#", b"xx#", b"12:3x:00#", b":30:00#"])
+def test_decode_sexagesimal_invalid(reply):
+    with pytest.raises(ValueError):
+        decode_sexagesimal(reply)
+
+
+def test_parse_ra():
+    assert parse_ra(b"12:30:15#").H == pytest.approx(12.504166, abs=1e-6)
+    assert parse_ra(b"12:30.5#").H == pytest.approx(12.508333, abs=1e-6)
+    # stray '1' before the reply
+    assert parse_ra(b"118:30:35#").H == pytest.approx(18.509722, abs=1e-6)
+    assert parse_ra("18:30:35#").H == pytest.approx(18.509722, abs=1e-6)
+
+
+def test_parse_dec():
+    assert parse_dec(b"-22\xdf30:00#").D == pytest.approx(-22.5)
+    assert parse_dec(b"1+07*30:00#").D == pytest.approx(7.5)
+
+
+def test_parse_az():
+    # the mount counts from the south
+    assert parse_az(b"000\xdf00:00#").D == pytest.approx(180.0)
+    assert parse_az(b"270\xdf00:00#").D == pytest.approx(90.0)
+    assert parse_az(b"000\xdf00:00#", False).D == pytest.approx(0.0)
+
+
+def test_parse_time_and_date():
+    assert parse_time(b"23:59:58#") == dt.time(23, 59, 58)
+    assert parse_date(b"10/16/26#") == dt.date(2026, 10, 16)
+    assert parse_date(b"01/02/70#") == dt.date(1970, 1, 2)
+
+
+def test_parse_small_replies():
+    assert parse_bool("1") is True
+    assert parse_bool("0") is False
+    assert parse_bool("x") is False
+    assert parse_distance_bars(b"\x7f#")
+    assert not parse_distance_bars(b"#")
+
+
+def test_reply_kind():
+    assert reply_kind(":GR#") == Reply.LINE
+    assert reply_kind(":D#") == Reply.LINE
+    assert reply_kind(":Sr12:00:00#") == Reply.CHAR
+    assert reply_kind(":MS#") == Reply.CHAR
+    assert reply_kind(":Mn#") == Reply.NONE
+    assert reply_kind(":Q#") == Reply.NONE
+    assert reply_kind(ACK) == Reply.CHAR
+
+
+def test_reply_format():
+    assert reply_format(":GR#").search(b"1 12:30:15#")
+    assert not reply_format(":GR#").search(b"+07*30:00#")
+    assert reply_format(":Sr12:00:00#") == b"01"
+    assert reply_format(":Q#") is None
+
+
+def test_command_names():
+    assert command_name(":Sr12:00:00#") == "Sr"
+    assert command_name(":GR#") == "GR"
+    assert command_name(ACK) == "ACK"
+
+    assert is_query(":GR#")
+    assert is_query(":D#")
+    assert is_query(ACK)
+    assert not is_query(":Mn#")
+    assert not is_query(":Sr12:00:00#")
+
+
+def test_baud_rate_command():
+    assert baud_rate_command(57600) == ":SB1#"
+    assert baud_rate_command(9600) == ":SB6#"
+
+    with pytest.raises(ValueError):
+        baud_rate_command(115200)
@@ -0,0 +1,373 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import threading
+import time
+
+import pytest
+from chimera.interfaces.telescope import TelescopeStatus
+from chimera.util.position import Position
+
+from chimera_meade.meade import Direction, MeadeException, SlewRate
+
+# stops used to wait for the exchange in flight, tens of ms at 9600 baud
+ABORT_MAX_LATENCY = 0.010
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_read_position(meade, simulator):
+    position = meade.get_position_ra_dec()
+
+    assert position.ra.H == pytest.approx(simulator.ra, abs=1 / 3600.0)
+    assert position.dec.D == pytest.approx(simulator.dec, abs=1 / 3600.0)
+
+
+def test_slew(meade, simulator):
+    start = meade.get_position_ra_dec()
+    target = Position.fromRaDec(start.ra, start.dec.D + 2.0)
+
+    meade.slew_to_ra_dec(target)
+
+    assert not meade.is_slewing()
+    assert meade.get_position_ra_dec().dec.D == pytest.approx(
+        start.dec.D + 2.0, abs=0.02
+    )
+
+
+def test_abort_latency(meade):
+    """From abort_slew() to :Q# written, with a slew and reads on the line"""
+    wire = []
+    write = meade._tty.write
+
+    def traced(data):
+        n = write(data)
+        if b":Q#" in bytes(data):
+            wire.append(time.perf_counter())
+        return n
+
+    meade._tty.write = traced
+
+    done = threading.Event()
+
+    def reads():
+        while not done.is_set():
+            meade._read_position_ra_dec()
+
+    reader = threading.Thread(target=reads)
+    reader.start()
+
+    start = meade.get_position_ra_dec()
+    latencies = []
+
+    try:
+        for offset in (10.0, -10.0, 10.0):
+            target = Position.fromRaDec(start.ra, start.dec.D + offset)
+            slew = threading.Thread(target=meade.slew_to_ra_dec, args=(target,))
+            slew.start()
+
+            wait_for(meade.is_slewing)
+            time.sleep(0.2)
+
+            wire.clear()
+            t0 = time.perf_counter()
+            meade.abort_slew()
+            slew.join(5.0)
+
+            assert not slew.is_alive()
+            assert wire
+            latencies.append(wire[0] - t0)
+    finally:
+        done.set()
+        reader.join()
+
+    assert max(latencies) < ABORT_MAX_LATENCY
+
+
+def test_concurrent_reads_share_exchanges(meade, simulator):
+    commands = simulator.commands
+
+    def reads():
+        for _ in range(5):
+            meade._read_position_ra_dec()
+
+    threads = [threading.Thread(target=reads) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert simulator.commands - commands < 3 * 5 * 2
+    assert meade.get_metrics()["coalesced_total"]
+
+
+def test_async_slew_from_slew_complete_keeps_align_mode(meade, simulator):
+    meade["async_slew"] = True
+    meade["max_slew_time"] = 1.5
+
+    done = threading.Event()
+    completed = []
+
+    def slew_complete(position, status):
+        completed.append(status)
+        if len(completed) == 1:
+            meade.slew_to_alt_az(Position.fromAltAz(50, 120))
+        else:
+            done.set()
+
+    meade.slewComplete = slew_complete
+    meade.slew_to_alt_az(Position.fromAltAz(60, 100))
+
+    assert done.wait(10.0)
+    wait_for(lambda: not meade.is_slewing())
+    meade._join_slew_monitor(5.0)
+
+    assert simulator.align_mode == "P"
+
+
+def test_abort_wakes_the_slew_when_the_stop_fails(meade, monkeypatch):
+    start = meade.get_position_ra_dec()
+    target = Position.fromRaDec(start.ra, start.dec.D + 10.0)
+
+    slew = threading.Thread(target=meade.slew_to_ra_dec, args=(target,))
+    slew.start()
+    wait_for(meade.is_slewing)
+
+    def lost(command):
+        raise OSError("Device not open")
+
+    monkeypatch.setattr(meade, "_write_now", lost)
+
+    with pytest.raises(OSError):
+        meade.abort_slew()
+
+    slew.join(2.0)
+    assert not slew.is_alive()
+
+
+def test_slew_rate_does_not_expire(meade):
+    meade["mode_revalidate_interval"] = 0.05
+    meade.set_slew_rate(SlewRate.CENTER)
+
+    time.sleep(0.1)
+
+    assert meade.get_slew_rate() == SlewRate.CENTER
+    assert meade.stop_move_east()
+
+
+def drop_after_exchange(meade, monkeypatch):
+    """The next exchange reaches the mount, then the link drops"""
+    exchange = meade._exchange
+    dropped = []
+
+    def flaky(*args):
+        replies = exchange(*args)
+        if not dropped:
+            dropped.append(True)
+            raise OSError("Connection reset by peer")
+        return replies
+
+    monkeypatch.setattr(meade, "_exchange", flaky)
+
+
+def test_reconnect_retries_queries(network_meade, simulator, server, monkeypatch):
+    drop_after_exchange(network_meade, monkeypatch)
+
+    assert network_meade._read_position_ra_dec()
+    assert server.connections == 1
+
+
+def test_reconnect_doesnt_send_motion_again(
+    network_meade, simulator, server, monkeypatch
+):
+    drop_after_exchange(network_meade, monkeypatch)
+    commands = simulator.commands
+
+    with pytest.raises(OSError):
+        network_meade._transact(":Mgn0100#")
+
+    assert simulator.commands - commands == 1
+    # the link is back for what comes next
+    assert network_meade._read_position_ra_dec()
+
+
+def test_stop_on_a_lost_link(network_meade, simulator):
+    network_meade._tty.close()
+    network_meade._linkLost = True
+    commands = simulator.commands
+
+    assert network_meade.stop_move_all()
+
+    wait_for(lambda: simulator.commands > commands)
+    assert network_meade._tty.isOpen()
+
+
+def test_dead_reckoning_after_a_reconnect(meade):
+    # what _reconnect does, the precision is told by the RA reply
+    meade._modes.clear()
+    meade["position_cache_max_age"] = 0.0
+
+    meade._read_position_ra_dec()
+    time.sleep(0.5)
+    read = meade._read_position_ra_dec()
+
+    assert meade._models["ra_dec"].resolution == (15.0, 1.0)
+
+    position = meade.get_position_ra_dec(tolerance=30)
+    _, bound = meade.estimate_position_ra_dec()
+
+    assert bound < 30
+    assert position.ra.H == pytest.approx(read.ra.H, abs=1 / 3600.0)
+    assert meade.get_metrics()["reckoned_total"]["frame=ra_dec"] == 1
+
+
+def test_failed_move_is_not_left_slewing(meade, monkeypatch):
+    write_now = meade._write_now
+    failures = [OSError("Device not open")]
+
+    def flaky(command):
+        if failures:
+            raise failures.pop()
+        return write_now(command)
+
+    monkeypatch.setattr(meade, "_write_now", flaky)
+
+    with pytest.raises(OSError):
+        meade._move(Direction.E, 0.1, SlewRate.CENTER)
+
+    assert not meade.is_slewing()
+    assert meade._move(Direction.W, 0.1, SlewRate.CENTER)
+
+
+def test_calibration_reads_twice_per_move(meade, monkeypatch):
+    meade["calibration_min_duration"] = 0.5
+    meade["calibration_max_duration"] = 0.5
+    meade["calibration_max_samples"] = 2
+
+    calls = {"_move": 0, "_read_position_ra_dec": 0}
+
+    for name in calls:
+
+        def counted(*args, _name=name, _method=getattr(meade, name)):
+            calls[_name] += 1
+            return _method(*args)
+
+        monkeypatch.setattr(meade, name, counted)
+
+    meade.calibrate_move([SlewRate.GUIDE])
+
+    assert calls["_move"] == 4
+    assert calls["_read_position_ra_dec"] == 2 * calls["_move"]
+    for direction in Direction:
+        assert meade._calibration[SlewRate.GUIDE][direction] == pytest.approx(
+            30.0, rel=0.1
+        )
+
+
+def test_short_moves_dont_change_the_calibration(meade):
+    meade["calibration_min_duration"] = 0.5
+    meade["calibration_max_duration"] = 0.5
+    meade["calibration_max_samples"] = 2
+    meade["online_calibration"] = True
+
+    meade.calibrate_move([SlewRate.GUIDE])
+    calibration = dict(meade._calibration[SlewRate.GUIDE])
+
+    for _ in range(5):
+        meade._move(Direction.E, 0.3, SlewRate.GUIDE)
+        meade._move(Direction.W, 0.3, SlewRate.GUIDE)
+
+    assert meade._calibration[SlewRate.GUIDE] == calibration
+
+
+def test_calibration_stops_after_a_clean_pass(meade, monkeypatch):
+    moves = []
+
+    def move(direction, duration, rate):
+        moves.append(duration)
+        return duration * 30.0
+
+    monkeypatch.setattr(meade, "_move", move)
+
+    meade.calibrate_move([SlewRate.GUIDE])
+
+    # one move each way, 150" at 30"/s
+    assert moves == [pytest.approx(5.0)] * 4
+    for direction in Direction:
+        entry = meade._calibrationEntries["GUIDE"][str(direction)]
+        assert entry.rate == pytest.approx(30.0)
+        assert entry.confidence() == pytest.approx(0.0)
+
+
+def test_calibration_samples_again_when_directions_disagree(meade, monkeypatch):
+    moves = []
+
+    def move(direction, duration, rate):
+        moves.append(direction)
+        # E faster than W
+        return duration * (33.0 if direction == Direction.E else 30.0)
+
+    monkeypatch.setattr(meade, "_move", move)
+
+    meade.calibrate_move([SlewRate.GUIDE])
+
+    assert moves.count(Direction.E) == 2
+    assert moves.count(Direction.N) == 1
+
+
+def test_invalid_calibration_store_is_calibrated_again(meade, monkeypatch):
+    with open(meade._calibration_store().path, "w") as f:
+        f.write('{"version": 1, "rates": []}')
+
+    calibrated = []
+    monkeypatch.setattr(meade, "calibrate_move", calibrated.append)
+    meade._calibration[SlewRate.GUIDE] = dict.fromkeys(Direction, 30.0)
+
+    assert not meade.is_move_calibrated()
+    assert meade._calc_duration(30.0, Direction.E, SlewRate.GUIDE) == 1.0
+    assert calibrated == [[SlewRate.GUIDE]]
+
+
+def test_legacy_calibration_is_not_read(meade, tmp_path):
+    # written with pickle in text mode, unreadable under Python 3
+    (tmp_path / "move_calibration.bin").write_bytes(b"(dp0\n")
+
+    assert not meade.is_move_calibrated()
+
+
+@pytest.mark.parametrize("async_slew", [False, True])
+@pytest.mark.parametrize("frame", ["ra_dec", "alt_az"])
+def test_failed_target_read_is_not_left_slewing(
+    meade, simulator, monkeypatch, async_slew, frame
+):
+    meade["async_slew"] = async_slew
+
+    def lost():
+        raise MeadeException("No reply from the mount.")
+
+    monkeypatch.setattr(meade, "get_target_%s" % frame, lost)
+
+    completed = []
+    meade.slewComplete = lambda position, status: completed.append(status)
+
+    if frame == "ra_dec":
+        start = meade.get_position_ra_dec()
+        slew = meade.slew_to_ra_dec, Position.fromRaDec(start.ra, start.dec.D + 2.0)
+    else:
+        slew = meade.slew_to_alt_az, Position.fromAltAz(60, 100)
+
+    if async_slew:
+        assert slew[0](slew[1])
+        meade._join_slew_monitor(5.0)
+        assert completed == [TelescopeStatus.ERROR]
+    else:
+        with pytest.raises(MeadeException):
+            slew[0](slew[1])
+
+    assert not meade.is_slewing()
+    assert simulator.align_mode == "P"
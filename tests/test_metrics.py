@@ -0,0 +1,105 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import time
+import urllib.request
+
+import pytest
+
+from chimera_meade.metrics import Histogram, Metrics, MetricsExporter
+
+
+def test_histogram():
+    histogram = Histogram(buckets=(0.01, 0.1))
+    for value in (0.005, 0.01, 0.05, 1.0):
+        histogram.observe(value)
+
+    stats = histogram.as_dict()
+
+    assert stats["count"] == 4
+    assert stats["sum"] == pytest.approx(1.065)
+    assert stats["mean"] == pytest.approx(1.065 / 4)
+    assert stats["max"] == 1.0
+    # cumulative, le is inclusive
+    assert stats["buckets"] == [(0.01, 2), (0.1, 3), (float("inf"), 4)]
+
+
+def test_snapshot():
+    metrics = Metrics()
+    metrics.observe("command_latency_seconds", 0.02, command="GR")
+    metrics.count("errors_total", kind="timeout", command="GD")
+    metrics.count("errors_total", 2, kind="timeout", command="GD")
+
+    snapshot = metrics.snapshot()
+
+    assert snapshot["command_latency_seconds"]["command=GR"]["count"] == 1
+    assert snapshot["errors_total"] == {"command=GD,kind=timeout": 3}
+
+
+def test_prometheus():
+    metrics = Metrics(buckets=(0.01, 0.1))
+    metrics.observe("command_latency_seconds", 0.05, command="GR")
+    metrics.count("errors_total", kind="junk", command='a"b')
+
+    lines = metrics.prometheus().splitlines()
+
+    assert lines == [
+        "# TYPE meade_command_latency_seconds histogram",
+        'meade_command_latency_seconds_bucket{command="GR",le="0.01"} 0',
+        'meade_command_latency_seconds_bucket{command="GR",le="0.1"} 1',
+        'meade_command_latency_seconds_bucket{command="GR",le="+Inf"} 1',
+        'meade_command_latency_seconds_sum{command="GR"} 0.05',
+        'meade_command_latency_seconds_count{command="GR"} 1',
+        "# TYPE meade_errors_total counter",
+        'meade_errors_total{command="a\\"b",kind="junk"} 1',
+    ]
+
+
+def test_exporter():
+    metrics = Metrics()
+    metrics.count("reconnects_total")
+
+    exporter = MetricsExporter(metrics, 0)
+    exporter.start()
+    try:
+        url = "http://127.0.0.1:%d/metrics" % exporter.port
+        with urllib.request.urlopen(url, timeout=5) as response:
+            body = response.read().decode("utf-8")
+            content_type = response.headers["Content-Type"]
+    finally:
+        exporter.stop()
+
+    assert content_type.startswith("text/plain")
+    assert body == metrics.prometheus()
+
+
+def test_meade_command_metrics(meade):
+    meade._read_position_ra_dec()
+    meade.get_target_ra_dec()
+
+    metrics = meade.get_metrics()
+
+    assert metrics["command_latency_seconds"]["command=GR"]["count"] == 1
+    assert metrics["command_latency_seconds"]["command=GD"]["count"] == 1
+    assert metrics["method_latency_seconds"]["method=get_target_ra_dec"]["count"]
+    assert metrics["lock_wait_seconds"]["lock=serial"]["count"] >= 2
+
+
+def test_meade_error_metrics(meade, simulator):
+    meade._tty.timeout = 0.05
+    simulator.latency = 0.2
+    meade._transact(":GR#")
+    meade._tty.timeout = 5
+    simulator.latency = 0.002
+    # the late reply
+    time.sleep(0.3)
+
+    # a stray "1" after stops, before the next reply
+    simulator.quirks = True
+    meade.stop_move_all()
+    meade._transact(":GR#")
+
+    errors = meade.get_metrics()["errors_total"]
+
+    assert errors["command=GR,kind=timeout"] == 1
+    assert errors["command=GR,kind=junk"] == 1
@@ -0,0 +1,89 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import re
+import threading
+import time
+
+import pytest
+
+from chimera_meade.calibration import CalibrationEntry
+from chimera_meade.meade import Direction, SlewRate
+
+
+@pytest.fixture
+def wire(meade, monkeypatch):
+    """Move commands written to the mount"""
+    sent = []
+    write = meade._tty.write
+
+    def traced(data):
+        sent.extend(re.findall(r":(?:M[gnsew]|Q)[^#]*#", bytes(data).decode("latin-1")))
+        return write(data)
+
+    monkeypatch.setattr(meade._tty, "write", traced)
+    return sent
+
+
+def test_short_guide_moves_are_pulses(meade, simulator, wire):
+    dec = simulator.dec
+
+    meade._move(Direction.N, 0.5, SlewRate.GUIDE)
+
+    assert wire == [":Mgn0500#"]
+    assert (simulator.dec - dec) * 3600 == pytest.approx(15.0, abs=1.0)
+
+
+def test_long_guide_moves_are_timed(meade, wire):
+    meade["pulse_guide_max_duration"] = 0.2
+
+    meade._move(Direction.N, 0.3, SlewRate.GUIDE)
+
+    assert wire == [":Mn#", ":Qn#"]
+
+
+def test_other_rates_are_timed(meade, wire):
+    meade._move(Direction.S, 0.1, SlewRate.CENTER)
+
+    assert wire == [":Ms#", ":Qs#"]
+
+
+def test_pulse_guide_disabled(meade, wire):
+    meade["pulse_guide"] = False
+
+    meade._move(Direction.E, 0.1, SlewRate.GUIDE)
+
+    assert wire == [":Me#", ":Qe#"]
+
+
+def test_pulses_are_limited_to_4_digits(meade):
+    meade["pulse_guide_max_duration"] = 20.0
+
+    assert meade._use_pulse_guide(9.999, SlewRate.GUIDE)
+    assert not meade._use_pulse_guide(10.0, SlewRate.GUIDE)
+
+
+def test_stopping_a_pulse(meade, simulator, wire):
+    move = threading.Thread(target=meade._move, args=(Direction.W, 1.5))
+    t0 = time.monotonic()
+    move.start()
+    time.sleep(0.2)
+
+    meade.stop_move_west()
+    move.join(2.0)
+
+    assert time.monotonic() - t0 < 1.0
+    assert wire[0] == ":Mgw1500#"
+    assert ":Qw#" in wire
+    assert not simulator.pulses
+
+
+def test_move_offsets_use_the_guide_calibration(meade, wire):
+    entry = CalibrationEntry(20.0, 2, 0.0, "2026-01-01T00:00:00+00:00")
+    meade._calibrationLoaded = True
+    meade._calibrationEntries = {"GUIDE": {str(d): entry for d in Direction}}
+    meade._calibration[SlewRate.GUIDE] = dict.fromkeys(Direction, 20.0)
+
+    meade.move_east(10.0)
+
+    assert wire == [":Mge0500#"]
@@ -0,0 +1,79 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import threading
+import time
+
+import pytest
+
+from chimera_meade.scheduler import BACKGROUND, COMMAND, URGENT, CommandScheduler
+
+
+def wait_for(predicate, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+def test_reentrant():
+    scheduler = CommandScheduler()
+
+    with scheduler:
+        assert scheduler.owned()
+        with scheduler.hold(BACKGROUND):
+            assert scheduler.owned()
+        assert scheduler.owned()
+
+    assert not scheduler.owned()
+
+
+def test_release_unowned():
+    with pytest.raises(RuntimeError):
+        CommandScheduler().release()
+
+
+def test_granted_by_priority_then_arrival():
+    scheduler = CommandScheduler()
+    order = []
+
+    def waiter(name, priority):
+        with scheduler.hold(priority):
+            order.append(name)
+
+    scheduler.acquire()
+
+    threads = []
+    for name, priority in (
+        ("background", BACKGROUND),
+        ("command 1", COMMAND),
+        ("urgent", URGENT),
+        ("command 2", COMMAND),
+    ):
+        thread = threading.Thread(target=waiter, args=(name, priority))
+        thread.start()
+        threads.append(thread)
+        wait_for(lambda n=len(threads): scheduler.waiting == n)
+
+    scheduler.release()
+
+    for thread in threads:
+        thread.join()
+
+    assert order == ["urgent", "command 1", "command 2", "background"]
+
+
+def test_write_lock_is_free_while_the_line_is_held():
+    scheduler = CommandScheduler()
+    written = threading.Event()
+
+    def stop():
+        with scheduler.write_lock:
+            written.set()
+
+    with scheduler:
+        thread = threading.Thread(target=stop)
+        thread.start()
+        assert written.wait(1.0)
+
+    thread.join()
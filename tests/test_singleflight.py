@@ -0,0 +1,82 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import threading
+import time
+
+import pytest
+
+from chimera_meade.singleflight import SingleFlight
+
+
+def test_alone():
+    assert SingleFlight().do("key", lambda: 42) == (42, False)
+
+
+def shared_calls(func, followers=3):
+    """Run func as the leader and followers identical calls while it runs"""
+    flight = SingleFlight()
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+    results = []
+
+    def leader_func():
+        calls.append(1)
+        started.set()
+        release.wait(2.0)
+        return func()
+
+    def call(f):
+        try:
+            results.append(flight.do("key", f))
+        except Exception as e:
+            results.append(e)
+
+    leader = threading.Thread(target=call, args=(leader_func,))
+    leader.start()
+    started.wait(2.0)
+
+    threads = [
+        threading.Thread(target=call, args=(leader_func,)) for _ in range(followers)
+    ]
+    for thread in threads:
+        thread.start()
+
+    # let the followers join the leader's call
+    time.sleep(0.1)
+    release.set()
+
+    leader.join()
+    for thread in threads:
+        thread.join()
+
+    return calls, results
+
+
+def test_identical_calls_share_the_result():
+    calls, results = shared_calls(lambda: 42)
+
+    assert len(calls) == 1
+    assert sorted(results) == [(42, False)] + [(42, True)] * 3
+
+
+def test_identical_calls_share_the_exception():
+    def fail():
+        raise OSError("link lost")
+
+    calls, results = shared_calls(fail)
+
+    assert len(calls) == 1
+    assert len(results) == 4
+    assert all(isinstance(result, OSError) for result in results)
+
+
+def test_different_keys_dont_share():
+    flight = SingleFlight()
+    assert flight.do("a", lambda: 1) == (1, False)
+    assert flight.do("b", lambda: 2) == (2, False)
+
+    with pytest.raises(ValueError):
+        flight.do("a", lambda: int("x"))
+    assert flight.do("a", lambda: 3) == (3, False)
@@ -0,0 +1,160 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import logging
+import threading
+import time
+
+import pytest
+from chimera.util.position import Position
+
+from chimera_meade.telemetry import TelemetryPoller
+
+
+class Sampler:
+    def __init__(self, fail=0):
+        self.calls = []
+        self.fail = fail
+        self.sampled = threading.Event()
+
+    def __call__(self):
+        self.calls.append(time.monotonic())
+        self.sampled.set()
+        if len(self.calls) <= self.fail:
+            raise OSError("No reply")
+        return len(self.calls)
+
+
+def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline
+        time.sleep(0.001)
+
+
+@pytest.fixture
+def poller():
+    pollers = []
+
+    def make(sample, busy=lambda: False, idle=10.0, busy_interval=0.01, history=3):
+        poller = TelemetryPoller(
+            sample, busy, idle, busy_interval, history, logging.getLogger("test")
+        )
+        poller.start()
+        pollers.append(poller)
+        return poller
+
+    yield make
+
+    for poller in pollers:
+        poller.stop()
+
+
+def test_samples_at_the_busy_rate_while_busy(poller):
+    busy = threading.Event()
+    sampler = Sampler()
+    telemetry = poller(sampler, busy.is_set)
+
+    wait_for(lambda: telemetry.latest == 1)
+    time.sleep(0.1)
+    assert len(sampler.calls) == 1
+    assert telemetry.interval == 10.0
+
+    busy.set()
+    telemetry.wake()
+    wait_for(lambda: len(sampler.calls) >= 5)
+
+    assert telemetry.interval == 0.01
+
+
+def test_history_is_bounded(poller):
+    sampler = Sampler()
+    telemetry = poller(sampler, lambda: True)
+
+    wait_for(lambda: len(sampler.calls) >= 5)
+    history = telemetry.history()
+
+    assert len(history) == 3
+    assert history == sorted(history)
+
+
+def test_wake_samples_now(poller):
+    sampler = Sampler()
+    telemetry = poller(sampler)
+    wait_for(lambda: telemetry.latest == 1)
+
+    telemetry.wake()
+
+    wait_for(lambda: telemetry.latest == 2, timeout=1.0)
+
+
+def test_failed_samples_are_skipped(poller):
+    sampler = Sampler(fail=2)
+    telemetry = poller(sampler, lambda: True)
+
+    wait_for(lambda: telemetry.latest is not None)
+
+    assert telemetry.history()[0] == 3
+
+
+def test_stop(poller):
+    sampler = Sampler()
+    telemetry = poller(sampler, lambda: True)
+    wait_for(lambda: sampler.calls)
+
+    telemetry.stop()
+    calls = len(sampler.calls)
+    time.sleep(0.05)
+
+    assert len(sampler.calls) == calls
+    assert not any(t.name == "meade-telemetry" for t in threading.enumerate())
+
+
+@pytest.fixture
+def polled_meade(meade):
+    """meade started (__start__) with telemetry"""
+    meade.close()
+    meade["telemetry"] = True
+    meade["telemetry_idle_interval"] = 0.05
+    meade["telemetry_busy_interval"] = 0.01
+    meade.__start__()
+    yield meade
+    meade.__stop__()
+
+
+def test_meade_telemetry(polled_meade, simulator):
+    wait_for(lambda: polled_meade.get_telemetry() is not None)
+    snapshot = polled_meade.get_telemetry()
+
+    assert snapshot.ra_dec.ra.H == pytest.approx(simulator.ra, abs=1 / 3600.0)
+    assert snapshot.ra_dec.dec.D == pytest.approx(simulator.dec, abs=1 / 3600.0)
+    assert snapshot.tracking_rate == pytest.approx(simulator.tracking_rate)
+    assert not snapshot.slewing
+    assert polled_meade.get_telemetry_history()
+
+
+def test_meade_positions_come_from_telemetry(polled_meade, simulator):
+    telemetry = polled_meade._telemetry
+    telemetry.idle_interval = 10.0
+    wait_for(lambda: polled_meade.get_telemetry() is not None)
+    latest = polled_meade.get_telemetry()
+    telemetry.wake()
+    wait_for(lambda: polled_meade.get_telemetry() is not latest)
+
+    commands = simulator.commands
+    for _ in range(10):
+        polled_meade.get_position_ra_dec()
+
+    assert simulator.commands == commands
+
+
+def test_meade_telemetry_follows_slews(polled_meade, simulator):
+    start = polled_meade.get_position_ra_dec()
+    target = Position.fromRaDec(start.ra, start.dec.D + 2.0)
+
+    slewing = []
+    polled_meade.slewBegin = lambda target: slewing.append(True)
+    polled_meade.slew_to_ra_dec(target)
+
+    assert slewing
+    assert any(snapshot.slewing for snapshot in polled_meade.get_telemetry_history())
@@ -0,0 +1,120 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import json
+import time
+
+import pytest
+
+from chimera_meade.transport import LinkStore, can_set_baudrate, is_network
+
+
+def test_devices():
+    assert is_network("socket://host:4030")
+    assert is_network("RFC2217://host:4030")
+    assert not is_network("/dev/ttyS0")
+    assert not is_network("lx200sim://lx200")
+
+    assert can_set_baudrate("/dev/ttyS0")
+    assert can_set_baudrate("rfc2217://host:4030")
+    assert not can_set_baudrate("socket://host:4030")
+
+
+def test_link_store(tmp_path):
+    store = LinkStore.for_device(str(tmp_path), "/dev/ttyS0")
+
+    assert store.load() == (9600, {})
+
+    store.save(57600, {38400: time.time() - 100})
+
+    assert store.load() == (57600, {38400: pytest.approx(time.time() - 100, abs=1)})
+    assert store.load(max_age=10) == (57600, {})
+
+
+def test_link_store_version_1(tmp_path):
+    store = LinkStore.for_device(str(tmp_path), "/dev/ttyS0")
+    with open(store.path, "w") as f:
+        json.dump({"version": 1, "baudrate": 57600, "refused": [38400]}, f)
+
+    # undated refusals are tried again
+    assert store.load() == (57600, {})
+
+
+@pytest.fixture
+def link(make_meade, simulator_name, tmp_path):
+    """open(**config): Meade on the simulator set to 57600 baud, what was saved"""
+    device = "lx200sim://%s" % simulator_name
+    store = LinkStore.for_device(str(tmp_path), device)
+
+    def open_(**config):
+        meade = make_meade(device, baudrate=57600, **config)
+        return meade, store.load()
+
+    return open_
+
+
+def test_negotiation(link, simulator):
+    meade, (baudrate, refused) = link()
+
+    assert meade._tty.baudrate == simulator.baudrate == 57600
+    assert (baudrate, refused) == (57600, {})
+    assert meade.get_position_ra_dec()
+
+
+def test_negotiated_rate_is_used_on_the_next_open(link, simulator):
+    first, _ = link()
+    first.close()
+    simulator_commands = simulator.commands
+
+    second, (baudrate, _) = link()
+
+    assert second._tty.baudrate == 57600
+    # just the check that the mount answers, no :SB
+    assert simulator.commands - simulator_commands == 1
+    assert baudrate == 57600
+
+
+def test_power_cycled_mount_is_found_at_9600(link, simulator):
+    first, _ = link()
+    first.close()
+    simulator.baudrate = 9600
+
+    second, (baudrate, refused) = link()
+
+    # and moved to the faster rate again
+    assert second._tty.baudrate == simulator.baudrate == 57600
+    assert (baudrate, refused) == (57600, {})
+
+
+def test_refused_rate(link, simulator):
+    simulator.max_baudrate = 19200
+
+    meade, (baudrate, refused) = link()
+
+    assert meade._tty.baudrate == simulator.baudrate == 9600
+    assert baudrate == 9600
+    assert list(refused) == [57600]
+    assert meade.get_position_ra_dec()
+
+
+def test_refused_rate_is_not_tried_again(link, simulator):
+    simulator.max_baudrate = 19200
+    link()[0].close()
+    simulator.max_baudrate = 57600
+    simulator_commands = simulator.commands
+
+    meade, _ = link()
+
+    assert meade._tty.baudrate == 9600
+    assert simulator.commands - simulator_commands == 1
+
+
+def test_refusals_expire(link, simulator):
+    simulator.max_baudrate = 19200
+    link()[0].close()
+    simulator.max_baudrate = 57600
+
+    meade, (baudrate, refused) = link(baudrate_retry_interval=0)
+
+    assert meade._tty.baudrate == simulator.baudrate == 57600
+    assert (baudrate, refused) == (57600, {})
@@ -0,0 +1,96 @@
+# SPDX-License-Identifier: GPL-2.0-or-later
+# SPDX-FileCopyrightText: 2006-present Paulo Henrique Silva <ph.silva@gmail.com>
+
+import threading
+
+import pytest
+
+from chimera_meade import meade as meade_module
+from chimera_meade.meade import Meade, MeadeException
+from chimera_meade.wirelog import READ, WRITE, WireLog, main, read_records
+
+
+def session(path, *exchanges, **kwargs):
+    log = WireLog(str(path), **kwargs)
+    log.start()
+    for command, reply in exchanges:
+        log.sent(command)
+        log.received(reply)
+    log.stop()
+
+
+def records(path):
+    with open(path, "rb") as f:
+        return list(read_records(f))
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "wire.log"
+    session(path, (b":GR#", b"12:30:15#"), (b":GD#", b"-22\xdf30:00#"))
+
+    read = records(path)
+
+    assert [(kind, data) for _, kind, _, data in read] == [
+        (WRITE, b":GR#"),
+        (READ, b"12:30:15#"),
+        (WRITE, b":GD#"),
+        (READ, b"-22\xdf30:00#"),
+    ]
+    assert read[0][0] <= read[1][0] <= read[2][0] <= read[3][0]
+    assert all(latency >= 0 for _, kind, latency, _ in read if kind == READ)
+
+
+def test_sessions_are_appended(tmp_path):
+    path = tmp_path / "wire.log"
+    session(path, (b":GR#", b"12:30:15#"))
+    session(path, (b":GD#", b"-22\xdf30:00#"))
+
+    assert [data for _, _, _, data in records(path)] == [
+        b":GR#",
+        b"12:30:15#",
+        b":GD#",
+        b"-22\xdf30:00#",
+    ]
+
+
+def test_rotation(tmp_path):
+    path = tmp_path / "wire.log"
+    session(path, *[(b":GR#", b"12:30:15#")] * 10, max_bytes=200, backups=2)
+    session(path, (b":GD#", b"-22\xdf30:00#"), max_bytes=200, backups=2)
+
+    assert (tmp_path / "wire.log.1").exists()
+    assert [data for _, _, _, data in records(path)][-1] == b"-22\xdf30:00#"
+
+
+def test_not_a_wire_log(tmp_path):
+    path = tmp_path / "wire.log"
+    path.write_bytes(b"x" * 64)
+
+    with pytest.raises(ValueError):
+        records(path)
+
+
+def test_decoder(tmp_path, capsys):
+    path = tmp_path / "wire.log"
+    session(path, (b":GR#", b"12:30:15#"))
+
+    assert main([str(path)]) == 0
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 2
+    assert "[write] ':GR#'" in lines[0]
+    assert "[read ] '12:30:15#'" in lines[1]
+
+
+def test_failed_open_stops_the_wire_log(tmp_path, monkeypatch):
+    monkeypatch.setattr(meade_module, "SYSTEM_CONFIG_DIRECTORY", str(tmp_path))
+
+    telescope = Meade()
+    telescope["device"] = "lx200sim://test?no_such_option=1"
+    telescope["wire_log"] = True
+
+    with pytest.raises(MeadeException):
+        telescope.open()
+
+    assert telescope._wireLog is None
+    assert not any(t.name == "meade-wirelog" for t in threading.enumerate())